@@ -0,0 +1,164 @@
+"""
+Description: 套利扫描 - 读取赔率快照 (event, outcome, table, odds)，
+按 (赛事, 结果) 建立最优赔率索引，只需一次遍历即可为每场赛事找到最优对冲组合，
+再用 A1*A2=B1*B2 解出对冲金额并按收益排序输出。
+
+用法:
+    python arbitrage.py snapshot.csv [--stake 1000] [--top 50] [--all]
+
+只处理恰好两个结果（正反两面）的赛事；两边必须来自不同的台子。
+"""
+
+import argparse
+import csv
+import sys
+
+from solver import solve_pair
+
+SNAPSHOT_FIELDS = ('event', 'outcome', 'table', 'odds')
+
+
+class BestPriceIndex:
+    """每个 (赛事, 结果) 只保留最高和次高赔率（次高来自不同台子），内存与台子数量无关"""
+
+    def __init__(self):
+        # event -> {outcome: [最高赔率, 台子, 次高赔率, 台子]}
+        self.events = {}
+        self.rows = 0
+
+    def add(self, event, outcome, table, odds):
+        self.rows += 1
+        outcomes = self.events.get(event)
+        if outcomes is None:
+            outcomes = self.events[event] = {}
+        best = outcomes.get(outcome)
+        if best is None:
+            outcomes[outcome] = [odds, table, 0.0, None]
+        elif odds > best[0]:
+            if table != best[1]:
+                best[2], best[3] = best[0], best[1]
+            best[0], best[1] = odds, table
+        elif odds > best[2] and table != best[1]:
+            best[2], best[3] = odds, table
+
+    def best_pair(self, event):
+        """
+        返回该赛事的最优对冲组合 ((结果A, 台子A, 赔率A), (结果B, 台子B, 赔率B))，
+        不是两个结果或找不到不同台子的组合时返回 None
+        """
+        outcomes = self.events.get(event)
+        if outcomes is None or len(outcomes) != 2:
+            return None
+        (name_a, a), (name_b, b) = sorted(outcomes.items())
+        candidates = []
+        if a[1] != b[1]:
+            candidates.append(((a[0], a[1]), (b[0], b[1])))
+        else:
+            # 两边最优都在同一个台子，只能一边退而求其次
+            if b[3] is not None:
+                candidates.append(((a[0], a[1]), (b[2], b[3])))
+            if a[3] is not None:
+                candidates.append(((a[2], a[3]), (b[0], b[1])))
+        if not candidates:
+            return None
+        (odds_a, table_a), (odds_b, table_b) = min(
+            candidates, key=lambda c: 1 / c[0][0] + 1 / c[1][0])
+        return (name_a, table_a, odds_a), (name_b, table_b, odds_b)
+
+
+class Opportunity:
+    """一个对冲机会，margin = 1/赔率A + 1/赔率B，小于 1 即为套利"""
+
+    __slots__ = ('event', 'outcome_a', 'table_a', 'odds_a', 'stake_a',
+                 'outcome_b', 'table_b', 'odds_b', 'stake_b', 'margin', 'profit')
+
+    def __init__(self, event, leg_a, leg_b, stake_a, stake_b):
+        self.event = event
+        self.outcome_a, self.table_a, self.odds_a = leg_a
+        self.outcome_b, self.table_b, self.odds_b = leg_b
+        self.stake_a = stake_a
+        self.stake_b = stake_b
+        self.margin = 1 / self.odds_a + 1 / self.odds_b
+        # 不论哪边打出都能拿到的最少派彩减去总投入
+        self.profit = min(self.odds_a * stake_a, self.odds_b * stake_b) - (stake_a + stake_b)
+
+    def as_row(self):
+        return [self.event, self.outcome_a, self.table_a, f"{self.odds_a:.2f}", self.stake_a,
+                self.outcome_b, self.table_b, f"{self.odds_b:.2f}", self.stake_b,
+                f"{self.margin:.4f}", f"{self.profit:.2f}"]
+
+
+OPPORTUNITY_FIELDS = ('event', 'outcome_a', 'table_a', 'odds_a', 'stake_a',
+                      'outcome_b', 'table_b', 'odds_b', 'stake_b', 'margin', 'profit')
+
+
+def load_snapshot(lines, index=None):
+    """从 CSV 文本行载入快照（需要 event,outcome,table,odds 表头），无法解析的赔率跳过"""
+    index = index if index is not None else BestPriceIndex()
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        return index
+    missing = [field for field in SNAPSHOT_FIELDS if field not in header]
+    if missing:
+        raise ValueError(f"快照表头缺少字段: {', '.join(missing)}")
+    i_event, i_outcome, i_table, i_odds = (header.index(field) for field in SNAPSHOT_FIELDS)
+    width = max(i_event, i_outcome, i_table, i_odds)
+    add = index.add
+    for row in reader:
+        if len(row) <= width:
+            continue
+        try:
+            odds = float(row[i_odds])
+        except ValueError:
+            continue
+        if odds > 1:
+            add(row[i_event], row[i_outcome], row[i_table], odds)
+    return index
+
+
+def scan(index, stake=1000, arbitrage_only=True):
+    """
+    为每场赛事取最优组合，A 边下注 stake，用 solve_pair 解出 B 边金额，
+    按 margin 从小到大（收益率从高到低）排序返回
+    """
+    opportunities = []
+    for event in index.events:
+        pair = index.best_pair(event)
+        if pair is None:
+            continue
+        leg_a, leg_b = pair
+        if arbitrage_only and 1 / leg_a[2] + 1 / leg_b[2] >= 1:
+            continue
+        result = solve_pair(leg_a[2], stake, leg_b[2], None)
+        if result.ok:
+            opportunities.append(Opportunity(event, leg_a, leg_b, stake, result.people2))
+    opportunities.sort(key=lambda o: o.margin)
+    return opportunities
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="扫描赔率快照中的对冲/套利机会")
+    parser.add_argument('snapshot', nargs='?', default='-', help="快照 CSV，默认标准输入")
+    parser.add_argument('--stake', type=int, default=1000, help="A 边下注金额")
+    parser.add_argument('--top', type=int, default=0, help="只输出前 N 个，0 表示全部")
+    parser.add_argument('--all', action='store_true', help="输出所有赛事的最优组合，不只是套利")
+    args = parser.parse_args(argv)
+
+    if args.snapshot == '-':
+        index = load_snapshot(sys.stdin)
+    else:
+        with open(args.snapshot, encoding='utf-8', newline='') as f:
+            index = load_snapshot(f)
+    opportunities = scan(index, args.stake, not args.all)
+    if args.top:
+        opportunities = opportunities[:args.top]
+
+    writer = csv.writer(sys.stdout, lineterminator='\n')
+    writer.writerow(OPPORTUNITY_FIELDS)
+    writer.writerows(o.as_row() for o in opportunities)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,331 @@
+"""
+Description: 批量求解 - 基于 NumPy 一次性求解整列 A台/B台 数据
+规则与 solver.solve_pair 相同：NaN/None/0 视为未知，满三算一，
+金额截断为整数，赔率保留两位小数，未知值不是恰好一个的行会被标记。
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from solver import (FIELDS, STATUS_OK, STATUS_NOT_ENOUGH, STATUS_NOTHING_TO_DO,
+                    STATUS_ERROR)
+
+# solved 列中的字段编号，对应 solver.FIELDS 的下标
+SOLVED_NONE = -1
+SOLVED_PROB1 = 0
+SOLVED_PEOPLE1 = 1
+SOLVED_PROB2 = 2
+SOLVED_PEOPLE2 = 3
+
+
+class BatchResult:
+    """批量求解结果，四个数值列均为 float64（金额为截断后的整数值），未知值为 NaN"""
+
+    __slots__ = ('prob1', 'people1', 'prob2', 'people2', 'solved', 'status')
+
+    prob1: np.ndarray
+    people1: np.ndarray
+    prob2: np.ndarray
+    people2: np.ndarray
+    solved: np.ndarray  # int8，被求解字段的编号，SOLVED_NONE 表示未求解
+    status: np.ndarray  # int8，solver 中的 STATUS_* 状态码
+
+    def __init__(self, prob1, people1, prob2, people2, solved, status):
+        self.prob1 = prob1
+        self.people1 = people1
+        self.prob2 = prob2
+        self.people2 = people2
+        self.solved = solved
+        self.status = status
+
+    def __len__(self):
+        return len(self.status)
+
+    def columns(self):
+        return self.prob1, self.people1, self.prob2, self.people2
+
+    def solved_name(self, i: int) -> str | None:
+        """第 i 行被求解的字段名"""
+        index = int(self.solved[i])
+        return FIELDS[index] if index != SOLVED_NONE else None
+
+
+def round_odds(values, out=None) -> np.ndarray:
+    """
+    与 Python 的 round(x, 2) 逐位一致的两位小数取整。
+    np.round 先乘 100 再 rint，乘法的舍入误差会让恰好落在 .xx5 附近的值舍错方向，
+    这些值（x*100 的小数部分离 0.5 不到几个 ulp）改用 round 逐个重算，其余直接用 np.round 的结果。
+    """
+    values = np.asarray(values, dtype=np.float64)
+    with np.errstate(invalid='ignore', over='ignore'):
+        out = np.round(values, 2, out=out)
+        scaled = values * 100
+        near_half = np.abs(scaled - np.floor(scaled) - 0.5) <= np.abs(scaled) * 2.0 ** -48
+        # 接近上限的值乘 100 会溢出，也交给 round
+        near_half |= np.isinf(scaled) & np.isfinite(values)
+    for i in np.flatnonzero(near_half):
+        out[i] = round(float(values[i]), 2)
+    return out
+
+
+def _as_column(values) -> np.ndarray:
+    """转换为 float64 列，None/NULL 变为 NaN，0 与原逻辑一致视为未知"""
+    if np.ma.isMaskedArray(values):
+        values = values.astype(np.float64).filled(np.nan)
+    column = np.array(values, dtype=np.float64, copy=True)
+    if column.ndim != 1:
+        raise ValueError("每一列必须是一维数组")
+    column[column == 0] = np.nan
+    return column
+
+
+def solve_batch(prob1, people1, prob2, people2) -> BatchResult:
+    """
+    对四列数据逐行求解，全部使用数组运算。
+    输入可以是列表、NumPy 数组或掩码数组；返回新的数组，不修改输入。
+    """
+    prob1 = _as_column(prob1)
+    people1 = _as_column(people1)
+    prob2 = _as_column(prob2)
+    people2 = _as_column(people2)
+    n = len(prob1)
+    if not (len(people1) == len(prob2) == len(people2) == n):
+        raise ValueError("四列数据长度必须一致")
+
+    unknown = np.empty((4, n), dtype=bool)
+    np.isnan(prob1, out=unknown[0])
+    np.isnan(people1, out=unknown[1])
+    np.isnan(prob2, out=unknown[2])
+    np.isnan(people2, out=unknown[3])
+    missing = unknown.sum(axis=0, dtype=np.int8)
+    single = missing == 1
+
+    status = np.where(missing == 0, np.int8(STATUS_NOTHING_TO_DO), np.int8(STATUS_NOT_ENOUGH))
+
+    # 每行只需一次除法：被除数取已知一侧的 赔率*金额，除数取未知一侧的另一个已知值。
+    # 恰好一个未知时该行只有未知列为 NaN，fmax 会跳过 NaN 取出已知值，
+    # 这样大部分运算都不需要按行掩码（随机掩码的写入比整列运算慢得多）。
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        solve_b = unknown[2] | unknown[3]
+        value = np.fmax(prob1 * people1, prob2 * people2)
+        value /= np.where(solve_b, np.fmax(prob2, people2), np.fmax(prob1, people1))
+
+        # 金额截断为整数，赔率保留两位小数，按掩码写回对应列
+        work = np.trunc(value)
+        np.copyto(people2, work, where=single & unknown[3])
+        np.copyto(people1, work, where=single & unknown[1])
+        round_odds(value, out=work)
+        np.copyto(prob2, work, where=single & unknown[2])
+        np.copyto(prob1, work, where=single & unknown[0])
+
+    index = unknown[1].view(np.int8) + 2 * unknown[2].view(np.int8) + 3 * unknown[3].view(np.int8)
+    solved = np.where(single, index, np.int8(SOLVED_NONE))
+    np.copyto(status, np.int8(STATUS_OK), where=single)
+
+    # 金额结果为非有限值时与 int() 一样视为出错
+    bad_stake = single & ((unknown[1] & ~np.isfinite(people1)) |
+                          (unknown[3] & ~np.isfinite(people2)))
+    if bad_stake.any():
+        status[bad_stake] = STATUS_ERROR
+        solved[bad_stake] = SOLVED_NONE
+        people1[bad_stake & unknown[1]] = np.nan
+        people2[bad_stake & unknown[3]] = np.nan
+
+    return BatchResult(prob1, people1, prob2, people2, solved, status)
+
+
+class LegsBatchResult:
+    """批量 N 腿求解结果：stakes 为 (组数, N) 的 float64 数组，payout/status 为每组一个值"""
+
+    __slots__ = ('odds', 'stakes', 'payout', 'status')
+
+    odds: np.ndarray
+    stakes: np.ndarray
+    payout: np.ndarray
+    status: np.ndarray
+
+    def __init__(self, odds, stakes, payout, status):
+        self.odds = odds
+        self.stakes = stakes
+        self.payout = payout
+        self.status = status
+
+    def __len__(self):
+        return len(self.status)
+
+
+def solve_legs_batch(odds, stakes) -> LegsBatchResult:
+    """
+    一次求解多组 N 腿对冲，规则同 solver.solve_legs。
+    odds/stakes 为 (组数, N) 的二维数组，金额 NaN/0 表示待求；
+    腿数不足 N 的组用 NaN 赔率补齐，补齐的腿不参与计算，金额保持 NaN。
+    只有 NaN 是补齐，有一腿赔率为 0 的组与 solve_legs 一样返回 NOT_ENOUGH。
+    """
+    odds = np.array(odds, dtype=np.float64, copy=True)
+    stakes = np.array(stakes, dtype=np.float64, copy=True)
+    if odds.ndim != 2 or odds.shape != stakes.shape:
+        raise ValueError("odds 和 stakes 必须是形状相同的二维数组")
+    stakes[stakes == 0] = np.nan
+
+    leg = ~np.isnan(odds)
+    stakes[~leg] = np.nan
+    fixed = leg & ~np.isnan(stakes)
+    free = leg & ~fixed
+    has_free = free.any(axis=1)
+    enough = (leg.sum(axis=1) >= 2) & fixed.any(axis=1) & ~(odds == 0).any(axis=1)
+
+    status = np.full(len(odds), STATUS_NOT_ENOUGH, dtype=np.int8)
+    status[enough & ~has_free] = STATUS_NOTHING_TO_DO
+    solvable = enough & has_free
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        payouts = odds * stakes
+        payout = np.full(len(odds), np.nan)
+        payout[enough] = np.nanmax(payouts[enough], axis=1)
+        # 与 solve_legs 一致：以最大派彩的那一腿为基准，每腿 int(派彩 / 赔率)
+        np.copyto(stakes, np.trunc(payout[:, None] / odds), where=free & solvable[:, None])
+
+    status[solvable] = STATUS_OK
+    bad = solvable & ~np.isfinite(np.where(free, stakes, 0.0)).all(axis=1)
+    status[bad] = STATUS_ERROR
+    stakes[bad[:, None] & free] = np.nan
+    return LegsBatchResult(odds, stakes, payout, status)
+
+
+# 取整求解时两边金额都由求解器给出
+SOLVED_STAKES = 4
+
+
+class RoundBatchResult:
+    """批量取整求解结果：四个数值列为 float64，imbalance 为 赔率1*金额1 - 赔率2*金额2，无法求解的行为 NaN"""
+
+    __slots__ = ('prob1', 'people1', 'prob2', 'people2', 'imbalance', 'solved', 'status')
+
+    def __init__(self, prob1, people1, prob2, people2, imbalance, solved, status):
+        self.prob1 = prob1
+        self.people1 = people1
+        self.prob2 = prob2
+        self.people2 = people2
+        self.imbalance = imbalance
+        self.solved = solved
+        self.status = status
+
+    def __len__(self):
+        return len(self.status)
+
+    def columns(self):
+        return self.prob1, self.people1, self.prob2, self.people2
+
+
+def round_pairs_batch(prob1, people1, prob2, people2, rule1=None, rule2=None) -> RoundBatchResult:
+    """
+    批量版 rounding.round_pair，rule1/rule2 分别是 A台、B台 的 StakeRule，对所有行生效。
+    一边金额已知的行整列求最近倍数；两边都待定的行先整列找派彩差为 0 的最小组合，
+    区间里找不到的行（区间很窄时才会出现）整列比较区间端点，只有窗口搜索逐行进行。
+    """
+    from rounding import DEFAULT_RULE, ODDS_SCALE, _closest_in_window
+    rule1 = rule1 or DEFAULT_RULE
+    rule2 = rule2 or DEFAULT_RULE
+    prob1, people1 = _as_column(prob1), _as_column(people1)
+    prob2, people2 = _as_column(prob2), _as_column(people2)
+    n = len(prob1)
+    if not (len(people1) == len(prob2) == len(people2) == n):
+        raise ValueError("四列数据长度必须一致")
+
+    status = np.full(n, STATUS_NOT_ENOUGH, dtype=np.int8)
+    solved = np.full(n, SOLVED_NONE, dtype=np.int8)
+    with np.errstate(invalid='ignore'):
+        odds1 = np.rint(prob1 * ODDS_SCALE)
+        odds2 = np.rint(prob2 * ODDS_SCALE)
+    has_odds = (odds1 > 0) & (odds2 > 0)
+    odds1 = np.where(has_odds, odds1, 1).astype(np.int64)
+    odds2 = np.where(has_odds, odds2, 1).astype(np.int64)
+    known1, known2 = ~np.isnan(people1), ~np.isnan(people2)
+    stake1 = np.where(known1, people1, 0).astype(np.int64)
+    stake2 = np.where(known2, people2, 0).astype(np.int64)
+    status[has_odds & known1 & known2] = STATUS_NOTHING_TO_DO
+
+    bounds1, bounds2 = rule1.multiples(), rule2.multiples()
+    # 没有上限时用一个不会溢出的大数代替，金额到不了这里
+    limit = np.int64(1) << 32
+
+    def nearest(payout, odds, rule, bounds):
+        step = odds * rule.unit
+        k = (2 * payout + step - 1) // (2 * step)
+        return np.clip(k, bounds[0], limit if bounds[1] is None else bounds[1]) * rule.unit
+
+    rows = has_odds & known1 & ~known2
+    if rows.any():
+        if bounds2 is None:
+            status[rows] = STATUS_ERROR
+        else:
+            people2[rows] = nearest(odds1[rows] * stake1[rows], odds2[rows], rule2, bounds2)
+            status[rows], solved[rows] = STATUS_OK, SOLVED_PEOPLE2
+    rows = has_odds & known2 & ~known1
+    if rows.any():
+        if bounds1 is None:
+            status[rows] = STATUS_ERROR
+        else:
+            people1[rows] = nearest(odds2[rows] * stake2[rows], odds1[rows], rule1, bounds1)
+            status[rows], solved[rows] = STATUS_OK, SOLVED_PEOPLE1
+
+    rows = np.flatnonzero(has_odds & ~known1 & ~known2)
+    if len(rows) and (bounds1 is None or bounds2 is None):
+        status[rows] = STATUS_ERROR
+    elif len(rows):
+        lo1, hi1 = bounds1[0], limit if bounds1[1] is None else bounds1[1]
+        lo2, hi2 = bounds2[0], limit if bounds2[1] is None else bounds2[1]
+        a = odds1[rows] * rule1.unit
+        b = odds2[rows] * rule2.unit
+        # 派彩差为 0 的组合 k1 是 b/gcd 的倍数，取 k2 不越界范围内最小的那个
+        period = b // np.gcd(a, b)
+        inner_lo = np.maximum(lo1, -(-b * lo2 // a))
+        inner_hi = np.minimum(hi1, b * min(hi2, limit) // a)
+        k1 = -(-inner_lo // period) * period
+        exact = k1 <= inner_hi
+        hit = rows[exact]
+        people1[hit] = k1[exact] * rule1.unit
+        people2[hit] = a[exact] * k1[exact] // b[exact] * rule2.unit
+        status[hit], solved[hit] = STATUS_OK, SOLVED_STAKES
+        # 其余行：端点处的候选整列算，只有 k2 不越界范围非空的行逐行做窗口搜索
+        rest = ~exact
+        a, b = a[rest], b[rest]
+        inner_lo, inner_hi = inner_lo[rest], inner_hi[rest]
+
+        def near2(k1):
+            return np.clip((2 * a * k1 + b - 1) // (2 * b), lo2, hi2)
+
+        def near1(k2):
+            return np.clip((2 * b * k2 + a - 1) // (2 * a), lo1, hi1)
+
+        low1, high1 = np.full(len(a), lo1), np.full(len(a), hi1)
+        low2, high2 = np.full(len(a), lo2), np.full(len(a), hi2)
+        candidates = [(low1, near2(low1)), (near1(low2), low2)]
+        if bounds1[1] is not None:
+            candidates.append((high1, near2(high1)))
+        if bounds2[1] is not None:
+            candidates.append((near1(high2), high2))
+        inner = inner_lo <= inner_hi
+        window = inner_lo.copy()
+        for j in np.flatnonzero(inner):
+            window[j] = _closest_in_window(int(a[j]), int(b[j]), int(inner_lo[j]),
+                                           None if inner_hi[j] >= limit else int(inner_hi[j]))[0]
+        candidates.append((np.where(inner, window, low1), np.where(inner, near2(window), near2(low1))))
+
+        best1, best2 = candidates[0]
+        best_gap = np.abs(a * best1 - b * best2)
+        for k1, k2 in candidates[1:]:
+            gap = np.abs(a * k1 - b * k2)
+            better = (gap < best_gap) | ((gap == best_gap) & ((k1 < best1) | ((k1 == best1) & (k2 < best2))))
+            best1, best2, best_gap = np.where(better, k1, best1), np.where(better, k2, best2), np.minimum(gap, best_gap)
+        rest = rows[rest]
+        people1[rest] = best1 * rule1.unit
+        people2[rest] = best2 * rule2.unit
+        status[rest], solved[rest] = STATUS_OK, SOLVED_STAKES
+
+    ok = status == STATUS_OK
+    imbalance = np.full(n, np.nan)
+    done = ok | (status == STATUS_NOTHING_TO_DO)
+    imbalance[done] = (odds1[done] * people1[done] - odds2[done] * people2[done]) / ODDS_SCALE
+    return RoundBatchResult(prob1, people1, prob2, people2, imbalance, solved, status)
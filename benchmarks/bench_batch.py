@@ -0,0 +1,68 @@
+"""
+批量求解基准：对比逐行调用 solver.solve_pair 与 batch.solve_batch
+用法: python benchmarks/bench_batch.py [--sizes 1000,100000,10000000] [--scalar-limit N]
+超过 --scalar-limit 的规模只对前 N 行运行逐行求解，并按速率估算总耗时（结果标注 est.）
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from batch import solve_batch
+from solver import solve_pair
+
+
+def make_columns(n, seed=0):
+    """生成 n 行随机数据，每行随机挑一列置为 NaN"""
+    rng = np.random.default_rng(seed)
+    columns = [
+        rng.uniform(1.01, 5.0, n).round(2),
+        rng.integers(10, 100000, n).astype(np.float64),
+        rng.uniform(1.01, 5.0, n).round(2),
+        rng.integers(10, 100000, n).astype(np.float64),
+    ]
+    blank = rng.integers(0, 4, n)
+    for j, column in enumerate(columns):
+        column[blank == j] = np.nan
+    return columns
+
+
+def run_scalar(columns, n):
+    rows = [[None if math.isnan(v) else v for v in column[:n].tolist()] for column in columns]
+    start = time.perf_counter()
+    for p1, s1, p2, s2 in zip(*rows):
+        solve_pair(p1, s1, p2, s2)
+    return time.perf_counter() - start
+
+
+def run_batch(columns):
+    start = time.perf_counter()
+    solve_batch(*columns)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="批量求解基准")
+    parser.add_argument('--sizes', default='1000,100000,10000000')
+    parser.add_argument('--scalar-limit', type=int, default=1000000,
+                        help="逐行求解最多实际运行的行数，超过部分按速率估算")
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'scalar s':>12} {'batch s':>10} {'speedup':>9}")
+    for n in [int(s) for s in args.sizes.split(',')]:
+        columns = make_columns(n)
+        measured = min(n, args.scalar_limit)
+        scalar = run_scalar(columns, measured) * n / measured
+        batch = min(run_batch(columns) for _ in range(3))
+        note = ' est.' if measured < n else ''
+        print(f"{n:>10} {scalar:>12.4f} {batch:>10.4f} {scalar / batch:>8.1f}x{note}")
+
+
+if __name__ == '__main__':
+    main()
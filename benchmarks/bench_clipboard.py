@@ -0,0 +1,77 @@
+"""
+点击复制延迟基准：在 offscreen 平台上点击有内容的输入框，统计 点击 -> 复制并重绘完成 的耗时。
+--backend qt 为当前的 QClipboard 实现；--backend pyperclip 临时换回原来的 pyperclip.copy，
+用于对比（需要安装 pyperclip，Linux 上还需要 xclip/xsel 和可用的 X 显示）。
+没有 xclip 的机器可用 --backend spawn：每次复制启动一个子进程写入文本，
+与 pyperclip 在 Linux 上调用 xclip 的方式相同，作为原实现的近似。
+用法: QT_QPA_PLATFORM=offscreen python benchmarks/bench_clipboard.py [--clicks 500] [--backend qt|pyperclip|spawn|all]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication
+
+
+def spawn_copy(text):
+    """模拟 pyperclip 的 xclip 方式：启动子进程并同步等待它读完文本"""
+    subprocess.run(['cat'], input=text.encode('utf-8'), stdout=subprocess.DEVNULL, check=False)
+
+
+def measure(app, calculator, clicks):
+    entry = calculator.prob1_entry
+    entry.setText('1.95')
+    samples = []
+    for _ in range(clicks):
+        start = time.perf_counter()
+        QTest.mouseClick(entry, Qt.LeftButton)
+        app.processEvents()
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples
+
+
+def report(name, samples):
+    p50 = samples[len(samples) // 2] * 1000
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000
+    print(f"{name:>10} p50={p50:.3f}ms p99={p99:.3f}ms max={samples[-1] * 1000:.3f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="点击复制到重绘的延迟")
+    parser.add_argument('--clicks', type=int, default=500)
+    parser.add_argument('--backend', choices=('qt', 'pyperclip', 'spawn', 'all'), default='all')
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    import calculator
+    window = calculator.FloatingCalculator()
+    window.show()
+    app.processEvents()
+
+    if args.backend in ('qt', 'all'):
+        report('qt', measure(app, window, args.clicks))
+    if args.backend in ('spawn', 'all'):
+        window.copy_to_clipboard = spawn_copy
+        report('spawn', measure(app, window, args.clicks))
+    if args.backend in ('pyperclip', 'all'):
+        try:
+            import pyperclip
+            pyperclip.copy('warmup')
+        except Exception as e:
+            print(f"{'pyperclip':>10} unavailable: {str(e).splitlines()[0]}")
+            return
+        window.copy_to_clipboard = pyperclip.copy
+        report('pyperclip', measure(app, window, args.clicks))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+剪贴板监听基准：offscreen 平台上反复写入剪贴板（模拟从网页复制赔率/金额），
+统计从剪贴板变化到结果写入输入框的耗时（要求 10ms 以内）、单独解析的耗时，
+以及监听开启后空闲 2 秒内进程消耗的 CPU 时间。
+用法: QT_QPA_PLATFORM=offscreen python benchmarks/bench_clipboard_watch.py [--pastes 500]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import QEventLoop, QTimer
+from PyQt5.QtWidgets import QApplication
+
+SAMPLES = (
+    '主胜 {odds1} 客胜 {odds2}',
+    '赔率：{odds1_full}　下注金额：{stake_thousands} 元',
+    '{odds2}',
+    '投注 {stake} 赔率 {odds1} 12:30 开赛 满 95% 返还',
+)
+FULL_WIDTH = str.maketrans('0123456789.', '０１２３４５６７８９．')
+
+
+def random_text(rng):
+    odds1, odds2 = f"{rng.uniform(1.01, 5):.2f}", f"{rng.uniform(1.01, 5):.2f}"
+    stake = rng.randint(100, 99999)
+    return rng.choice(SAMPLES).format(odds1=odds1, odds2=odds2, odds1_full=odds1.translate(FULL_WIDTH),
+                                      stake=stake, stake_thousands=f"{stake:,}")
+
+
+def idle_cpu(seconds=2.0):
+    """空转事件循环，返回期间进程消耗的 CPU 时间"""
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    cpu = time.process_time()
+    loop.exec_()
+    return time.process_time() - cpu
+
+
+def report(name, samples):
+    samples = sorted(samples)
+    p50 = samples[len(samples) // 2] * 1000
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000
+    print(f"{name:<26} p50={p50:7.3f}ms p99={p99:7.3f}ms max={samples[-1] * 1000:7.3f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="剪贴板变化到求解完成的耗时")
+    parser.add_argument('--pastes', type=int, default=500)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    import calculator
+    from clipboard_watch import parse_clipboard
+    from history import History
+    window = calculator.FloatingCalculator(history=History())
+    window.show()
+    app.processEvents()
+    idle_off = idle_cpu()
+    window.toggle_clipboard_watch()
+    app.processEvents()
+    watcher = window.clipboard_watcher
+    clipboard = QApplication.clipboard()
+
+    rng = random.Random(1)
+    texts = [random_text(rng) for _ in range(args.pastes)]
+    parse_times = []
+    for text in texts:
+        start = time.perf_counter()
+        parse_clipboard(text)
+        parse_times.append(time.perf_counter() - start)
+    report('parse only', parse_times)
+
+    totals = []
+    for i, text in enumerate(texts):
+        window.do_clear_all()
+        # 先填一边，模拟逐个复制
+        if i % 2:
+            window.prob1_entry.setText('1.95')
+            window.people1_entry.setText('1000')
+        start = time.perf_counter()
+        clipboard.setText(text)
+        app.processEvents()
+        totals.append(time.perf_counter() - start)
+    report('change -> result', list(watcher.latencies))
+    report('setText -> idle', totals)
+    print(f"pastes with a result: {len(watcher.latencies)}/{len(texts)}")
+
+    # 空闲 CPU 包括滚动文字条等已有的计时器，监听本身不应让它增加；先等开启提示淡出
+    idle_cpu(1.5)
+    print(f"idle 2 s CPU: watcher off {idle_off * 1000:.1f} ms, watcher on {idle_cpu() * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
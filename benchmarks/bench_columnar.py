@@ -0,0 +1,102 @@
+"""
+列式结果文件基准：同一份 batch.solve_batch 的结果分别写成列式文件和 CSV，比较写入耗时、读回为数组的耗时和文件大小，
+再测列式文件的随机切片（mmap 视图，不拷贝）和逐块追加。
+用法: python benchmarks/bench_columnar.py [--rows 1000000] [--dir /tmp]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+import columnar
+from batch import BatchResult, solve_batch
+from bench_batch import make_columns
+
+
+def chunks(result, size):
+    for start in range(0, len(result), size):
+        yield BatchResult(*(getattr(result, name)[start:start + size] for name, _ in columnar.COLUMNS))
+
+
+def timed(func):
+    start = time.perf_counter()
+    value = func()
+    return time.perf_counter() - start, value
+
+
+def read_columnar(path):
+    with columnar.ColumnReader(path) as reader:
+        # 求和让每一页都真正读到
+        return float(np.nansum(reader.column('people2'))), len(reader)
+
+
+def read_csv(path):
+    with open(path, encoding='utf-8', newline='') as f:
+        parts = list(columnar.read_csv_chunks(f))
+    people2 = np.concatenate([part.people2 for part in parts])
+    return float(np.nansum(people2)), len(people2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="列式结果文件与 CSV 的写入、读取和大小对比")
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--dir', default=tempfile.gettempdir(), help="临时文件目录")
+    parser.add_argument('--slices', type=int, default=10000, help="随机切片的次数")
+    args = parser.parse_args()
+
+    result = solve_batch(*make_columns(args.rows))
+    col_path = os.path.join(args.dir, 'bench_columnar.qcc')
+    csv_path = os.path.join(args.dir, 'bench_columnar.csv')
+    try:
+        write_col, _ = timed(lambda: columnar.write_results(col_path, result))
+
+        def write_csv():
+            with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+                columnar.write_csv(f, chunks(result, columnar.DEFAULT_CHUNK_SIZE))
+        write_text, _ = timed(write_csv)
+
+        read_col, (total_col, rows_col) = timed(lambda: read_columnar(col_path))
+        read_text, (total_csv, rows_csv) = timed(lambda: read_csv(csv_path))
+        assert rows_col == rows_csv == args.rows and total_col == total_csv, "round trip mismatch"
+
+        print(f"{args.rows} rows")
+        print(f"{'format':<10}{'size MB':>10}{'write s':>10}{'read s':>10}")
+        for name, path, write, read in (('columnar', col_path, write_col, read_col),
+                                        ('csv', csv_path, write_text, read_text)):
+            print(f"{name:<10}{os.path.getsize(path) / (1 << 20):>10.1f}{write:>10.3f}{read:>10.3f}")
+        print(f"columnar vs csv: write x{write_text / write_col:.0f}, read x{read_text / read_col:.0f}, "
+              f"size {os.path.getsize(col_path) / os.path.getsize(csv_path):.0%}")
+
+        rng = np.random.default_rng(0)
+        starts = rng.integers(0, max(1, args.rows - 100), args.slices)
+        with columnar.ColumnReader(col_path) as reader:
+            start = time.perf_counter()
+            for offset in starts.tolist():
+                part = reader.slice(offset, offset + 100)
+                part.people2.sum()
+            elapsed = time.perf_counter() - start
+            del part
+        print(f"random 100-row slice: {elapsed / args.slices * 1e6:.1f} us")
+
+        # 逐块追加：每块 1% 的行
+        size = max(1, args.rows // 100)
+        os.remove(col_path)
+        append, _ = timed(lambda: [columnar.write_results(col_path, part, append=True)
+                                   for part in chunks(result, size)])
+        with columnar.ColumnReader(col_path) as reader:
+            blocks = reader.block_count
+        print(f"append {blocks} blocks of {size} rows: {append:.3f}s")
+    finally:
+        for path in (col_path, csv_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
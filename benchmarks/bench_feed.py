@@ -0,0 +1,92 @@
+"""
+实时赔率推送基准：子进程按固定速率（默认 1 万条/秒）通过 UNIX socket 推送更新，
+主进程订阅并按依赖索引重算对冲组合，统计 更新发出 -> 金额刷新 的端到端延迟。
+用法: python benchmarks/bench_feed.py [--rate 10000] [--seconds 5] [--tables 1000] [--pairs 5000]
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from live_feed import FeedPublisher, FeedSubscriber, HedgeBook
+
+
+def publish(path, ready, tables, rate, seconds):
+    publisher = FeedPublisher(path)
+    ready.set()
+    publisher.accept(1, timeout=10)
+    rng = random.Random(1)
+    interval = 1e9 / rate
+    total = int(rate * seconds)
+    start = time.monotonic_ns()
+    for i in range(total):
+        # 按计划时间发送，保持稳定速率
+        due = start + i * interval
+        while time.monotonic_ns() < due:
+            pass
+        publisher.publish(f"T{rng.randrange(tables)}", round(rng.uniform(1.5, 3.5), 2))
+    publisher.close()
+
+
+def percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="实时赔率推送延迟基准")
+    parser.add_argument('--rate', type=int, default=10000)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--tables', type=int, default=1000)
+    parser.add_argument('--pairs', type=int, default=5000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    book = HedgeBook()
+    for t in range(args.tables):
+        book.update(f"T{t}", 2.0)
+    for p in range(args.pairs):
+        a, b = rng.sample(range(args.tables), 2)
+        book.add_pair(p, f"T{a}", f"T{b}", rng.randint(100, 10000))
+    book.updates = book.recomputed = 0
+
+    latencies = array('q', bytes(8 * int(args.rate * args.seconds)))
+    count = 0
+
+    def on_update(table, odds, sent):
+        nonlocal count
+        if sent is not None and count < len(latencies):
+            latencies[count] = time.monotonic_ns() - sent
+            count += 1
+
+    path = os.path.join(tempfile.mkdtemp(), 'feed.sock')
+    ready = multiprocessing.Event()
+    process = multiprocessing.Process(target=publish,
+                                      args=(path, ready, args.tables, args.rate, args.seconds))
+    process.start()
+    ready.wait(10)
+    subscriber = FeedSubscriber(path, book, on_update)
+    start = time.perf_counter()
+    subscriber.run()
+    elapsed = time.perf_counter() - start
+    subscriber.close()
+    process.join()
+
+    values = sorted(latencies[:count])
+    print(f"cpu_count={os.cpu_count()} updates={count} in {elapsed:.2f}s "
+          f"({count / elapsed:.0f}/s), pairs={args.pairs}, tables={args.tables}")
+    print(f"recomputed {book.recomputed} pairs "
+          f"({book.recomputed / max(count, 1):.1f}/update vs {args.pairs} for a full re-solve)")
+    if values:
+        print(f"latency ms: p50={percentile(values, 0.5) / 1e6:.3f} "
+              f"p99={percentile(values, 0.99) / 1e6:.3f} max={values[-1] / 1e6:.3f}")
+
+
+if __name__ == '__main__':
+    main()
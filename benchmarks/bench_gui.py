@@ -0,0 +1,209 @@
+"""
+界面基准套件：在 offscreen 平台上用 QTest 驱动 FloatingCalculator，覆盖
+四个输入框打字、回车计算、小键盘输入、清空、小键盘展开/收起（450 <-> 750px）和透明度滑块拖动，
+记录冷启动到首帧、每次交互的耗时（含事件处理和重绘）、峰值 RSS 和对象数量，
+并与保存的基线比较，超过阈值的指标列为退化，退出码为 1。
+
+基线与机器有关，不随代码提交；在要比较的机器上先用 --update-baseline 记录一次：
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_gui.py --update-baseline
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_gui.py            # 之后每次改动后比较
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_gui.py --threshold 0.3 --repeat 50
+"""
+
+import argparse
+import gc
+import json
+import os
+import resource
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import QObject, Qt, qInstallMessageHandler
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication, QPushButton
+
+import bench_startup
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gui_baseline.json')
+# 耗时很短的指标按比例比较容易被噪声误报，再加一个绝对余量
+ABSOLUTE_SLACK = {'ms': 0.05, 'MB': 2.0, 'count': 0}
+
+
+def quiet_platform_warnings(mode, context, message):
+    """offscreen 平台不支持窗口透明度等功能，每次设置都会警告，刷屏会影响计时"""
+    if 'This plugin does not support' not in message:
+        sys.stderr.write(message + '\n')
+
+
+def timed_steps(app, steps):
+    """依次执行 steps 中的函数，每步之后处理完事件（包括重绘），返回每步耗时（秒）"""
+    samples = []
+    for step in steps:
+        start = time.perf_counter()
+        step()
+        app.processEvents()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+class Scenarios:
+    """每个场景返回一组交互耗时"""
+
+    def __init__(self, app, window, repeat):
+        self.app = app
+        self.window = window
+        self.repeat = repeat
+        self.entries = (window.prob1_entry, window.people1_entry, window.prob2_entry, window.people2_entry)
+
+    def type_entries(self):
+        """逐键在三个输入框里打字（第四格留给计算），每个按键一次采样"""
+        steps = []
+        for i in range(self.repeat):
+            steps.append(self.window.do_clear_all)
+            for entry, text in zip(self.entries, ('1.95', str(1000 + i), '2.05')):
+                steps.extend(lambda entry=entry, ch=ch: QTest.keyClick(entry, ch) for ch in text)
+        samples = timed_steps(self.app, steps)
+        # 清空那一步不算打字
+        return [s for s, step in zip(samples, steps) if step is not self.window.do_clear_all]
+
+    def enter_calculate(self):
+        samples = []
+        for i in range(self.repeat):
+            for entry, text in zip(self.entries, ('1.95', str(1000 + i), '2.05', '')):
+                entry.setText(text)
+            self.app.processEvents()
+            samples += timed_steps(self.app, [lambda: QTest.keyClick(self.window, Qt.Key_Return)])
+        assert self.window.people2_entry.text(), "回车没有算出B台金额"
+        return samples
+
+    def numpad_input(self):
+        window = self.window
+        if not window.numpad_visible:
+            window.toggle_numpad()
+        buttons = {button.text(): button for button in window.numpad_widget.findChildren(QPushButton)}
+        window.do_clear_all()
+        self.app.processEvents()
+        steps = []
+        for _ in range(self.repeat):
+            for key in ('1', '.', '9', '5', '←', '←', '←', '←'):
+                steps.append(lambda button=buttons[key]: QTest.mouseClick(button, Qt.LeftButton))
+        samples = timed_steps(self.app, steps)
+        window.toggle_numpad()
+        return samples
+
+    def clear_all(self):
+        samples = []
+        for i in range(self.repeat):
+            for entry, text in zip(self.entries, ('1.95', str(1000 + i), '2.05', '951')):
+                entry.setText(text)
+            self.app.processEvents()
+            samples += timed_steps(self.app, [self.window.do_clear_all])
+        return samples
+
+    def numpad_toggle(self):
+        samples = timed_steps(self.app, [lambda: QTest.mouseClick(self.window.toggle_button, Qt.LeftButton)]
+                              * (2 * self.repeat))
+        assert self.window.height() == 450, self.window.height()
+        return samples
+
+    def opacity_sweep(self):
+        slider = self.window.transparency_slider
+        values = list(range(100, 14, -1)) + list(range(15, 101))
+        steps = [lambda value=value: slider.setValue(value) for value in values]
+        samples = []
+        for _ in range(max(1, self.repeat // 10)):
+            samples += timed_steps(self.app, steps)
+        return samples
+
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+
+def run(args):
+    results = {}
+    first = [bench_startup.run_once(ROOT, None) for _ in range(args.startup_runs + 1)][1:]
+    results['first_frame_ms'] = (statistics.median(s[1] for s in first), 'ms')
+
+    qInstallMessageHandler(quiet_platform_warnings)
+    app = QApplication(sys.argv[:1])
+    import calculator
+    from history import History
+    window = calculator.FloatingCalculator(history=History())
+    window.show()
+    QTest.qWaitForWindowExposed(window)
+    app.processEvents()
+
+    scenarios = Scenarios(app, window, args.repeat)
+    for name in ('type_entries', 'enter_calculate', 'numpad_input', 'clear_all', 'numpad_toggle', 'opacity_sweep'):
+        getattr(scenarios, name)()  # 预热（第一次会创建小键盘、加载字体等）
+        samples = getattr(scenarios, name)()
+        results[f'{name}_p50_ms'] = (percentile(samples, 0.5) * 1000, 'ms')
+        results[f'{name}_p95_ms'] = (percentile(samples, 0.95) * 1000, 'ms')
+        print(f"{name:<16} n={len(samples):<5} p50={percentile(samples, 0.5) * 1000:7.3f}ms "
+              f"p95={percentile(samples, 0.95) * 1000:7.3f}ms max={max(samples) * 1000:7.3f}ms")
+
+    gc.collect()
+    # Linux 上 ru_maxrss 单位为 KB
+    results['peak_rss_mb'] = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 'MB')
+    results['qobjects'] = (len(window.findChildren(QObject)), 'count')
+    results['python_objects'] = (len(gc.get_objects()), 'count')
+    return results
+
+
+def compare(results, baseline, threshold):
+    """返回退化的指标名列表，并打印对照表"""
+    regressions = []
+    print(f"\n{'metric':<26}{'current':>12}{'baseline':>12}{'change':>9}")
+    for name, (value, unit) in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<26}{value:>12.3f}{'-':>12}{'':>9}")
+            continue
+        change = (value - base) / base if base else 0.0
+        regressed = value > base * (1 + threshold) + ABSOLUTE_SLACK[unit]
+        mark = '  REGRESSION' if regressed else ''
+        print(f"{name:<26}{value:>12.3f}{base:>12.3f}{change:>+8.1%}{mark}")
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="offscreen 界面基准套件与基线比较")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="基线 JSON 路径")
+    parser.add_argument('--update-baseline', action='store_true', help="把本次结果写为基线")
+    parser.add_argument('--threshold', type=float, default=0.2, help="超过基线多少比例算退化")
+    parser.add_argument('--repeat', type=int, default=30, help="每个场景的重复次数")
+    parser.add_argument('--startup-runs', type=int, default=5, help="冷启动测几次取中位数")
+    args = parser.parse_args()
+
+    results = run(args)
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({name: value for name, (value, _) in results.items()}, f, indent=2)
+        compare(results, {}, args.threshold)
+        print(f"\nbaseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        compare(results, {}, args.threshold)
+        print(f"\nno baseline at {args.baseline}; run with --update-baseline first")
+        return 0
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print(f"\nno regressions over {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
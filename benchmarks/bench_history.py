@@ -0,0 +1,95 @@
+"""
+计算历史基准：生成 100 万条记录的日志，统计 mmap 载入、按赔率区间过滤、
+追加一条记录、历史面板打开到首帧、跳到任意位置重绘的耗时，以及环形缓冲区占用的内存。
+用法: QT_QPA_PLATFORM=offscreen python benchmarks/bench_history.py [--records 1000000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from history import HEADER, MAGIC, RECORD, History, HistoryLog
+
+
+def write_log(path, count, seed=1):
+    rng = random.Random(seed)
+    now = time.time() - count
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, RECORD.size))
+        chunk = bytearray()
+        for i in range(count):
+            prob1 = round(rng.uniform(1.01, 5), 2)
+            prob2 = round(rng.uniform(1.01, 5), 2)
+            people1 = rng.randint(10, 99999)
+            chunk += RECORD.pack(now + i, prob1, people1, prob2, int(prob1 * people1 / prob2), 3)
+            if len(chunk) >= 1 << 20:
+                f.write(chunk)
+                chunk.clear()
+        f.write(chunk)
+
+
+def timed(label, func, repeat=1):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<28}{best * 1000:9.3f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="计算历史载入、过滤与面板响应")
+    parser.add_argument('--records', type=int, default=1000000)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), 'history.bin')
+    write_log(path, args.records)
+    print(f"log {os.path.getsize(path) / 1e6:.1f} MB, {args.records} records")
+
+    history = timed('load (mmap tail)', lambda: History(log=HistoryLog(path)), repeat=3)
+    print(f"{'ring buffer':<28}{len(history.buffer) / 1e6:9.1f} MB")
+    rows = timed('filter 1.80-2.20', lambda: history.filter_odds(1.80, 2.20), repeat=5)
+    print(f"{'  matches':<28}{len(rows):9d}")
+    timed('filter low only', lambda: history.filter_odds(4.5, None), repeat=5)
+    timed('add x1000 (with log)', lambda: [history.add(1.95, 1000, 2.05, 951, 'people2') for _ in range(1000)])
+
+    from PyQt5.QtCore import QEventLoop
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication(sys.argv[:1])
+    from history_panel import HistoryPanel
+
+    def open_panel():
+        panel = HistoryPanel(history)
+        panel.show()
+        app.processEvents(QEventLoop.AllEvents)
+        return panel
+
+    panel = timed('panel open + paint', open_panel)
+
+    def jump(row):
+        panel.view.scrollTo(panel.model.index(row, 0))
+        panel.view.viewport().repaint()
+
+    timed('jump to middle + repaint', lambda: jump(len(history) // 2), repeat=5)
+    timed('jump to end + repaint', lambda: jump(len(history) - 1), repeat=5)
+
+    def apply_filter():
+        panel.low_entry.setText('1.80')
+        panel.high_entry.setText('2.20')
+        panel.refresh()
+        panel.view.viewport().repaint()
+
+    timed('panel filter + repaint', apply_filter, repeat=3)
+    history.close()
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
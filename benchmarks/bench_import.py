@@ -0,0 +1,146 @@
+"""
+表格导入基准：生成 50 万行 CSV（可选 XLSX），在 offscreen 平台上通过工作表窗口后台导入，
+界面线程用 1ms 精确计时器做心跳，统计导入期间事件循环最长的一次停顿（60 fps 要求不超过 16ms），
+以及总耗时和导入到一半时取消的响应时间。
+用法: QT_QPA_PLATFORM=offscreen python benchmarks/bench_import.py [--rows 500000] [--xlsx-rows 50000]
+"""
+
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import QEventLoop, Qt, QTimer
+from PyQt5.QtWidgets import QApplication
+
+FRAME_BUDGET = 1 / 60
+
+
+def random_rows(count, seed=1):
+    rng = random.Random(seed)
+    for _ in range(count):
+        prob1, prob2 = round(rng.uniform(1.01, 5), 2), round(rng.uniform(1.01, 5), 2)
+        people1 = rng.randint(10, 99999)
+        row = [prob1, people1, prob2, int(prob1 * people1 / prob2)]
+        row[rng.randrange(4)] = ''
+        yield row
+
+
+def write_csv(path, count):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['A台赔率', 'A台金额', 'B台赔率', 'B台金额'])
+        writer.writerows(random_rows(count))
+
+
+def write_xlsx(path, count):
+    from openpyxl import Workbook
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(['prob1', 'people1', 'prob2', 'people2'])
+    for row in random_rows(count):
+        sheet.append([None if v == '' else v for v in row])
+    workbook.save(path)
+
+
+class Heartbeat:
+    """界面线程心跳：记录相邻两次计时器回调之间的最长间隔"""
+
+    def __init__(self):
+        self.timer = QTimer()
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setInterval(1)
+        self.timer.timeout.connect(self.tick)
+        self.gaps = []
+        self.last = None
+
+    def start(self):
+        self.last = time.perf_counter()
+        self.timer.start()
+
+    def tick(self):
+        now = time.perf_counter()
+        self.gaps.append(now - self.last)
+        self.last = now
+
+    def stop(self):
+        self.timer.stop()
+        return sorted(self.gaps)
+
+
+def run_import(app, window, path, cancel_at=None):
+    loop = QEventLoop()
+    heartbeat = Heartbeat()
+    cancelled = {}
+    window.model.clear()
+
+    def on_progress(percent):
+        if cancel_at is not None and percent >= cancel_at and 'at' not in cancelled:
+            cancelled['at'] = time.perf_counter()
+            window.cancel_import()
+
+    # 小文件可能在连上信号之前就导入完了，所以轮询窗口状态判断结束
+    poll = QTimer()
+    poll.setInterval(10)
+    poll.timeout.connect(lambda: not window.is_importing() and loop.quit())
+    start = time.perf_counter()
+    heartbeat.start()
+    window.start_import(path)
+    window.import_worker.progress.connect(on_progress)
+    poll.start()
+    loop.exec_()
+    poll.stop()
+    elapsed = time.perf_counter() - start
+    gaps = heartbeat.stop()
+    p99 = gaps[min(len(gaps) - 1, int(len(gaps) * 0.99))] * 1000
+    over = sum(1 for gap in gaps if gap > FRAME_BUDGET)
+    line = (f"rows={window.model.rowCount()} total={elapsed:.2f}s "
+            f"max_stall={gaps[-1] * 1000:.2f}ms p99_gap={p99:.2f}ms over_16.7ms={over}")
+    if 'at' in cancelled:
+        line += f" cancel_latency={(time.perf_counter() - cancelled['at']) * 1000:.1f}ms"
+    return f"{line} ({window.count_label.text()})"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="后台导入时的界面停顿")
+    parser.add_argument('--rows', type=int, default=500000)
+    parser.add_argument('--xlsx-rows', type=int, default=50000, help="0 表示跳过 XLSX")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    from worksheet import WorksheetWindow
+    window = WorksheetWindow()
+    window.show()
+    app.processEvents()
+
+    # 空闲时的心跳作参照，反映机器本身的调度抖动
+    heartbeat, loop = Heartbeat(), QEventLoop()
+    heartbeat.start()
+    QTimer.singleShot(2000, loop.quit)
+    loop.exec_()
+    print(f"idle max_stall={heartbeat.stop()[-1] * 1000:.2f}ms")
+
+    directory = tempfile.mkdtemp()
+    csv_path = os.path.join(directory, 'odds.csv')
+    write_csv(csv_path, args.rows)
+    print(f"csv  {run_import(app, window, csv_path)}")
+    print(f"csv  cancel at 50%: {run_import(app, window, csv_path, cancel_at=50)}")
+
+    if args.xlsx_rows:
+        try:
+            xlsx_path = os.path.join(directory, 'odds.xlsx')
+            write_xlsx(xlsx_path, args.xlsx_rows)
+        except ImportError:
+            print("xlsx skipped: openpyxl not installed")
+        else:
+            print(f"xlsx {run_import(app, window, xlsx_path)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+延迟统计基准：测量计时装饰器在关闭和开启时给一次 calculate 增加的开销，
+再用 QTest 模拟按键、小键盘和点击输入框，打印各指标的 p50/p95/p99/max 并导出 JSON。
+用法: QT_QPA_PLATFORM=offscreen python benchmarks/bench_latency.py [--calls 20000] [--dump latency.json]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication
+
+
+def per_call(func, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="延迟统计的开销与示例输出")
+    parser.add_argument('--calls', type=int, default=20000)
+    parser.add_argument('--dump', default=os.path.join(tempfile.mkdtemp(), 'latency.json'))
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    import calculator
+    import latency
+    from history import History
+    window = calculator.FloatingCalculator(history=History())
+    window.latency_path = args.dump
+    window.show()
+    app.processEvents()
+
+    # 四格都填满时 calculate 只解析不求解，便于单独看装饰器的开销
+    for entry, text in zip((window.prob1_entry, window.people1_entry, window.prob2_entry, window.people2_entry),
+                           ('1.95', '1000', '2.05', '951')):
+        entry.setText(text)
+    raw = calculator.FloatingCalculator.calculate.__wrapped__
+    bare = per_call(lambda: raw(window), args.calls)
+    off = per_call(window.calculate, args.calls)
+    latency.enable()
+    on = per_call(window.calculate, args.calls)
+    print(f"calculate per call: undecorated {bare:.2f} us, timing off {off:.2f} us (+{off - bare:.2f}), "
+          f"timing on {on:.2f} us (+{on - bare:.2f})")
+
+    latency.disable()
+    latency.enable()
+    window.do_clear_all()
+    for i in range(200):
+        window.prob1_entry.setText('1.95')
+        window.people1_entry.setText(str(1000 + i))
+        window.prob2_entry.setText('2.05')
+        window.people2_entry.setText('')
+        QTest.keyClick(window, Qt.Key_Return)
+        QTest.mouseClick(window.people2_entry, Qt.LeftButton)
+        QTest.keyClick(window, Qt.Key_Backspace)
+        QTest.keyClick(window, Qt.Key_Space)
+        app.processEvents()
+    window.toggle_numpad()
+    app.processEvents()
+    for _ in range(200):
+        window.numpad_click('1')
+        window.numpad_click('←')
+    for _ in range(200):
+        window.ad_label.scroll_text()
+
+    window.toggle_latency_overlay()
+    app.processEvents()
+    print(window.latency_overlay.text())
+    window.dump_latency()
+    print(f"dumped to {args.dump} ({os.path.getsize(args.dump)} bytes)")
+
+
+if __name__ == '__main__':
+    main()
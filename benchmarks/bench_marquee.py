@@ -0,0 +1,91 @@
+"""
+广告滚动条空闲开销基准：分别在窗口可见和最小化两种状态下运行若干秒，
+统计进程 CPU 时间和计时器唤醒次数，对比原来的 QLabel.setText 方案与自绘 MarqueeLabel。
+用法: QT_QPA_PLATFORM=offscreen python benchmarks/bench_marquee.py [--seconds 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import QEventLoop, QTimer
+from PyQt5.QtWidgets import QApplication, QLabel
+
+LEGACY_STYLE = """
+    QLabel {
+        font-family: "Microsoft YaHei";
+        font-size: 14px;
+        font-weight: bold;
+        background-color: #f8f8f8;
+        border-radius: 8px;
+        padding: 15px;
+    }
+"""
+
+
+class LegacyTicker:
+    """原实现：每 300ms 旋转字符串并 setText，窗口最小化后也不停"""
+
+    def __init__(self, window):
+        self.ticks = 0
+        marquee = window.ad_label
+        self.label = QLabel(marquee.text())
+        self.label.setStyleSheet(LEGACY_STYLE)
+        marquee.parentWidget().layout().replaceWidget(marquee, self.label)
+        marquee.hide()
+        marquee.deleteLater()
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.scroll_text)
+        self.timer.start(300)
+
+    def scroll_text(self):
+        self.ticks += 1
+        text = self.label.text()
+        self.label.setText(text[1:] + text[0])
+
+
+def run_for(app, seconds):
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    cpu = time.process_time()
+    loop.exec_()
+    return time.process_time() - cpu
+
+
+def measure(app, name, window, ticker, seconds):
+    for state in ('visible', 'minimized'):
+        if state == 'visible':
+            window.showNormal()
+        else:
+            window.showMinimized()
+        app.processEvents()
+        ticks = ticker.ticks
+        cpu = run_for(app, seconds)
+        wakeups = (ticker.ticks - ticks) / seconds
+        print(f"{name:>8} {state:>10} cpu={cpu / seconds * 1000:7.2f} ms/s  wakeups={wakeups:6.1f}/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="广告滚动条空闲开销")
+    parser.add_argument('--seconds', type=float, default=5)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    import calculator
+
+    legacy_window = calculator.FloatingCalculator()
+    legacy = LegacyTicker(legacy_window)
+    measure(app, 'legacy', legacy_window, legacy, args.seconds)
+    legacy.timer.stop()
+    legacy_window.close()
+
+    window = calculator.FloatingCalculator()
+    measure(app, 'marquee', window, window.ad_label, args.seconds)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+多进程分片求解扩展性基准：生成测试 CSV，对比单进程 cli.py 与不同进程数的 parallel.py，
+并校验输出逐字节一致。
+用法: python benchmarks/bench_parallel.py [--rows 5000000] [--workers 1,2,4,8,16]
+"""
+
+import argparse
+import filecmp
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cli
+import parallel
+
+
+def make_csv(path, rows, seed=0):
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write('prob1,people1,prob2,people2\n')
+        for _ in range(rows):
+            row = [f"{rng.uniform(1.01, 5.0):.2f}", str(rng.randint(10, 99999)),
+                   f"{rng.uniform(1.01, 5.0):.2f}", str(rng.randint(10, 99999))]
+            row[rng.randrange(4)] = ''
+            f.write(','.join(row) + '\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="多进程分片求解扩展性基准")
+    parser.add_argument('--rows', type=int, default=5000000)
+    parser.add_argument('--workers', default='1,2,4,8,16')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'input.csv')
+        make_csv(source, args.rows)
+        expected = os.path.join(tmp, 'single.csv')
+
+        start = time.perf_counter()
+        cli.main([source, '-o', expected, '--quiet'])
+        single = time.perf_counter() - start
+        print(f"cpu_count={os.cpu_count()} rows={args.rows}")
+        print(f"{'workers':>8} {'seconds':>9} {'rows/s':>11} {'speedup':>8} {'identical':>10}")
+        print(f"{'cli':>8} {single:>9.2f} {args.rows / single:>11.0f} {1.0:>7.2f}x {'-':>10}")
+
+        for workers in [int(w) for w in args.workers.split(',')]:
+            output = os.path.join(tmp, f'parallel-{workers}.csv')
+            start = time.perf_counter()
+            parallel.solve_file(source, output, workers=workers)
+            elapsed = time.perf_counter() - start
+            same = filecmp.cmp(expected, output, shallow=False)
+            print(f"{workers:>8} {elapsed:>9.2f} {args.rows / elapsed:>11.0f} "
+                  f"{single / elapsed:>7.2f}x {str(same):>10}")
+            os.remove(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+重新启动耗时基准：先以 --resident 冷启动一个计算器实例（offscreen 平台），
+然后反复执行 python calculator.py --resident [预填参数]，统计 进程启动 -> 已有窗口显示并应答 -> 进程退出 的耗时，
+并与冷启动到开始监听的耗时对比。每轮重新启动前先用 --hide 隐藏窗口，模拟用户关掉后再打开。
+用法: python benchmarks/bench_relaunch.py [--runs 30] [--cold-runs 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from instance import server_name
+
+CALCULATOR = os.path.join(ROOT, 'calculator.py')
+
+
+def wait_for(path, timeout=10):
+    deadline = time.perf_counter() + timeout
+    while not os.path.exists(path):
+        if time.perf_counter() > deadline:
+            raise TimeoutError(f"实例没有在 {timeout}s 内开始监听: {path}")
+        time.sleep(0.001)
+
+
+def launch(name, *extra):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, CALCULATOR, '--resident', '--instance-name', name, *extra],
+                   check=True)
+    return time.perf_counter() - start
+
+
+def report(name, samples):
+    samples = sorted(samples)
+    p50 = statistics.median(samples) * 1000
+    p90 = samples[min(len(samples) - 1, int(len(samples) * 0.9))] * 1000
+    print(f"{name:>16} runs={len(samples)} p50={p50:.2f}ms p90={p90:.2f}ms min={samples[0] * 1000:.2f}ms")
+
+
+def start_resident(name):
+    """冷启动常驻实例，返回 (进程, 启动到开始监听的秒数)"""
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, CALCULATOR, '--resident', '--instance-name', name],
+                               stderr=subprocess.DEVNULL)
+    wait_for(server_name(name))
+    return process, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="常驻模式重新启动耗时")
+    parser.add_argument('--runs', type=int, default=30)
+    parser.add_argument('--cold-runs', type=int, default=5)
+    args = parser.parse_args()
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    name = f"bench-relaunch-{os.getpid()}"
+
+    cold = []
+    for _ in range(args.cold_runs):
+        process, seconds = start_resident(name)
+        cold.append(seconds)
+        launch(name, '--quit')
+        process.wait(timeout=10)
+    report('cold start', cold)
+
+    resident, _ = start_resident(name)
+    try:
+        plain, prefilled = [], []
+        for i in range(args.runs):
+            launch(name, '--hide')
+            plain.append(launch(name))
+            launch(name, '--hide')
+            prefilled.append(launch(name, '--prob1', '1.95', '--people1', str(1000 + i), '--prob2', '2.05'))
+        report('relaunch', plain)
+        report('relaunch+prefill', prefilled)
+        launch(name, '--quit')
+        resident.wait(timeout=10)
+    finally:
+        if resident.poll() is None:
+            resident.kill()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+操作轨迹回放：把 calculator.py --record-trace 录下的轨迹在 offscreen 平台上重新投递给新建的主窗口，
+按事件分类（key / mouse / numpad / move）报告每个事件的耗时，并检查回放后的输入框内容与录制结束时一致。
+可以和 bench_gui.py 一样与本机基线比较，状态不一致或耗时退化时退出码为 1。
+
+    python calculator.py --record-trace shift.trace          # 正常使用，退出时写完轨迹
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_replay.py shift.trace              # 最快速度
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_replay.py shift.trace --speed 1    # 按原速
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_replay.py shift.trace --update-baseline
+
+没有真实轨迹时可以用 --record-demo 生成一段：QTest 模拟快速 Tab 切换打字、回车、连续点击复制、
+小键盘连按和清空，同时由录制器写入轨迹。
+"""
+
+import argparse
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(os.path.dirname(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import Qt, qInstallMessageHandler
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication, QPushButton
+
+from bench_gui import compare, percentile, quiet_platform_warnings
+
+
+def new_window():
+    import calculator
+    from history import History
+    window = calculator.FloatingCalculator(history=History())
+    window.show()
+    QTest.qWaitForWindowExposed(window)
+    window.prob1_entry.setFocus()
+    QApplication.processEvents()
+    return window
+
+
+def record_demo(path, rounds):
+    """用 QTest 模拟一段操作并录制，事件之间留几毫秒，接近手速"""
+    from input_trace import TraceRecorder
+    window = new_window()
+    recorder = TraceRecorder(window, path)
+    entries = (window.prob1_entry, window.people1_entry, window.prob2_entry, window.people2_entry)
+    clear_button = window.findChild(QPushButton, 'clear_button')
+    for i in range(rounds):
+        QTest.mouseClick(clear_button, Qt.LeftButton, Qt.NoModifier, clear_button.rect().center(), 5)
+        for text in ('1.95', str(1000 + i), '2.05'):
+            QTest.keyClicks(QApplication.focusWidget(), text, Qt.NoModifier, 2)
+            QTest.keyClick(QApplication.focusWidget(), Qt.Key_Tab, Qt.NoModifier, 2)
+        QTest.keyClick(QApplication.focusWidget(), Qt.Key_Return, Qt.NoModifier, 5)
+        for entry in entries[::-1] * 2:
+            QTest.mouseClick(entry, Qt.LeftButton, Qt.NoModifier, entry.rect().center(), 5)
+        if i % 5 == 0:
+            QTest.mouseClick(window.toggle_button, Qt.LeftButton, Qt.NoModifier, window.toggle_button.rect().center(), 5)
+            QTest.qWait(5)
+            buttons = {b.text(): b for b in window.numpad_widget.findChildren(QPushButton)}
+            QTest.mouseClick(window.people2_entry, Qt.LeftButton, Qt.NoModifier, window.people2_entry.rect().center(), 5)
+            for key in '←←←←←←' + str(900 + i):
+                QTest.mouseClick(buttons[key], Qt.LeftButton, Qt.NoModifier, buttons[key].rect().center(), 3)
+            QTest.mouseClick(window.toggle_button, Qt.LeftButton, Qt.NoModifier, window.toggle_button.rect().center(), 5)
+    QTest.qWait(10)
+    recorder.close()
+    print(f"recorded {recorder.count} events to {path} ({os.path.getsize(path)} bytes)")
+    window.close()
+
+
+def run(args):
+    from input_trace import read_trace, replay
+    trace = read_trace(args.trace)
+    if trace.final is None:
+        print("warning: trace has no final state (recording did not finish); skipping the state check")
+    window = new_window()
+    replay(window, trace, args.speed)  # 预热（第一次会创建小键盘、加载字体等）
+    result = replay(window, trace, args.speed)
+
+    print(f"{len(trace.events)} events, recorded over {trace.duration:.2f}s, replayed in {result.elapsed:.3f}s"
+          f" ({'max speed' if not args.speed else f'x{args.speed:g}'}), skipped {result.skipped}")
+    results = {}
+    for category in sorted(result.latencies):
+        samples = result.latencies[category]
+        results[f'{category}_p50_ms'] = (percentile(samples, 0.5) * 1000, 'ms')
+        results[f'{category}_p95_ms'] = (percentile(samples, 0.95) * 1000, 'ms')
+        print(f"{category:<8} n={len(samples):<6} p50={percentile(samples, 0.5) * 1000:7.3f}ms "
+              f"p95={percentile(samples, 0.95) * 1000:7.3f}ms max={max(samples) * 1000:7.3f}ms")
+    print("final state: " + json.dumps(result.final, ensure_ascii=False))
+    return results, result.mismatches(trace.final)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="回放操作轨迹，报告每个事件的耗时并检查最终状态")
+    parser.add_argument('trace', help="轨迹文件（calculator.py --record-trace 录制）")
+    parser.add_argument('--speed', type=float, help="按录制间隔的倍速回放，不给时尽快回放")
+    parser.add_argument('--record-demo', type=int, metavar='ROUNDS', help="先模拟 ROUNDS 轮操作录制到 trace 路径")
+    parser.add_argument('--baseline', help="基线 JSON 路径，默认为轨迹文件名加回放速度和 .baseline.json")
+    parser.add_argument('--update-baseline', action='store_true', help="把本次结果写为基线")
+    parser.add_argument('--threshold', type=float, default=0.2, help="超过基线多少比例算退化")
+    args = parser.parse_args()
+
+    qInstallMessageHandler(quiet_platform_warnings)
+    app = QApplication(sys.argv[:1])
+    if args.record_demo:
+        record_demo(args.trace, args.record_demo)
+    results, mismatches = run(args)
+    status = 0
+    for name, recorded, replayed in mismatches:
+        print(f"STATE MISMATCH {name}: recorded {recorded!r}, replayed {replayed!r}")
+        status = 1
+
+    # 原速回放时事件之间有空闲，缓存变冷，耗时与最快速度回放不可比，基线分开保存
+    speed = f'x{args.speed:g}' if args.speed else 'max'
+    baseline_path = args.baseline or f'{args.trace}.{speed}.baseline.json'
+    if args.update_baseline:
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump({name: value for name, (value, _) in results.items()}, f, indent=2)
+        print(f"baseline written to {baseline_path}")
+    elif os.path.exists(baseline_path):
+        with open(baseline_path, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+            status = 1
+    app.processEvents()
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
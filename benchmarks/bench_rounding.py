@@ -0,0 +1,82 @@
+"""
+取整求解基准：10 万组随机赔率，分别测一边金额已知（求最近倍数）、两边都待定且区间宽（整列求派彩差为 0 的组合）、
+两边都待定且区间窄（逐行类欧几里得 + 二分）三种情况的批量吞吐，以及窄区间下逐个枚举金额的暴力解作对照。
+用法: python benchmarks/bench_rounding.py [--pairs 100000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from batch import round_pairs_batch
+from rounding import StakeRule, odds_units, round_pair
+
+
+def random_odds(count, seed=1):
+    rng = np.random.default_rng(seed)
+    return (np.round(rng.uniform(1.01, 5, count), 2), np.round(rng.uniform(1.01, 5, count), 2))
+
+
+def brute_force(prob1, prob2, rule1, rule2):
+    """逐个枚举 A台 金额，B台 取最近的倍数"""
+    a, b = odds_units(prob1) * rule1.unit, odds_units(prob2) * rule2.unit
+    (lo1, hi1), (lo2, hi2) = rule1.multiples(), rule2.multiples()
+    best = None
+    for k1 in range(lo1, hi1 + 1):
+        k2 = min(max((2 * a * k1 + b - 1) // (2 * b), lo2), hi2)
+        key = (abs(a * k1 - b * k2), k1, k2)
+        if best is None or key < best:
+            best = key
+    return best[1] * rule1.unit, best[2] * rule2.unit
+
+
+def timed(label, count, func, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<34}{best * 1000:9.1f} ms  {count / best:12,.0f} pairs/s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="整数金额取整求解吞吐")
+    parser.add_argument('--pairs', type=int, default=100000)
+    args = parser.parse_args()
+    n = args.pairs
+    prob1, prob2 = random_odds(n)
+    nan = np.full(n, np.nan)
+    stakes = np.random.default_rng(2).integers(10, 50000, n).astype(np.float64)
+
+    wide = StakeRule(10, 10, 100000), StakeRule(100, 100, 100000)
+    narrow = StakeRule(1, 1000, 1200), StakeRule(1, 1000, 1200)
+
+    timed('batch, one stake known', n, lambda: round_pairs_batch(prob1, stakes, prob2, nan, *wide))
+    result = timed('batch, free, wide bounds', n, lambda: round_pairs_batch(prob1, nan, prob2, nan, *wide))
+    print(f"{'  zero imbalance':<34}{np.mean(result.imbalance == 0) * 100:8.1f} %")
+    count = n // 10
+    batch = timed(f'batch, free, narrow bounds ({count})', count,
+                  lambda: round_pairs_batch(prob1[:count], nan[:count], prob2[:count], nan[:count], *narrow))
+    scalar = timed(f'scalar round_pair, narrow ({count})', count,
+                   lambda: [round_pair(p, None, q, None, *narrow)
+                            for p, q in zip(prob1[:count].tolist(), prob2[:count].tolist())], repeat=1)
+    same = sum(1 for i, r in enumerate(scalar) if (batch.people1[i], batch.people2[i]) == (r.people1, r.people2))
+    print(f"{'  batch matches scalar':<34}{same:9d} / {count}")
+
+    # 暴力解只跑少量，顺便核对结果
+    count = 2000
+    sample = list(zip(prob1[:count].tolist(), prob2[:count].tolist()))
+    expected = timed(f'brute force, narrow ({count})', count,
+                     lambda: [brute_force(p, q, *narrow) for p, q in sample], repeat=1)
+    actual = [(r.people1, r.people2) for r in (round_pair(p, None, q, None, *narrow) for p, q in sample)]
+    print(f"{'  matches brute force':<34}{sum(map(tuple.__eq__, expected, actual)):9d} / {count}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+求解服务压测：在子进程启动 solver_service.py（UNIX socket 或本机 TCP），
+分别以 1、64、1024 个并发客户端各自循环“发请求-等响应”，统计吞吐和客户端延迟，
+最后读取服务端的批次和 p50/p99 统计。
+用法: python benchmarks/bench_service.py [--clients 1,64,1024] [--seconds 3] [--tcp]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def open_connection(args):
+    if args.tcp:
+        return await asyncio.open_connection('127.0.0.1', args.port)
+    return await asyncio.open_unix_connection(args.unix)
+
+
+async def client(args, deadline, latencies, seed):
+    rng = random.Random(seed)
+    reader, writer = await open_connection(args)
+    done = 0
+    while time.perf_counter() < deadline:
+        request = {'id': done, 'prob1': round(rng.uniform(1.01, 5), 2),
+                   'people1': rng.randint(10, 99999), 'prob2': round(rng.uniform(1.01, 5), 2)}
+        start = time.perf_counter()
+        writer.write((json.dumps(request) + '\n').encode())
+        await reader.readline()
+        latencies.append(time.perf_counter() - start)
+        done += 1
+    writer.close()
+    return done
+
+
+async def run_level(args, clients):
+    latencies = []
+    deadline = time.perf_counter() + args.seconds
+    start = time.perf_counter()
+    counts = await asyncio.gather(*(client(args, deadline, latencies, i) for i in range(clients)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    total = sum(counts)
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    print(f"{clients:>8} {total:>10} {total / elapsed:>10.0f} {p50:>9.3f} {p99:>9.3f}")
+
+
+async def server_stats(args):
+    reader, writer = await open_connection(args)
+    writer.write(b'{"op": "stats"}\n')
+    stats = json.loads(await reader.readline())
+    writer.close()
+    return stats
+
+
+async def run(args):
+    print(f"{'clients':>8} {'requests':>10} {'req/s':>10} {'p50 ms':>9} {'p99 ms':>9}")
+    for clients in [int(c) for c in args.clients.split(',')]:
+        await run_level(args, clients)
+    print("server:", json.dumps(await server_stats(args)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="求解服务压测")
+    parser.add_argument('--clients', default='1,64,1024')
+    parser.add_argument('--seconds', type=float, default=3)
+    parser.add_argument('--tcp', action='store_true', help="使用本机 TCP 而不是 UNIX socket")
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+    args.unix = os.path.join(tempfile.mkdtemp(), 'solver.sock')
+
+    command = [sys.executable, os.path.join(ROOT, 'solver_service.py')]
+    command += ['--port', str(args.port)] if args.tcp else ['--unix', args.unix]
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    try:
+        server.stdout.readline()  # 等待 listening 提示
+        asyncio.run(run(args))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == '__main__':
+    main()
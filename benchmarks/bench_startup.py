@@ -0,0 +1,89 @@
+"""
+冷启动基准：每轮启动一个新的 Python 进程，在 offscreen 平台上创建 QApplication 和主窗口，
+统计 导入 calculator -> 主窗口第一次绘制完成 的耗时（不含解释器和 PyQt5 自身的导入）。
+--baseline 指向另一份代码目录（例如旧版本的 git worktree）时两边交替运行，减少机器波动的影响。
+用法: python benchmarks/bench_startup.py [--runs 20] [--baseline 目录] [--theme light|dark|compact]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import os, sys, time
+sys.path.insert(0, sys.argv[1])
+from PyQt5.QtCore import QEvent, QObject, QTimer
+from PyQt5.QtWidgets import QApplication
+
+start = time.perf_counter()
+app = QApplication(sys.argv[:1])
+import calculator
+if sys.argv[2] and hasattr(calculator, 'apply_theme'):
+    calculator.apply_theme(app, sys.argv[2])
+window = calculator.FloatingCalculator()
+built = time.perf_counter()
+
+
+class FirstPaint(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            # 等这一轮绘制处理完再计时
+            QTimer.singleShot(0, self.done)
+        return False
+
+    def done(self):
+        now = time.perf_counter()
+        print(f"{(built - start) * 1000:.3f} {(now - start) * 1000:.3f}")
+        app.quit()
+
+
+watcher = FirstPaint()
+window.installEventFilter(watcher)
+window.show()
+app.exec_()
+"""
+
+
+def run_once(root, theme):
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    output = subprocess.run([sys.executable, '-c', CHILD, root, theme or ''], env=env,
+                            capture_output=True, text=True, check=True).stdout
+    built, painted = output.split()
+    return float(built), float(painted)
+
+
+def report(name, samples):
+    built = statistics.median(s[0] for s in samples)
+    painted = statistics.median(s[1] for s in samples)
+    shown = statistics.median(s[1] - s[0] for s in samples)
+    print(f"{name:>9} runs={len(samples)} build={built:.2f}ms show+paint={shown:.2f}ms "
+          f"first_paint={painted:.2f}ms (min {min(s[1] for s in samples):.2f}ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="冷启动到首帧的耗时")
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--baseline', help="作为对照的另一份代码目录")
+    parser.add_argument('--theme', help="启动前应用的主题（旧版本没有主题时忽略）")
+    args = parser.parse_args()
+
+    roots = {'current': ROOT}
+    if args.baseline:
+        roots['baseline'] = os.path.abspath(args.baseline)
+    samples = {name: [] for name in roots}
+    for root in roots.values():
+        run_once(root, args.theme)  # 预热文件缓存
+    for _ in range(args.runs):
+        for name, root in roots.items():
+            samples[name].append(run_once(root, args.theme))
+    for name in reversed(list(roots)):
+        report(name, samples[name])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+敏感度面板基准：offscreen 平台上模拟拖动区间滑块，每一步 setValues -> 整张网格重算 -> 同步重绘，
+统计每步耗时（要求 20ms 以内），并确认 QImage 与 NumPy 缓冲区是同一块内存。
+用法: QT_QPA_PLATFORM=offscreen python benchmarks/bench_sweep.py [--size 500] [--steps 300]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication
+
+BUDGET = 0.020
+
+
+def report(name, samples):
+    samples = sorted(samples)
+    p50 = samples[len(samples) // 2] * 1000
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000
+    over = sum(1 for s in samples if s > BUDGET)
+    print(f"{name:<24} p50={p50:6.2f}ms p99={p99:6.2f}ms max={samples[-1] * 1000:6.2f}ms over_20ms={over}/{len(samples)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="敏感度网格拖动时的重算与重绘耗时")
+    parser.add_argument('--size', type=int, default=500)
+    parser.add_argument('--steps', type=int, default=300)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    from sweep_panel import MODE_PROFIT, MODE_STAKE, SweepPanel
+    panel = SweepPanel(size=args.size)
+    panel.resize(args.size + 16, args.size + 140)
+    panel.set_center(1.95, 1000, 2.05)
+    panel.show()
+    app.processEvents()
+    grid = panel.grid
+    shared = (int(panel.view.image.constBits()) == grid.indexes.ctypes.data
+              and panel.view.image.pixelIndex(7, 3) == grid.indexes[3, 7])
+    print(f"grid {grid.width}x{grid.height}, view {panel.view.width()}x{panel.view.height()}, "
+          f"QImage shares NumPy buffer: {shared}")
+
+    for mode in (MODE_STAKE, MODE_PROFIT):
+        panel.mode_box.setCurrentIndex(mode)
+        computes, steps = [], []
+        low, high = panel.odds_slider.values()
+        for i in range(args.steps):
+            # 来回拖动高端手柄
+            offset = i % 100 if i // 100 % 2 == 0 else 100 - i % 100
+            start = time.perf_counter()
+            panel.odds_slider.setValues(low, high + offset)
+            panel.view.repaint()
+            app.processEvents()
+            steps.append(time.perf_counter() - start)
+            computes.append(panel.last_compute)
+        report(f"{panel.mode_box.currentText()} compute", computes)
+        report(f"{panel.mode_box.currentText()} drag step", steps)
+    print(f"QImage still shares NumPy buffer: {int(panel.view.image.constBits()) == grid.indexes.ctypes.data}")
+
+
+if __name__ == '__main__':
+    main()
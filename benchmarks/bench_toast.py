@@ -0,0 +1,108 @@
+"""
+复制提示基准：在 offscreen 平台上对有内容的输入框连续点击 1000 次，
+统计每次点击的耗时、窗口下新建的子对象数量、同时存活的提示数量峰值和 Python 内存分配峰值，
+对比原来的“每次点击新建 QLabel，1 秒后 deleteLater”与复用的 Toast 浮层。
+用法: QT_QPA_PLATFORM=offscreen python benchmarks/bench_toast.py [--clicks 1000]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import QEvent, QEventLoop, QObject, Qt, QTimer
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication, QLabel, QLineEdit
+
+
+def legacy_entry_click(window):
+    """原实现：每次点击新建一个提示 QLabel"""
+    def handle_entry_click(event, entry):
+        window.current_entry = entry
+        entry.setFocus()
+        content = entry.text().strip()
+        if content:
+            window.copy_to_clipboard(content)
+            tip = QLabel("已复制到剪贴板", window)
+            tip.setObjectName("toast")
+            tip.adjustSize()
+            pos = window.mapToGlobal(window.rect().center())
+            tip.move(pos.x() - tip.width() // 2, pos.y() - tip.height() // 2)
+            tip.show()
+            QTimer.singleShot(1000, tip.deleteLater)
+        QLineEdit.mousePressEvent(entry, event)
+    return handle_entry_click
+
+
+class ChildCounter(QObject):
+    """统计窗口收到的 ChildAdded 事件，即点击过程中新建的子对象"""
+
+    def __init__(self):
+        super().__init__()
+        self.added = 0
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.ChildAdded:
+            self.added += 1
+        return False
+
+
+def live_tips(window):
+    return sum(1 for label in window.findChildren(QLabel, "toast") if label.isVisible())
+
+
+def burst(app, window, clicks):
+    entry = window.prob1_entry
+    entry.setText('1.95')
+    app.processEvents()
+    counter = ChildCounter()
+    window.installEventFilter(counter)
+    peak_tips = 0
+    samples = []
+    tracemalloc.start()
+    for _ in range(clicks):
+        start = time.perf_counter()
+        QTest.mouseClick(entry, Qt.LeftButton)
+        app.processEvents()
+        samples.append(time.perf_counter() - start)
+        peak_tips = max(peak_tips, live_tips(window))
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    window.removeEventFilter(counter)
+    # 等提示全部消失，避免影响下一组
+    loop = QEventLoop()
+    QTimer.singleShot(1500, loop.quit)
+    loop.exec_()
+    samples.sort()
+    return samples, counter.added, peak_tips, peak_bytes
+
+
+def report(name, samples, created, peak_tips, peak_bytes):
+    p50 = samples[len(samples) // 2] * 1000
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000
+    print(f"{name:>7} p50={p50:.3f}ms p99={p99:.3f}ms max={samples[-1] * 1000:.3f}ms "
+          f"objects_created={created} peak_visible={peak_tips} py_peak={peak_bytes / 1024:.0f}KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="连续点击时的复制提示开销")
+    parser.add_argument('--clicks', type=int, default=1000)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    import calculator
+    window = calculator.FloatingCalculator()
+    window.show()
+    app.processEvents()
+
+    report('toast', *burst(app, window, args.clicks))
+    window.handle_entry_click = legacy_entry_click(window)
+    report('legacy', *burst(app, window, args.clicks))
+
+
+if __name__ == '__main__':
+    main()
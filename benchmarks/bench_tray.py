@@ -0,0 +1,100 @@
+"""
+托盘模式基准（offscreen 平台）：比较窗口显示、隐藏但保留控件树、释放控件树三种状态下的常驻内存（RSS）和窗口内的 QObject 数，
+然后反复 隐藏 -> 释放 -> 重建并显示，统计重建到窗口画出来的耗时，最后检查多轮之后 RSS 没有持续增长。
+RSS 读 /proc/self/statm，只支持 Linux。
+用法: python benchmarks/bench_tray.py [--cycles 50]
+"""
+
+import argparse
+import gc
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtCore import QEvent, QObject
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication
+
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+
+
+def rss_mb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * PAGE_SIZE / (1 << 20)
+
+
+def settle(app):
+    """处理完排队的事件和 deleteLater，再回收 Python 对象"""
+    for _ in range(3):
+        app.processEvents()
+        app.sendPostedEvents(None, QEvent.DeferredDelete)
+    gc.collect()
+
+
+def snapshot(app, window, label):
+    settle(app)
+    print(f"{label:<26}rss={rss_mb():7.1f} MB  qobjects={len(window.findChildren(QObject)):4}")
+    return rss_mb()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="托盘模式的空闲内存和重建耗时")
+    parser.add_argument('--cycles', type=int, default=50, help="隐藏/释放/重建的轮数")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    import calculator
+    from history import History
+    from tray import TrayController
+    window = calculator.FloatingCalculator(history=History())
+    window.tray = TrayController(window, idle_seconds=0)
+    window.show()
+    QTest.qWaitForWindowExposed(window)
+    # 正常使用过一阵：小键盘创建过，输入框里有值
+    window.toggle_numpad()
+    window.toggle_numpad()
+    for field, text in zip(calculator.FIELDS, ('1.95', '1000', '2.05', '')):
+        getattr(window, field + '_entry').setText(text)
+    window.calculate()
+
+    visible = snapshot(app, window, 'visible')
+    # 对照：只隐藏，不释放
+    window.tray.idle_timer.setInterval(1 << 30)
+    window.hide()
+    hidden = snapshot(app, window, 'hidden, widgets kept')
+    window.release_widgets()
+    released = snapshot(app, window, 'hidden, widgets released')
+    print(f"released {hidden - released:.1f} MB vs hidden ({(hidden - released) / hidden:.0%})")
+
+    window.tray.idle_timer.setInterval(0)
+    values = window.released_state.values[:]
+    restores = []
+    for _ in range(args.cycles):
+        window.bring_to_front()  # 先让计时器以外的状态一致
+        settle(app)
+        window.hide()
+        # 等空闲计时器超时，由托盘控制器释放
+        deadline = time.perf_counter() + 5
+        while window.released_state is None:
+            assert time.perf_counter() < deadline, "idle timer did not release the widgets"
+            QTest.qWait(1)
+        settle(app)
+        start = time.perf_counter()
+        window.bring_to_front()
+        app.processEvents()  # 重建、布局和第一次绘制
+        restores.append(time.perf_counter() - start)
+        assert [getattr(window, field + '_entry').text() for field in calculator.FIELDS] == values
+    restores.sort()
+    print(f"restore (rebuild + first paint) n={len(restores)} p50={statistics.median(restores) * 1000:.2f} ms "
+          f"p95={restores[int(len(restores) * 0.95)] * 1000:.2f} ms max={restores[-1] * 1000:.2f} ms")
+    after = snapshot(app, window, f'visible after {args.cycles} cycles')
+    print(f"rss growth over cycles {after - visible:+.1f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+工作表帧时间基准：offscreen 平台上打开 10 万行的工作表，
+逐帧滚动（每帧 3 行或一整页）并同步重绘，统计每帧耗时；
+再随机编辑可见格子（setData -> 单行重算 -> dataChanged -> 重绘），统计每次编辑耗时和发出的 dataChanged 次数。
+60 fps 对应每帧 16.7ms。
+用法: QT_QPA_PLATFORM=offscreen python benchmarks/bench_worksheet.py [--rows 100000] [--frames 300]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt5.QtWidgets import QApplication
+
+FRAME_BUDGET = 1 / 60
+
+
+def random_rows(count, seed=1):
+    """每行随机留一格未知"""
+    rng = random.Random(seed)
+    columns = [[], [], [], []]
+    for _ in range(count):
+        prob1, prob2 = round(rng.uniform(1.01, 5), 2), round(rng.uniform(1.01, 5), 2)
+        people1 = rng.randint(10, 99999)
+        row = [prob1, people1, prob2, int(prob1 * people1 / prob2)]
+        row[rng.randrange(4)] = None
+        for column, value in zip(columns, row):
+            column.append(value)
+    return columns
+
+
+def report(name, samples):
+    samples = sorted(samples)
+    p50 = samples[len(samples) // 2] * 1000
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000
+    over = sum(1 for s in samples if s > FRAME_BUDGET)
+    print(f"{name:<14} p50={p50:6.2f}ms p99={p99:6.2f}ms max={samples[-1] * 1000:6.2f}ms "
+          f"over_16.7ms={over}/{len(samples)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="工作表滚动与编辑帧时间")
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--frames', type=int, default=300)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])
+    from worksheet import WorksheetWindow
+    window = WorksheetWindow()
+    columns = random_rows(args.rows)
+    start = time.perf_counter()
+    window.model.append_rows(*columns)
+    print(f"append {args.rows} rows: {(time.perf_counter() - start) * 1000:.1f} ms")
+    window.show()
+    app.processEvents()
+
+    view = window.view
+    bar = view.verticalScrollBar()
+
+    def scroll(step):
+        samples = []
+        bar.setValue(0)
+        app.processEvents()
+        for _ in range(args.frames):
+            start = time.perf_counter()
+            bar.setValue((bar.value() + step) % (bar.maximum() + 1))
+            view.viewport().repaint()
+            app.processEvents()
+            samples.append(time.perf_counter() - start)
+        return samples
+
+    report('scroll 3 rows', scroll(3))
+    report('scroll page', scroll(bar.pageStep()))
+
+    rng = random.Random(2)
+    signals = []
+    window.model.dataChanged.connect(lambda first, last: signals.append(last.column() - first.column() + 1))
+    samples = []
+    for _ in range(args.frames):
+        bar.setValue(rng.randrange(bar.maximum() + 1))
+        app.processEvents()
+        top = view.rowAt(0)
+        row, column = top + rng.randrange(10), rng.randrange(4)
+        value = f"{rng.uniform(1.01, 5):.2f}" if column in (0, 2) else str(rng.randint(10, 99999))
+        start = time.perf_counter()
+        window.model.setData(window.model.index(row, column), value)
+        app.processEvents()
+        samples.append(time.perf_counter() - start)
+    report('edit + repaint', samples)
+    print(f"dataChanged per edit {len(signals) / args.frames:.2f}, cells per signal "
+          f"{sum(signals) / max(len(signals), 1):.2f}")
+
+
+if __name__ == '__main__':
+    main()
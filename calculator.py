@@ -5,13 +5,33 @@ Description: 赔率计算器 - 支持快捷键和手动计算
 Version: 2.0.3
 """
 
+import time
+
+STARTUP_TIME = time.perf_counter()  # 在导入 PyQt5 之前记录，--profile-startup 用来统计导入耗时
+
 import sys
 import os
+
+# 常驻模式下已有实例在运行时，直接把参数转给它后退出，不导入 PyQt5
+if __name__ == '__main__' and '--resident' in sys.argv[1:]:
+    from instance import forward_to_running
+    if forward_to_running(sys.argv[1:]):
+        sys.exit(0)
+
+import argparse
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QPushButton, QLineEdit, QLabel, QFrame, QSlider, QGridLayout)
-from PyQt5.QtCore import Qt, QPoint, QLocale,QTimer,QPropertyAnimation, QRect
+from PyQt5.QtCore import Qt, QPoint, QLocale,QTimer,QPropertyAnimation, QRect, QSocketNotifier, QObject, QEvent
 from PyQt5.QtGui import QFont, QDoubleValidator, QIntValidator, QIcon  # 添加 QIcon
-import pyperclip
+
+from widgets import LatencyOverlay, MarqueeLabel, Toast
+from themes import THEMES, apply_theme, current_theme, next_theme
+
+from solver import solve_text, parse_value, format_value, FIELDS, PROB1, PEOPLE1, PROB2, PEOPLE2, STATUS_OK, STATUS_ERROR
+from rounding import DEFAULT_RULE, StakeRule, round_pair
+from history import History, HistoryLog
+import latency
+from latency import timed
 
 
 def resource_path(relative_path):
@@ -19,24 +39,69 @@ def resource_path(relative_path):
     if hasattr(sys, '_MEIPASS'):
         return os.path.join(sys._MEIPASS, relative_path)
     return os.path.join(os.path.abspath("."), relative_path)
+
+class StartupProfile(QObject):
+    """启动各阶段耗时：mark 记录自上一阶段以来的时间，窗口第一次绘制完成后打印到 stderr"""
+
+    def __init__(self, start=STARTUP_TIME):
+        super().__init__()
+        self.start = start
+        self.last = start
+        self.phases = []
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.phases.append((name, now - self.last))
+        self.last = now
+
+    def watch_first_paint(self, widget):
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            # 等这一轮绘制处理完再计时
+            QTimer.singleShot(0, self.first_paint)
+        return False
+
+    def first_paint(self):
+        self.mark('first_paint')
+        self.report()
+
+    def report(self, out=sys.stderr):
+        for name, seconds in self.phases:
+            print(f"{name:<28}{seconds * 1000:8.2f} ms", file=out)
+        print(f"{'total':<28}{(self.last - self.start) * 1000:8.2f} ms", file=out)
+        out.flush()
+
+# 订阅推送时当前这组在 HedgeBook 中的组合名
+FEED_PAIR = 'current'
+
+# 按键延迟只统计这几个键，其它键不计时
+KEY_METRICS = {Qt.Key_Return: 'key_enter', Qt.Key_Enter: 'key_enter',
+               Qt.Key_Space: 'key_space', Qt.Key_Backspace: 'key_backspace'}
+
 class FloatingCalculator(QMainWindow):
-    def __init__(self):
+    def __init__(self, profile=None, history=None):
         super().__init__()
+        self.profile = profile
         # 基础窗口设置
         self.setWindowTitle("千城赔率计算器")
         self.setWindowFlags(Qt.WindowStaysOnTopHint | Qt.FramelessWindowHint)
         self.setFixedSize(350, 450)
+        self.setObjectName("calculator")
 
         # 设置应用程序的默认字体
         self.default_font = QFont("Microsoft YaHei", 10, QFont.Bold)
         QApplication.setFont(self.default_font)
 
+        # 所有控件共用应用程序级样式表，控件只设置 objectName
+        app = QApplication.instance()
+        if app.property('theme') is None:
+            apply_theme(app)
+
         # 创建主窗口部件
-        self.central_widget = QWidget()
-        self.setCentralWidget(self.central_widget)
-        self.main_layout = QVBoxLayout(self.central_widget)
-        self.main_layout.setContentsMargins(5, 5, 5, 5)
-        self.main_layout.setSpacing(10)
+        self.create_central_widget()
 
         # 初始化变量
         self.current_entry = None
@@ -53,60 +118,195 @@ class FloatingCalculator(QMainWindow):
         self.transparency_label = None
         self.transparency_slider = None
 
+        # 实时赔率推送
+        self.feed = None
+        self.feed_notifier = None
+        self.feed_tables = None
+
+        # 常驻单实例
+        self.resident_server = None
+        self.quitting = False
+
+        # 计算历史，面板第一次打开时才创建
+        self.history = history if history is not None else History()
+        self.history_panel = None
+        # 日志按 flush_interval 批量写盘，停下来之后由这个计时器写出最后一批
+        self.history_flush_timer = QTimer(self)
+        self.history_flush_timer.setSingleShot(True)
+        self.history_flush_timer.setInterval(1000)
+        self.history_flush_timer.timeout.connect(self.flush_history)
+        self.worksheet = None
+        self.sweep_panel = None
+        self.clipboard_watcher = None
+        self.latency_overlay = None
+        self.latency_path = None
+        self.trace_recorder = None
+        # 托盘模式：窗口隐藏太久时释放控件树，期间状态保存在 released_state
+        self.tray = None
+        self.released_state = None
+        # A台/B台 的下注规则（单位、最低/最高金额），有规则时求金额按规则取整
+        self.stake_rules = (DEFAULT_RULE, DEFAULT_RULE)
+
         # 初始化UI
         self.setup_ui()
+        self.toast = Toast(self)
         self.current_entry = None  # 确保正确初始化
+    @timed('calculate')
     def calculate(self):
         """执行计算功能"""
         try:
-            def get_valid_number(text, is_float=True):
-                text = text.strip()
-                if not text or text == '.' or text == '0.':
-                    return None
-                try:
-                    return float(text) if is_float else int(text)
-                except ValueError:
-                    return None
-
-            prob1 = get_valid_number(self.prob1_entry.text(), True)
-            prob2 = get_valid_number(self.prob2_entry.text(), True)
-            people1 = get_valid_number(self.people1_entry.text(), False)
-            people2 = get_valid_number(self.people2_entry.text(), False)
+            if any(rule.active for rule in self.stake_rules) and self.calculate_rounded():
+                return
+            result = solve_text(self.prob1_entry.text(), self.people1_entry.text(),
+                                self.prob2_entry.text(), self.people2_entry.text())
 
             # 只要有三个值，就计算第四个值
-            if prob1 and people1 and prob2 and not people2:
-                # 计算金额2
-                result = int((prob1 * people1) / prob2)
-                self.people2_entry.setText(str(result))
-            elif prob1 and people1 and people2 and not prob2:
-                # 计算赔率2
-                result = (prob1 * people1) / people2
-                self.prob2_entry.setText(f"{result:.2f}")
-            elif prob1 and prob2 and people2 and not people1:
-                # 计算金额1
-                result = int((prob2 * people2) / prob1)
-                self.people1_entry.setText(str(result))
-            elif prob2 and people1 and people2 and not prob1:
-                # 计算赔率1
-                result = (prob2 * people2) / people1
-                self.prob1_entry.setText(f"{result:.2f}")
+            if result.status == STATUS_OK:
+                entry = getattr(self, result.solved + '_entry')
+                entry.setText(result.text(result.solved))
+                self.record_history(result)
+                self.track_feed_pair(result)
+            elif result.status == STATUS_ERROR:
+                print(f"计算错误: {result.as_tuple()}")
 
         except Exception as e:
             print(f"计算错误: {str(e)}")
 
-    def setup_ui(self):
-        """设置UI组件"""
+    def calculate_rounded(self):
+        """
+        按下注规则求金额：两边赔率已填、至少一边金额待求时，求派彩差最小的合法金额，
+        两边金额都空时一起求出。不适用时返回 False，交给普通求解。
+        """
+        values = [parse_value(getattr(self, field + '_entry').text(), field in (PROB1, PROB2))
+                  for field in FIELDS]
+        prob1, people1, prob2, people2 = values
+        if not (prob1 and prob2) or (people1 and people2):
+            return False
+        result = round_pair(prob1, people1, prob2, people2, *self.stake_rules)
+        if result.status == STATUS_OK:
+            for field in result.solved:
+                getattr(self, field + '_entry').setText(result.text(field))
+            self.record_history(result, result.solved[-1])
+            self.track_feed_pair(result)
+        elif result.status == STATUS_ERROR:
+            print(f"计算错误: 没有符合下注规则的金额 {result.as_tuple()}")
+        return True
+
+    def set_stake_rules(self, rule1, rule2):
+        self.stake_rules = (rule1 or DEFAULT_RULE, rule2 or DEFAULT_RULE)
+
+    def record_history(self, result, solved=None):
+        """记下一次成功求解，历史面板开着时刷新"""
+        try:
+            self.history.add(result.prob1, result.people1, result.prob2, result.people2,
+                             result.solved if solved is None else solved)
+        except OSError as e:
+            print(f"历史记录写入失败: {str(e)}")
+        if not self.history_flush_timer.isActive():
+            self.history_flush_timer.start()
+        if self.history_panel is not None and self.history_panel.isVisible():
+            self.history_panel.refresh()
+
+    def flush_history(self):
+        try:
+            self.history.flush()
+        except OSError as e:
+            print(f"历史记录写入失败: {str(e)}")
+
+    def toggle_history(self):
+        """显示或隐藏历史面板"""
+        if self.history_panel is None:
+            from history_panel import HistoryPanel
+            self.history_panel = HistoryPanel(self.history, self)
+        if self.history_panel.isVisible():
+            self.history_panel.hide()
+        else:
+            self.history_panel.refresh()
+            self.history_panel.show()
+            self.history_panel.raise_()
+
+    def toggle_sweep(self):
+        """显示或隐藏敏感度面板，打开时以当前的A台赔率、A台金额、B台赔率为中心"""
+        if self.sweep_panel is None:
+            from sweep_panel import SweepPanel
+            self.sweep_panel = SweepPanel(self)
+        if self.sweep_panel.isVisible():
+            self.sweep_panel.hide()
+            return
+        prob1 = parse_value(self.prob1_entry.text(), True)
+        if prob1:
+            self.sweep_panel.set_center(prob1, parse_value(self.people1_entry.text(), False),
+                                        parse_value(self.prob2_entry.text(), True))
+        self.sweep_panel.show()
+        self.sweep_panel.raise_()
+
+    def toggle_worksheet(self):
+        """显示或隐藏多组对冲工作表"""
+        if self.worksheet is None:
+            from worksheet import WorksheetWindow
+            self.worksheet = WorksheetWindow(self)
+            self.worksheet.model.append_empty(50)
+        if self.worksheet.isVisible():
+            self.worksheet.hide()
+        else:
+            self.worksheet.show()
+            self.worksheet.raise_()
 
+    def create_central_widget(self):
+        self.central_widget = QWidget()
+        self.setCentralWidget(self.central_widget)
+        self.main_layout = QVBoxLayout(self.central_widget)
+        self.main_layout.setContentsMargins(5, 5, 5, 5)
+        self.main_layout.setSpacing(10)
 
+    def release_widgets(self):
+        """拆掉整个控件树，只留下 CompactState（四个数值和设置），restore_widgets 重建"""
+        if self.released_state is not None:
+            return
+        from tray import CompactState
+        self.released_state = CompactState.capture(self)
+        self.takeCentralWidget().deleteLater()
+        self.central_widget = self.main_layout = None
+        self.prob1_entry = self.people1_entry = self.prob2_entry = self.people2_entry = None
+        self.current_entry = None
+        self.ad_label = None
+        self.toggle_button = None
+        self.numpad_widget = None
+        self.numpad_visible = False
+        self.transparency_label = self.transparency_slider = None
+        self.latency_overlay = None
+        self.profile = None  # 启动耗时只统计第一次
+        self.setFixedHeight(450)
+        # 连同原生窗口和后备缓冲区一起释放，下次 show 时自动重新创建
+        self.destroy()
+
+    def restore_widgets(self):
+        """重建控件树并写回释放时保存的状态，未释放时什么也不做"""
+        state = self.released_state
+        if state is None:
+            return
+        self.released_state = None
+        self.create_central_widget()
+        self.setup_ui()
+        state.apply(self)
 
+    def minimize(self):
+        """有托盘图标时隐藏到托盘，否则最小化"""
+        if self.tray is not None and self.tray.available:
+            self.hide()
+        else:
+            self.showMinimized()
 
-        self.create_title_bar()
-        self.create_ad_space()
-        self.create_input_area()
-        self.create_action_buttons()
+    def setup_ui(self):
+        """设置UI组件，数字键盘在第一次展开时才创建"""
+        if self.profile:
+            self.profile.mark('window')
+        for create in (self.create_title_bar, self.create_ad_space, self.create_input_area,
+                       self.create_action_buttons, self.create_transparency_slider):
+            create()
+            if self.profile:
+                self.profile.mark(create.__name__)
 
-        self.create_numpad()
-        self.create_transparency_slider()
         spacer = QWidget()
         spacer.setFixedHeight(5)
         self.main_layout.addWidget(spacer)
@@ -132,45 +332,20 @@ class FloatingCalculator(QMainWindow):
         title_layout.setContentsMargins(5, 0, 0, 0)
 
         title_label = QLabel("千城赔率计算器V2.1.3")
-        title_label.setStyleSheet("""
-            font-family: "Microsoft YaHei";
-            font-size: 16px;
-            font-weight: bold;
-        """)
+        title_label.setObjectName("title_label")
 
         min_btn = QPushButton("─")
         close_btn = QPushButton("×")
+        min_btn.setObjectName("min_button")
+        close_btn.setObjectName("close_button")
 
         min_btn.setFixedSize(45, 30)
         close_btn.setFixedSize(45, 30)
 
-        button_style = """
-            QPushButton {
-                background-color: #f0f0f0;
-                border: none;
-                color: #333333;
-                font-family: "Microsoft YaHei";
-                font-weight: bold;
-                font-size: 16px;
-            }
-            QPushButton:hover {
-                background-color: #e0e0e0;
-            }
-        """
-        close_style = """
-            QPushButton:hover {
-                background-color: #e81123;
-                color: white;
-            }
-        """
-
-        min_btn.setStyleSheet(button_style)
-        close_btn.setStyleSheet(button_style + close_style)
-
         min_btn.setFocusPolicy(Qt.NoFocus)
         close_btn.setFocusPolicy(Qt.NoFocus)
 
-        min_btn.clicked.connect(self.showMinimized)
+        min_btn.clicked.connect(self.minimize)
         close_btn.clicked.connect(self.close)
 
         title_layout.addWidget(title_label)
@@ -203,36 +378,14 @@ class FloatingCalculator(QMainWindow):
         ad_layout = QVBoxLayout(ad_container)
         ad_layout.setContentsMargins(0, 0, 0, 0)
 
-        # 创建广告标签
-        self.ad_label = QLabel()
-        self.ad_label.setStyleSheet("""
-            QLabel {
-                font-family: "Microsoft YaHei";
-                font-size: 14px;
-                font-weight: bold;
-                background-color: #f8f8f8;
-                border-radius: 8px;
-                padding: 15px;
-            }
-        """)
-
-        # 设置初始文本
-        self.ad_label.setText('足球胜率80%TG:qiancheng8778   三同ipTG:hxm13113039   ')
-
-        # 创建动画
-        self.scroll_animation = QTimer()
-        self.scroll_animation.timeout.connect(self.scroll_text)
-        self.scroll_animation.start(300)  # 每50毫秒更新一次
+        # 创建广告标签：自绘滚动，窗口隐藏、最小化或被遮挡时自动暂停
+        self.ad_label = MarqueeLabel('足球胜率80%TG:qiancheng8778   三同ipTG:hxm13113039   ')
+        self.ad_label.setObjectName("ad_label")
+        self.ad_label.setContentsMargins(15, 15, 15, 15)
 
         ad_layout.addWidget(self.ad_label)
         self.main_layout.addWidget(ad_container)
 
-    def scroll_text(self):
-        """文本滚动效果"""
-        text = self.ad_label.text()
-        text = text[1:] + text[0]  # 将第一个字符移到末尾
-        self.ad_label.setText(text)
-
     def create_input_area(self):
         """创建输入区域"""
         input_widget = QWidget()
@@ -298,22 +451,7 @@ class FloatingCalculator(QMainWindow):
         self.main_layout.addWidget(input_widget)
 
     def _setup_entry(self, entry):
-        """设置输入框的样式和属性"""
-        # 设置样式
-        entry.setStyleSheet("""
-            QLineEdit {
-                padding: 8px;
-                border: 2px solid #dcdcdc;
-                border-radius: 8px;
-                background-color: white;
-                selection-background-color: #0078d4;
-                selection-color: white;
-            }
-            QLineEdit:focus {
-                border: 2px solid #0078d4;
-            }
-        """)
-
+        """设置输入框的属性，样式见 themes.py"""
         # 设置大小和边距
         entry.setFixedHeight(40)
         entry.setMinimumWidth(160)  # 调整宽度以适应两列布局
@@ -335,33 +473,15 @@ class FloatingCalculator(QMainWindow):
         # 添加点击事件处理
         entry.mousePressEvent = lambda event, e=entry: self.handle_entry_click(event, e)
 
+    @timed('handle_entry_click')
     def handle_entry_click(self, event, entry):
         """处理输入框点击事件"""
         self.current_entry = entry
         entry.setFocus()
         content = entry.text().strip()
         if content:
-            pyperclip.copy(content)
-            tip = QLabel("已复制到剪贴板", self)
-            tip.setStyleSheet("""
-                        QLabel {
-                            background-color: rgba(0, 0, 0, 0.7);
-                            color: white;
-                            padding: 8px 12px;
-                            border-radius: 4px;
-                            font-size: 12px;
-                        }
-                    """)
-            tip.adjustSize()
-
-            # 计算提示框位置（居中显示）
-            pos = self.mapToGlobal(self.rect().center())
-            tip.move(pos.x() - tip.width() // 2, pos.y() - tip.height() // 2)
-
-            tip.show()
-
-            # 创建定时器，1秒后隐藏提示
-            QTimer.singleShot(1000, tip.deleteLater)
+            self.copy_to_clipboard(content)
+            self.toast.show_message("已复制到剪贴板")
         QLineEdit.mousePressEvent(entry, event)  # 调用原始的鼠标点击事件处理
 
     def handle_focus_in(self, event, entry):
@@ -382,98 +502,34 @@ class FloatingCalculator(QMainWindow):
 
         # 创建左侧的切换按钮
         self.toggle_button = QPushButton("▲")
+        self.toggle_button.setObjectName("toggle_button")
         self.toggle_button.setFixedSize(45, 45)
         self.toggle_button.setFocusPolicy(Qt.NoFocus)
         self.toggle_button.clicked.connect(self.toggle_numpad)
-        self.toggle_button.setStyleSheet("""
-            QPushButton {
-                font-family: "Microsoft YaHei";
-                background-color: #f0f0f0;
-                border-radius: 8px;
-                font-weight: bold;
-                font-size: 16px;
-            }
-            QPushButton:hover {
-                background-color: #e0e0e0;
-            }
-        """)
 
         control_layout.addWidget(self.toggle_button)
         control_layout.addStretch()
 
         # 创建计算按钮（使用 = 符号）
         calc_btn = QPushButton("=")
+        calc_btn.setObjectName("calc_button")
         calc_btn.setFixedSize(80, 45)
         calc_btn.setFocusPolicy(Qt.NoFocus)
         calc_btn.clicked.connect(self.calculate)
-        calc_btn.setStyleSheet("""
-            QPushButton {
-                font-family: "Microsoft YaHei";
-                background-color: #0078d4;
-                color: white;
-                border-radius: 8px;
-                font-weight: bold;
-                font-size: 24px;
-            }
-            QPushButton:hover {
-                background-color: #106ebe;
-            }
-        """)
 
         # 创建清除按钮（使用 × 符号）
         clear_btn = QPushButton("×")
+        clear_btn.setObjectName("clear_button")
         clear_btn.setFixedSize(80, 45)
         clear_btn.setFocusPolicy(Qt.NoFocus)
         clear_btn.clicked.connect(self.do_clear_all)
-        clear_btn.setStyleSheet("""
-            QPushButton {
-                font-family: "Microsoft YaHei";
-                background-color: #e81123;
-                color: white;
-                border-radius: 8px;
-                font-weight: bold;
-                font-size: 24px;
-            }
-            QPushButton:hover {
-                background-color: #c41019;
-            }
-        """)
 
         control_layout.addWidget(calc_btn)
         control_layout.addWidget(clear_btn)
         self.main_layout.addWidget(control_widget)
 
-    def create_numpad_toggle(self):
-        """创建数字键盘切换按钮"""
-        toggle_widget = QWidget()
-        toggle_layout = QHBoxLayout(toggle_widget)
-        toggle_layout.setContentsMargins(0, 5, 0, 5)
-
-        toggle_layout.addStretch()  # 左侧添加弹性空间
-
-        self.toggle_button = QPushButton("▼")
-        self.toggle_button.setFixedSize(45, 45)
-        self.toggle_button.setFocusPolicy(Qt.NoFocus)
-        self.toggle_button.clicked.connect(self.toggle_numpad)
-        self.toggle_button.setStyleSheet("""
-            QPushButton {
-                font-family: "Microsoft YaHei";
-                background-color: #f0f0f0;
-                border-radius: 8px;
-                font-weight: bold;
-                font-size: 16px;
-            }
-            QPushButton:hover {
-                background-color: #e0e0e0;
-            }
-        """)
-
-        toggle_layout.addWidget(self.toggle_button)
-
-        self.main_layout.addWidget(toggle_widget)
-
     def create_numpad(self):
-        """创建数字键盘"""
+        """创建数字键盘，插在控制按钮下面"""
         self.numpad_widget = QWidget()
         numpad_layout = QGridLayout(self.numpad_widget)
         numpad_layout.setSpacing(0)
@@ -491,44 +547,19 @@ class FloatingCalculator(QMainWindow):
 
         for position, button in zip(positions, buttons):
             btn = QPushButton(button)
-            btn.setFont(QFont("Microsoft YaHei", 20, QFont.Bold))
+            btn.setProperty("numpad", True)
             btn.setFixedSize(button_size, button_size)
             btn.setFocusPolicy(Qt.NoFocus)
 
             if button == '←':
-                btn.setStyleSheet("""
-                            QPushButton {
-                                font-family: "Microsoft YaHei";
-                                background-color: #0078d4;
-                                color: white;
-                                border: 1px solid #0078d4;
-                                border-radius: 5px;
-                                font-size: 18px;
-                                font-weight: bold;
-                            }
-                            QPushButton:hover {
-                                background-color: #106ebe;
-                            }
-                        """)
-            else:
-                btn.setStyleSheet("""
-                            QPushButton {
-                                font-family: "Microsoft YaHei";
-                                background-color: white;
-                                border: 1px solid #dcdcdc;
-                                border-radius: 5px;
-                                font-weight: bold;
-                            }
-                            QPushButton:hover {
-                                background-color: #f0f0f0;
-                            }
-                        """)
+                btn.setObjectName("backspace_button")
 
             btn.clicked.connect(lambda x, b=button: self.numpad_click(b))
             numpad_layout.addWidget(btn, *position)
 
-        self.main_layout.addWidget(self.numpad_widget)
         self.numpad_widget.setVisible(False)
+        index = self.main_layout.indexOf(self.toggle_button.parentWidget())
+        self.main_layout.insertWidget(index + 1, self.numpad_widget)
 
     def create_transparency_slider(self):
         """创建透明度滑块"""
@@ -538,49 +569,16 @@ class FloatingCalculator(QMainWindow):
         slider_layout.setSpacing(5)
 
         self.transparency_label = QLabel("透明度")
+        self.transparency_label.setObjectName("transparency_label")
         self.transparency_label.setAlignment(Qt.AlignCenter)
-        self.transparency_label.setStyleSheet("""
-                    font-family: "Microsoft YaHei";
-                    font-size: 14px;
-                    font-weight: bold;
-                """)
 
         self.transparency_slider = QSlider(Qt.Horizontal)
+        self.transparency_slider.setObjectName("transparency_slider")
         self.transparency_slider.setRange(15, 100)
         self.transparency_slider.setValue(100)
         self.transparency_slider.valueChanged.connect(self.update_transparency)
         self.transparency_slider.setFocusPolicy(Qt.NoFocus)
 
-        # 设置滑块的样式
-        self.transparency_slider.setStyleSheet("""
-               QSlider::groove:horizontal {
-                   border: 1px solid #999999;
-                   height: 4px;
-                   background: #cccccc;
-                   margin: 2px 0;
-                   border-radius: 2px;
-               }
-
-               QSlider::handle:horizontal {
-                   background: #0078d4;
-                   border: 2px solid #0078d4;
-                   width: 16px;
-                   height: 16px;
-                   margin: -8px 0;
-                   border-radius: 10px;
-               }
-
-               QSlider::handle:horizontal:hover {
-                   background: #106ebe;
-                   border: 2px solid #106ebe;
-               }
-
-               QSlider::sub-page:horizontal {
-                   background: #cccccc;
-                   border-radius: 2px;
-               }
-           """)
-
         slider_layout.addWidget(self.transparency_label)
         slider_layout.addWidget(self.transparency_slider)
 
@@ -594,6 +592,8 @@ class FloatingCalculator(QMainWindow):
 
     def toggle_numpad(self):
         self.numpad_visible = not self.numpad_visible
+        if self.numpad_widget is None:
+            self.create_numpad()
         self.toggle_button.setText("▼" if self.numpad_visible else "▲")
         self.numpad_widget.setVisible(self.numpad_visible)
 
@@ -603,6 +603,7 @@ class FloatingCalculator(QMainWindow):
         else:
             self.setFixedHeight(450)
 
+    @timed('numpad_click')
     def numpad_click(self, value):
         """处理数字键盘点击事件"""
         if not self.current_entry:
@@ -624,12 +625,27 @@ class FloatingCalculator(QMainWindow):
             current_text = self.current_entry.text()
             self.current_entry.setText(current_text + value)
 
+    @timed(lambda self, event: KEY_METRICS.get(event.key()))
     def keyPressEvent(self, event):
         """处理键盘事件"""
         if event.key() == Qt.Key_Return or event.key() == Qt.Key_Enter:
             self.calculate()
         elif event.key() == Qt.Key_Space:
             self.do_clear_all()
+        elif event.key() == Qt.Key_F2:
+            self.set_theme(next_theme(current_theme(QApplication.instance())))
+        elif event.key() == Qt.Key_F3:
+            self.toggle_history()
+        elif event.key() == Qt.Key_F4:
+            self.toggle_worksheet()
+        elif event.key() == Qt.Key_F5:
+            self.toggle_sweep()
+        elif event.key() == Qt.Key_F6:
+            self.toggle_clipboard_watch()
+        elif event.key() == Qt.Key_F7:
+            self.toggle_latency_overlay()
+        elif event.key() == Qt.Key_F8:
+            self.dump_latency()
         elif event.key() == Qt.Key_Backspace:
             if self.current_entry and self.current_entry.text():
                 current_text = self.current_entry.text()
@@ -643,14 +659,308 @@ class FloatingCalculator(QMainWindow):
         entry.setFocus()
         content = entry.text().strip()
         if content:
-            pyperclip.copy(content)
+            self.copy_to_clipboard(content)
+
+    def listen_resident(self, name):
+        """常驻模式：监听本地端点，之后的启动把参数转发过来；关闭窗口只隐藏"""
+        from PyQt5.QtNetwork import QAbstractSocket, QLocalServer, QLocalSocket
+        self.resident_server = QLocalServer(self)
+        if (not self.resident_server.listen(name)
+                and self.resident_server.serverError() == QAbstractSocket.AddressInUseError):
+            # 转发没有得到应答不代表没有实例：它可能只是太忙。连得上就不能抢它的端点，
+            # 连接被拒绝才说明是上次崩溃残留的 socket 文件，删掉后重新监听
+            probe = QLocalSocket()
+            probe.connectToServer(name)
+            if not probe.waitForConnected(1000) and probe.error() == QLocalSocket.ConnectionRefusedError:
+                QLocalServer.removeServer(name)
+                self.resident_server.listen(name)
+            probe.abort()
+        if not self.resident_server.isListening():
+            print(f"常驻模式监听失败: {self.resident_server.errorString()}")
+            self.resident_server = None
+            return
+        self.resident_server.newConnection.connect(self.accept_resident)
+
+    def accept_resident(self):
+        while self.resident_server.hasPendingConnections():
+            connection = self.resident_server.nextPendingConnection()
+            connection.readyRead.connect(lambda c=connection: self.read_resident(c))
+            connection.disconnected.connect(connection.deleteLater)
+
+    def read_resident(self, connection):
+        """处理转发来的一行参数，窗口显示后应答 ok"""
+        from instance import decode_message
+        if not connection.canReadLine():
+            return
+        try:
+            args, _ = parse_args(decode_message(bytes(connection.readLine())))
+        except (ValueError, SystemExit) as e:
+            print(f"常驻模式消息错误: {str(e)}")
+            connection.write(b'error\n')
+            return
+        if args.quit:
+            connection.write(b'ok\n')
+            connection.flush()
+            self.quitting = True
+            QApplication.quit()
+            return
+        if args.hide:
+            self.hide()
+        else:
+            self.prefill(args)
+            self.bring_to_front()
+        connection.write(b'ok\n')
+        connection.flush()
+
+    def prefill(self, args):
+        """用命令行给出的数值填入输入框，给了任何一个就先清空再填，满三个时直接计算"""
+        values = {field: getattr(args, field) for field in FIELDS}
+        if all(value is None for value in values.values()):
+            return
+        self.restore_widgets()
+        for field, value in values.items():
+            getattr(self, field + '_entry').setText(value or "")
+        self.calculate()
+
+    def bring_to_front(self):
+        """显示、置顶并聚焦A台赔率，控件树已释放时先重建"""
+        self.restore_widgets()
+        if self.isMinimized():
+            self.showNormal()
+        else:
+            self.show()
+        self.raise_()
+        self.activateWindow()
+        self.current_entry = self.prob1_entry
+        self.prob1_entry.setFocus()
+
+    def closeEvent(self, event):
+        """常驻模式下关闭只隐藏窗口，下次启动立即显示"""
+        if self.resident_server is not None and not self.quitting:
+            event.ignore()
+            self.hide()
+            return
+        self.history.close()
+        super().closeEvent(event)
+
+    def set_theme(self, name):
+        """运行时切换主题（light/dark/compact），只替换应用程序样式表"""
+        apply_theme(QApplication.instance(), name)
+
+    def copy_to_clipboard(self, text):
+        """写入系统剪贴板。QClipboard 只登记剪贴板所有权，不像 pyperclip 那样启动 xclip/xsel 子进程阻塞界面"""
+        if self.clipboard_watcher is not None:
+            self.clipboard_watcher.ignore(text)
+        QApplication.clipboard().setText(text)
+
+    def toggle_latency_overlay(self):
+        """显示或隐藏延迟统计浮层，第一次打开时开始计时"""
+        latency.enable()
+        if self.latency_overlay is None:
+            self.latency_overlay = LatencyOverlay(self.centralWidget())
+        self.latency_overlay.setVisible(not self.latency_overlay.isVisible())
+
+    def dump_latency(self):
+        """把延迟统计写成 JSON（--latency-dump 指定的路径）"""
+        recorder = latency.recorder()
+        if recorder is None or not self.latency_path:
+            return
+        try:
+            recorder.dump(self.latency_path)
+            self.toast.show_message("延迟统计已导出")
+        except OSError as e:
+            print(f"延迟统计写入失败: {str(e)}")
+
+    def start_trace(self, path):
+        """开始录制操作轨迹（--record-trace），退出时写入最终状态"""
+        from input_trace import TraceRecorder
+        try:
+            self.trace_recorder = TraceRecorder(self, path)
+        except OSError as e:
+            print(f"操作轨迹无法写入: {str(e)}")
+
+    def stop_trace(self):
+        if self.trace_recorder is not None:
+            self.trace_recorder.close()
+            self.trace_recorder = None
+
+    def toggle_clipboard_watch(self):
+        """开关剪贴板监听：复制网页上的赔率/金额后自动填入空着的输入框并计算"""
+        if self.clipboard_watcher is None:
+            from clipboard_watch import ClipboardWatcher
+            self.clipboard_watcher = ClipboardWatcher(QApplication.clipboard(), self)
+            self.clipboard_watcher.parsed.connect(self.fill_from_clipboard)
+        if self.clipboard_watcher.active:
+            self.clipboard_watcher.stop()
+            self.toast.show_message("剪贴板监听已关闭")
+        else:
+            self.clipboard_watcher.start()
+            self.toast.show_message("剪贴板监听已开启")
+
+    def fill_from_clipboard(self, values, started):
+        """赔率依次填入空着的A台/B台赔率，金额依次填入空着的A台/B台金额，有填入就计算"""
+        self.restore_widgets()
+        slots = {'odds': [PROB1, PROB2], 'stake': [PEOPLE1, PEOPLE2]}
+        filled = False
+        for kind, value in values:
+            for field in slots[kind]:
+                entry = getattr(self, field + '_entry')
+                if not entry.text().strip():
+                    entry.setText(format_value(field, value))
+                    filled = True
+                    break
+        if filled:
+            self.calculate()
+            # 剪贴板变化到结果写入输入框的耗时
+            self.clipboard_watcher.latencies.append(time.perf_counter() - started)
+
+    def attach_feed(self, path, table_a, table_b):
+        """订阅实时赔率推送，A台/B台赔率变化时自动刷新B台金额"""
+        from live_feed import FeedSubscriber, HedgeBook
+        self.feed_tables = (table_a, table_b)
+        self.feed = FeedSubscriber(path, HedgeBook(), self.on_feed_update)
+        # 由事件循环通知可读，不轮询
+        self.feed_notifier = QSocketNotifier(self.feed.fileno(), QSocketNotifier.Read, self)
+        self.feed_notifier.activated.connect(self.poll_feed)
+
+    def track_feed_pair(self, result):
+        """
+        把当前这组登记为推送的对冲组合，之后任一台赔率更新时 HedgeBook 按新赔率重算B台金额；
+        推送还没报过价的台子先用输入框里的赔率
+        """
+        if self.feed is None:
+            return
+        book = self.feed.book
+        for table, odds in zip(self.feed_tables, (result.prob1, result.prob2)):
+            book.prices.setdefault(table, odds)
+        pair = book.pairs.get(FEED_PAIR)
+        if pair is None or pair.stake_a != result.people1:
+            book.add_pair(FEED_PAIR, *self.feed_tables, result.people1)
+
+    def poll_feed(self):
+        """读取推送数据，socket 连接关闭时停止订阅（命名管道的写入方断开不算关闭）"""
+        try:
+            if self.feed.poll() < 0:
+                self.feed_notifier.setEnabled(False)
+                self.feed.close()
+        except Exception as e:
+            print(f"推送错误: {str(e)}")
+
+    def on_feed_update(self, table, odds, sent):
+        """
+        只处理引用了当前两个台子的更新；控件树已释放时只记下赔率，
+        B台金额取 HedgeBook 里已登记组合重算的结果（A台金额没改过时），重建后再计算
+        """
+        if self.released_state is not None:
+            if table in self.feed_tables:
+                field = PROB1 if table == self.feed_tables[0] else PROB2
+                self.released_state.set(field, f"{odds:.2f}")
+                pair = self.feed.book.pairs.get(FEED_PAIR)
+                stake = self.released_state.fields()[PEOPLE1]
+                if pair is None or pair.stake_b is None or parse_value(stake, False) != pair.stake_a:
+                    self.released_state.set(PEOPLE2, "")
+                else:
+                    self.released_state.set(PEOPLE2, str(pair.stake_b))
+            return
+        if table == self.feed_tables[0]:
+            self.prob1_entry.setText(f"{odds:.2f}")
+        elif table == self.feed_tables[1]:
+            self.prob2_entry.setText(f"{odds:.2f}")
+        else:
+            return
+        # 清空B台金额后重新满三算一
+        self.people2_entry.setText("")
+        self.calculate()
+
+def parse_args(argv):
+    """解析命令行参数，未识别的参数留给 QApplication"""
+    parser = argparse.ArgumentParser(description="千城赔率计算器")
+    parser.add_argument('--feed', help="订阅实时赔率的 UNIX socket 或命名管道路径")
+    parser.add_argument('--feed-a', default='A', help="推送中对应A台的台子名")
+    parser.add_argument('--feed-b', default='B', help="推送中对应B台的台子名")
+    parser.add_argument('--theme', choices=list(THEMES), default='light', help="界面主题，运行时按 F2 切换")
+    parser.add_argument('--profile-startup', action='store_true', help="打印启动各阶段耗时")
+    parser.add_argument('--resident', action='store_true',
+                        help="常驻单实例：已在运行时只显示已有窗口，关闭窗口只隐藏")
+    parser.add_argument('--instance-name', default='qiancheng-calculator', help="常驻实例的端点名")
+    parser.add_argument('--quit', action='store_true', help="让常驻实例退出")
+    parser.add_argument('--hide', action='store_true', help="隐藏常驻实例的窗口")
+    parser.add_argument('--history', default=os.path.join(os.path.expanduser('~'), '.qiancheng', 'history.bin'),
+                        help="计算历史日志路径，空字符串表示不写日志；运行时按 F3 打开历史面板")
+    parser.add_argument('--watch-clipboard', action='store_true',
+                        help="监听剪贴板，复制赔率/金额后自动填入并计算；运行时按 F6 开关")
+    parser.add_argument('--latency', action='store_true',
+                        help="开启按键、计算等热点路径的延迟统计；运行时按 F7 显示浮层、F8 导出")
+    parser.add_argument('--latency-dump', default=os.path.join(os.path.expanduser('~'), '.qiancheng', 'latency.json'),
+                        help="延迟统计导出路径，开启统计时退出前也会写一次")
+    parser.add_argument('--record-trace', metavar='PATH',
+                        help="把按键、鼠标和小键盘操作录制成轨迹文件，用 benchmarks/bench_replay.py 回放")
+    parser.add_argument('--stake-unit', type=int, default=1, help="下注金额必须是它的整数倍，求出的金额按此取整")
+    parser.add_argument('--min-stake', type=int, help="最低下注金额")
+    parser.add_argument('--max-stake', type=int, help="最高下注金额")
+    parser.add_argument('--tray', action='store_true',
+                        help="托盘模式：最小化到托盘，隐藏超过 --idle-release 秒后释放界面控件以节省内存")
+    parser.add_argument('--idle-release', type=float, default=60,
+                        help="托盘模式下窗口隐藏多少秒后释放控件")
+    parser.add_argument('--prob1', help="预填A台赔率")
+    parser.add_argument('--people1', help="预填A台下注金额")
+    parser.add_argument('--prob2', help="预填B台赔率")
+    parser.add_argument('--people2', help="预填B台下注金额")
+    return parser.parse_known_args(argv)
 
 def main():
-        app = QApplication(sys.argv)
-        calculator = FloatingCalculator()
+        args, qt_args = parse_args(sys.argv[1:])
+        if args.quit or args.hide:
+            return  # 没有常驻实例在运行
+        profile = StartupProfile() if args.profile_startup else None
+        if profile:
+            profile.mark('imports')
+        app = QApplication(sys.argv[:1] + qt_args)
+        apply_theme(app, args.theme)
+        if profile:
+            profile.mark('QApplication')
+        try:
+            history = History(log=HistoryLog(args.history) if args.history else None)
+        except (OSError, ValueError) as e:
+            print(f"历史日志读取失败: {str(e)}")
+            history = History()
+        if profile:
+            profile.mark('history')
+        calculator = FloatingCalculator(profile, history)
+        if args.stake_unit > 1 or args.min_stake or args.max_stake is not None:
+            rule = StakeRule(max(args.stake_unit, 1), args.min_stake, args.max_stake)
+            calculator.set_stake_rules(rule, rule)
+        if args.watch_clipboard:
+            calculator.toggle_clipboard_watch()
+        calculator.latency_path = args.latency_dump
+        if args.latency:
+            latency.enable()
+        app.aboutToQuit.connect(calculator.dump_latency)
+        if args.feed:
+            calculator.attach_feed(args.feed, args.feed_a, args.feed_b)
+        if args.tray:
+            from tray import TrayController
+            calculator.tray = TrayController(calculator, args.idle_release)
+        if args.resident:
+            from instance import server_name
+            calculator.listen_resident(server_name(args.instance_name))
+        calculator.prefill(args)
         calculator.prob1_entry.setFocus()
+        if args.record_trace:
+            calculator.start_trace(args.record_trace)
+            app.aboutToQuit.connect(calculator.stop_trace)
+        if profile:
+            profile.watch_first_paint(calculator)
         calculator.show()
         sys.exit(app.exec_())
 
+def solve_main():
+    """命令行流式求解入口：python calculator.py solve [参数]，参数见 cli.py"""
+    from cli import main as cli_main
+    sys.exit(cli_main(sys.argv[2:]))
+
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    if sys.argv[1:2] == ['solve']:
+        solve_main()
+    else:
+        main()
\ No newline at end of file
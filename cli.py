@@ -0,0 +1,247 @@
+"""
+Description: 命令行流式求解 - 从文件或标准输入逐块读取 CSV/JSONL，满三算一后立即写出
+内存占用只与块大小有关，与输入文件大小无关。
+
+用法:
+    python cli.py exports.csv -o solved.csv
+    cat exports.jsonl | python cli.py --format jsonl > solved.jsonl
+
+CSV 需要表头，包含 prob1,people1,prob2,people2 四列（其他列原样保留），
+输出在末尾追加 solved（被求解的字段）和 status（每行的状态码）两列。
+"""
+
+import argparse
+import csv
+import io
+import itertools
+import json
+import sys
+import time
+
+from solver import FIELDS, PROB1, PROB2, STATUS_NAMES, STATUS_OK, parse_value, solve_pair
+
+STATUS_INVALID = 'invalid'  # 某个字段无法解析为数字，或整行不是合法记录
+DEFAULT_CHUNK_SIZE = 10000
+
+_INVALID = object()
+
+
+# 与 FIELDS 顺序对应：赔率为小数，金额为整数
+_IS_FLOAT = tuple(field in (PROB1, PROB2) for field in FIELDS)
+
+
+def _parse_field(value, is_float):
+    """解析单个字段，返回数值、None（空值）或 _INVALID（无法解析）"""
+    if type(value) is str:
+        number = parse_value(value, is_float)
+        if number is None and value.strip() not in ('', '.', '0.'):
+            return _INVALID
+        return number
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return _INVALID
+    if is_float:
+        return float(value)
+    return int(value) if float(value).is_integer() else _INVALID
+
+
+def parse_values(values):
+    """把四个原始值（文本或数字）解析为数字列表，空值为 None；有字段无法解析时返回 None"""
+    numbers = list(map(_parse_field, values, _IS_FLOAT))
+    if _INVALID in numbers:
+        return None
+    return numbers
+
+
+def solve_values(values):
+    """
+    对四个原始值（文本或数字）求解。
+    返回 (PairResult 或 None, 状态码)，字段无法解析时结果为 None、状态码为 invalid。
+    """
+    numbers = parse_values(values)
+    if numbers is None:
+        return None, STATUS_INVALID
+    result = solve_pair(*numbers)
+    return result, STATUS_NAMES[result.status]
+
+
+class CsvSolver:
+    """按表头定位四个字段，对 CSV 行求解"""
+
+    def __init__(self, header):
+        missing = [field for field in FIELDS if field not in header]
+        if missing:
+            raise ValueError(f"CSV 表头缺少字段: {', '.join(missing)}")
+        self.indexes = [header.index(field) for field in FIELDS]
+        self.width = len(header)
+        self.header = list(header)
+        # 输入里已有 solved/status 列时覆盖写入，否则追加在末尾
+        self.solved_index = self._output_index('solved')
+        self.status_index = self._output_index('status')
+
+    def _output_index(self, name):
+        if name not in self.header:
+            self.header.append(name)
+        return self.header.index(name)
+
+    def solve_row(self, row):
+        out = row + [''] * (len(self.header) - len(row))
+        if len(row) < self.width:
+            result, status = None, STATUS_INVALID
+        else:
+            result, status = solve_values([row[i] for i in self.indexes])
+        if result is not None and result.status == STATUS_OK:
+            out[self.indexes[FIELDS.index(result.solved)]] = result.text(result.solved)
+            out[self.solved_index] = result.solved
+        else:
+            out[self.solved_index] = ''
+        out[self.status_index] = status
+        return out
+
+
+def solve_json_line(line):
+    """对一行 JSONL 求解，返回输出行文本（不含换行）和状态码"""
+    try:
+        record = json.loads(line)
+    except ValueError:
+        record = None
+    if not isinstance(record, dict):
+        return json.dumps({'status': STATUS_INVALID}, separators=(',', ':')), STATUS_INVALID
+
+    result, status = solve_values([record.get(field) for field in FIELDS])
+    if result is not None and result.status == STATUS_OK:
+        record[result.solved] = getattr(result, result.solved)
+        record['solved'] = result.solved
+    else:
+        record['solved'] = None
+    record['status'] = status
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':')), status
+
+
+class StreamStats:
+    """统计处理行数、各状态码数量和耗时"""
+
+    def __init__(self):
+        self.rows = 0
+        self.counts = {}
+        self.started = time.perf_counter()
+
+    def add(self, status):
+        self.rows += 1
+        self.counts[status] = self.counts.get(status, 0) + 1
+
+    def merge(self, other):
+        self.rows += other.rows
+        for status, count in other.counts.items():
+            self.counts[status] = self.counts.get(status, 0) + count
+
+    def report(self, stream=sys.stderr):
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        detail = ', '.join(f"{name}={count}" for name, count in sorted(self.counts.items()))
+        print(f"{self.rows} rows in {elapsed:.2f}s ({self.rows / elapsed:.0f} rows/s) [{detail}]",
+              file=stream)
+
+
+def stream_csv(lines, out, chunk_size=DEFAULT_CHUNK_SIZE, stats=None, write_header=True):
+    """
+    逐块求解 CSV 文本行（lines 可以是文件对象或任意文本行迭代器）。
+    返回 CsvSolver，便于调用方继续处理同一表头下的其他分片。
+    """
+    stats = stats if stats is not None else StreamStats()
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        return None
+    solver = CsvSolver(header)
+    writer = csv.writer(out, lineterminator='\n')
+    if write_header:
+        writer.writerow(solver.header)
+    solve_csv_rows(solver, reader, writer, chunk_size, stats)
+    return solver
+
+
+def solve_csv_rows(solver, reader, writer, chunk_size=DEFAULT_CHUNK_SIZE, stats=None):
+    """对不含表头的 CSV 行逐块求解并写出"""
+    stats = stats if stats is not None else StreamStats()
+    while True:
+        chunk = list(itertools.islice(reader, chunk_size))
+        if not chunk:
+            break
+        rows = [solver.solve_row(row) for row in chunk if row]
+        for row in rows:
+            stats.add(row[solver.status_index])
+        writer.writerows(rows)
+
+
+def stream_jsonl(lines, out, chunk_size=DEFAULT_CHUNK_SIZE, stats=None):
+    """逐块求解 JSONL 文本行，空行跳过"""
+    stats = stats if stats is not None else StreamStats()
+    lines = iter(lines)
+    while True:
+        chunk = list(itertools.islice(lines, chunk_size))
+        if not chunk:
+            break
+        output = []
+        for line in chunk:
+            if not line.strip():
+                continue
+            text, status = solve_json_line(line)
+            stats.add(status)
+            output.append(text)
+            output.append('\n')
+        out.write(''.join(output))
+
+
+def detect_format(path, fmt):
+    if fmt != 'auto':
+        return fmt
+    return 'jsonl' if path.endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="流式求解 CSV/JSONL 中缺失的赔率或金额")
+    parser.add_argument('input', nargs='?', default='-', help="输入文件，默认标准输入")
+    parser.add_argument('-o', '--output', default='-', help="输出文件，默认标准输出")
+    parser.add_argument('--format', choices=('auto', 'csv', 'jsonl'), default='auto')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="每块处理的行数")
+    parser.add_argument('--quiet', action='store_true', help="结束时不输出统计信息")
+    return parser
+
+
+def _open_text(path, mode):
+    if path == '-':
+        stream = sys.stdin if 'r' in mode else sys.stdout
+        return io.TextIOWrapper(stream.buffer, encoding='utf-8', newline='') \
+            if hasattr(stream, 'buffer') else stream
+    return open(path, mode, encoding='utf-8', newline='')
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    fmt = detect_format(args.input if args.input != '-' else args.output, args.format)
+    stats = StreamStats()
+    infile = _open_text(args.input, 'r')
+    outfile = _open_text(args.output, 'w')
+    try:
+        if fmt == 'jsonl':
+            stream_jsonl(infile, outfile, args.chunk_size, stats)
+        else:
+            stream_csv(infile, outfile, args.chunk_size, stats)
+        outfile.flush()
+    except ValueError as e:
+        print(f"输入格式错误: {e}", file=sys.stderr)
+        return 2
+    finally:
+        if args.output != '-':
+            outfile.close()
+        if args.input != '-':
+            infile.close()
+    if not args.quiet:
+        stats.report()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
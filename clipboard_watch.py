@@ -0,0 +1,79 @@
+"""
+Description: 剪贴板监听 - 订阅 QClipboard.dataChanged（不轮询，空闲时不占 CPU），
+从复制的网页文字中解析赔率和金额，依次填入空着的输入框后自动求解。
+
+解析规则：全角数字和标点先转成半角；1,000 这样的千分位去掉逗号；
+带小数点且不超过 ODDS_MAX 的数是赔率，其余是金额。时间、日期、百分比里的数字忽略。
+"""
+
+import re
+import time
+from collections import deque
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+KIND_ODDS = 'odds'
+KIND_STAKE = 'stake'
+ODDS_MAX = 100.0
+MAX_TEXT = 4096  # 只解析前这么多字符，复制了整页时不卡界面
+
+# 全角数字、小数点、逗号转半角
+_FULL_WIDTH = str.maketrans('０１２３４５６７８９．，：／％', '0123456789.,:/%')
+# 千分位（逗号后恰好三位）或普通数字；前后紧贴 / - % 或数字的不算（日期、百分比），
+# 冒号只在两边都是数字时才算时间，"赔率：1.95" 这样标签后的冒号照常提取
+_NUMBER = re.compile(r'(?<![\d./\-])(?<!\d:)(\d{1,3}(?:,\d{3})+(?![\d,])|\d+)(\.\d+)?(?![\d/%\-]|:\d)')
+
+
+def parse_clipboard(text):
+    """从文字中提取 [(KIND_ODDS 或 KIND_STAKE, 数值), ...]，赔率为 float，金额为 int"""
+    text = text[:MAX_TEXT].translate(_FULL_WIDTH)
+    values = []
+    for match in _NUMBER.finditer(text):
+        whole, fraction = match.groups()
+        if fraction and ',' not in whole:
+            value = float(whole + fraction)
+            if 0 < value <= ODDS_MAX:
+                values.append((KIND_ODDS, value))
+                continue
+        stake = int(whole.replace(',', ''))
+        if stake > 0:
+            values.append((KIND_STAKE, stake))
+    return values
+
+
+class ClipboardWatcher(QObject):
+    """
+    剪贴板变化时解析文字，有数字就发出 parsed(值列表, 变化时刻)。
+    自己写入剪贴板的文字用 ignore 登记，不会再被解析回来。
+    """
+
+    parsed = pyqtSignal(list, float)
+
+    def __init__(self, clipboard, parent=None):
+        super().__init__(parent)
+        self.clipboard = clipboard
+        self.active = False
+        self.latencies = deque(maxlen=1000)  # 剪贴板变化到求解完成的耗时，由接收方记录
+        self._ignored = None
+
+    def start(self):
+        if not self.active:
+            self.clipboard.dataChanged.connect(self._changed)
+            self.active = True
+
+    def stop(self):
+        if self.active:
+            self.clipboard.dataChanged.disconnect(self._changed)
+            self.active = False
+
+    def ignore(self, text):
+        self._ignored = text
+
+    def _changed(self):
+        started = time.perf_counter()
+        text = self.clipboard.text()
+        if not text or text == self._ignored:
+            return
+        values = parse_clipboard(text)
+        if values:
+            self.parsed.emit(values, started)
@@ -0,0 +1,395 @@
+"""
+Description: 列式结果文件 - 批量求解结果按列写成定长类型数组（四个数值列 float64，solved/status int8），
+读取时 mmap 映射，列直接是 NumPy 视图，切片不拷贝，也不需要解析文本。
+
+文件格式: 32 字节文件头（魔数 + 版本 + 块数 + 总行数），之后是若干块，每块:
+    8 字节块头（行数 u64）| prob1 f8[n] | people1 f8[n] | prob2 f8[n] | people2 f8[n] | solved i1[n] | status i1[n] | 补齐到 8 字节
+追加时在末尾写入新块后再改文件头，写到一半的块不计入；合并多个文件只需逐块拷贝字节。
+块多时可以用 compact 合成一块，之后整列都是零拷贝视图。
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import itertools
+import math
+import mmap
+import os
+import struct
+import sys
+
+import numpy as np
+
+from batch import SOLVED_NONE, BatchResult, solve_batch
+from cli import parse_values
+from solver import FIELDS, PROB1, PROB2, STATUS_NAMES, parse_value
+
+MAGIC = b'QCCOLS\x00\x01'
+VERSION = 1
+HEADER = struct.Struct('<8sIIQ8x')
+BLOCK = struct.Struct('<Q')
+COLUMNS = (('prob1', '<f8'), ('people1', '<f8'), ('prob2', '<f8'), ('people2', '<f8'),
+           ('solved', 'i1'), ('status', 'i1'))
+ROW_SIZE = sum(np.dtype(dtype).itemsize for _, dtype in COLUMNS)
+DEFAULT_CHUNK_SIZE = 1 << 18
+
+# CSV 里的 status 文字与状态码互转；cli.py 的 invalid（字段无法解析）记为 -1
+STATUS_INVALID_CODE = -1
+STATUS_CODES = {name: code for code, name in STATUS_NAMES.items()}
+STATUS_CODES['invalid'] = STATUS_INVALID_CODE
+CSV_HEADER = list(FIELDS) + ['solved', 'status']
+
+
+def _block_size(rows):
+    size = BLOCK.size + rows * ROW_SIZE
+    return size + (-size) % 8
+
+
+def _check_header(data, path):
+    if len(data) < HEADER.size:
+        raise ValueError(f"不是列式结果文件: {path}")
+    magic, version, blocks, rows = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"不是列式结果文件或版本不符: {path}")
+    return blocks, rows
+
+
+class ColumnWriter:
+    """写入或追加列式结果文件，每次 write 写一块"""
+
+    def __init__(self, path, append=False):
+        self.path = path
+        exists = append and os.path.exists(path) and os.path.getsize(path) > 0
+        self._file = open(path, 'r+b' if exists else 'wb')
+        if exists:
+            self.blocks, self.rows = _check_header(self._file.read(HEADER.size), path)
+            # 上次写到一半的块不在文件头里，从最后一个完整块之后接着写
+            self._file.seek(self._end_of_blocks())
+            self._file.truncate()
+        else:
+            self.blocks = self.rows = 0
+            self._write_header()
+
+    def _end_of_blocks(self):
+        offset = HEADER.size
+        for _ in range(self.blocks):
+            self._file.seek(offset)
+            rows, = BLOCK.unpack(self._file.read(BLOCK.size))
+            offset += _block_size(rows)
+        return offset
+
+    def _write_header(self):
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, VERSION, self.blocks, self.rows))
+        self._file.seek(0, os.SEEK_END)
+
+    def write(self, result):
+        """写入一块，result 为 batch.BatchResult 或有同名列的对象（RoundBatchResult 的 imbalance 不保存）"""
+        n = len(result)
+        self._file.write(BLOCK.pack(n))
+        for name, dtype in COLUMNS:
+            column = np.ascontiguousarray(getattr(result, name), dtype=dtype)
+            if len(column) != n:
+                raise ValueError("各列长度必须一致")
+            self._file.write(memoryview(column).cast('B'))
+        self._file.write(bytes((-(BLOCK.size + n * ROW_SIZE)) % 8))
+        self.blocks += 1
+        self.rows += n
+        self._write_header()
+
+    def write_raw(self, data):
+        """直接写入已编码的若干块（concat 用），data 必须是完整的块"""
+        view = memoryview(data)
+        offset = 0
+        while offset < len(view):
+            rows, = BLOCK.unpack_from(view, offset)
+            offset += _block_size(rows)
+            self.blocks += 1
+            self.rows += rows
+        self._file.write(view)
+        self._write_header()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ColumnReader:
+    """
+    mmap 映射列式结果文件。blocks 为每块的 BatchResult，各列都是映射内存上的只读视图；
+    读取器关闭后已取出的视图仍然有效（映射随最后一个视图释放）。
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.block_count, self.rows = _check_header(self._mmap, path)
+        self.blocks = []
+        self._starts = []  # 每块第一行的行号
+        offset, start = HEADER.size, 0
+        for _ in range(self.block_count):
+            if offset + BLOCK.size > len(self._mmap):
+                raise ValueError(f"列式结果文件不完整: {path}")
+            n, = BLOCK.unpack_from(self._mmap, offset)
+            if offset + _block_size(n) > len(self._mmap):
+                raise ValueError(f"列式结果文件不完整: {path}")
+            self.blocks.append(self._block(offset + BLOCK.size, n))
+            self._starts.append(start)
+            offset += _block_size(n)
+            start += n
+        self._end = offset
+
+    def _block(self, offset, n):
+        columns = []
+        for _, dtype in COLUMNS:
+            column = np.frombuffer(self._mmap, dtype=dtype, count=n, offset=offset)
+            columns.append(column)
+            offset += column.nbytes
+        return BatchResult(*columns)
+
+    def __len__(self):
+        return self.rows
+
+    def column(self, name):
+        """整列：只有一块时是视图，多块时拼接为新数组"""
+        if len(self.blocks) == 1:
+            return getattr(self.blocks[0], name)
+        dtype = dict(COLUMNS)[name]
+        if not self.blocks:
+            return np.empty(0, dtype=dtype)
+        return np.concatenate([getattr(block, name) for block in self.blocks])
+
+    def slice(self, start, stop):
+        """第 [start, stop) 行，落在同一块内时各列是视图，跨块时拼接"""
+        start, stop, _ = slice(start, stop).indices(self.rows)
+        stop = max(start, stop)
+        first = max(0, int(np.searchsorted(self._starts, start, side='right')) - 1)
+        parts = []
+        for i in range(first, len(self.blocks)):
+            base = self._starts[i]
+            if base >= stop:
+                break
+            block = self.blocks[i]
+            lo, hi = max(start - base, 0), min(stop - base, len(block))
+            parts.append([getattr(block, name)[lo:hi] for name, _ in COLUMNS])
+        if len(parts) == 1:
+            return BatchResult(*parts[0])
+        if not parts:
+            return BatchResult(*(np.empty(0, dtype=dtype) for _, dtype in COLUMNS))
+        return BatchResult(*(np.concatenate(columns) for columns in zip(*parts)))
+
+    def raw(self):
+        """所有完整块的原始字节（内存视图），合并文件时直接拷贝"""
+        return memoryview(self._mmap)[HEADER.size:self._end]
+
+    def close(self):
+        self.blocks = []
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass  # 外面还有列视图，映射在它们释放后关闭
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_results(path, result, append=False):
+    with ColumnWriter(path, append) as writer:
+        writer.write(result)
+
+
+def concat(paths, out):
+    """把多个列式结果文件按顺序合并为 out，逐块拷贝，不解码"""
+    if any(os.path.abspath(path) == os.path.abspath(out) for path in paths):
+        raise ValueError("输出文件不能是输入文件之一，追加请用 ColumnWriter(path, append=True)")
+    with ColumnWriter(out) as writer:
+        for path in paths:
+            reader = ColumnReader(path)
+            raw = reader.raw()
+            try:
+                writer.write_raw(raw)
+            finally:
+                raw.release()
+                reader.close()
+
+
+def compact(path, out):
+    """把多块合成一块，之后 column() 整列都是零拷贝视图"""
+    if os.path.abspath(path) == os.path.abspath(out):
+        raise ValueError("输出文件不能是输入文件")
+    with ColumnReader(path) as reader:
+        result = BatchResult(*(reader.column(name) for name, _ in COLUMNS))
+        write_results(out, result)
+
+
+def _field_text(field, values):
+    """与 cli.py 输出的格式相同（solver.format_value）：赔率保留两位小数，金额为整数，NaN 为空"""
+    if field in (PROB1, PROB2):
+        return ['' if v != v else f"{v:.2f}" for v in values.tolist()]
+    return ['' if v != v else str(int(v)) for v in values.tolist()]
+
+
+def write_csv(out, results):
+    """把若干 BatchResult 依次写成 CSV（表头 prob1,people1,prob2,people2,solved,status，与 cli.py 的输出列一致）"""
+    writer = csv.writer(out, lineterminator='\n')
+    writer.writerow(CSV_HEADER)
+    solved_names = {SOLVED_NONE: ''}
+    solved_names.update(enumerate(FIELDS))
+    status_names = {code: name for name, code in STATUS_CODES.items()}
+    for part in results:
+        columns = [_field_text(field, getattr(part, field)) for field in FIELDS]
+        columns.append([solved_names.get(code, str(code)) for code in part.solved.tolist()])
+        columns.append([status_names.get(code, str(code)) for code in part.status.tolist()])
+        writer.writerows(zip(*columns))
+
+
+def to_csv(path, out, chunk_size=DEFAULT_CHUNK_SIZE):
+    """列式文件转 CSV，out 为文本文件对象。逐块转换，内存只与块大小有关"""
+    with ColumnReader(path) as reader:
+        write_csv(out, (reader.slice(start, start + chunk_size) for start in range(0, len(reader), chunk_size)))
+
+
+def _parse_column(texts):
+    try:
+        return np.array([text if text.strip() else 'nan' for text in texts], dtype=np.float64)
+    except ValueError:
+        pass  # 有无法解析的字段，逐个解析并记为 NaN
+    column = np.empty(len(texts), dtype=np.float64)
+    for i, text in enumerate(texts):
+        try:
+            column[i] = float(text) if text.strip() else math.nan
+        except ValueError:
+            column[i] = math.nan
+    return column
+
+
+def _solve_rows(rows, indexes, width):
+    """
+    逐行按 cli.parse_values 解析（字段不足或无法解析的行与 cli.py 一样记为 invalid，不求解），
+    其余的行一起交给 batch.solve_batch。invalid 行里 solver.parse_value 能解析的字段照存，其余为 NaN
+    """
+    n = len(rows)
+    values = [[math.nan] * n for _ in FIELDS]
+    valid = np.zeros(n, dtype=bool)
+    for i, row in enumerate(rows):
+        fields = [row[j] if j < len(row) else '' for j in indexes]
+        numbers = parse_values(fields) if len(row) >= width else None
+        if numbers is None:
+            numbers = [parse_value(text, field in (PROB1, PROB2)) for text, field in zip(fields, FIELDS)]
+        else:
+            valid[i] = True
+        for column, number in zip(values, numbers):
+            if number is not None:
+                column[i] = number
+    columns = [np.array(column, dtype=np.float64) for column in values]
+    solved = np.full(n, SOLVED_NONE, dtype=np.int8)
+    status = np.full(n, STATUS_INVALID_CODE, dtype=np.int8)
+    part = solve_batch(*(column[valid] for column in columns))
+    for column, result in zip(columns, part.columns()):
+        # solve_batch 把输入的 0 当作未知记为 NaN；cli.py 原样保留输入，没被求出的格子也写回 0
+        given = column[valid]
+        result[(given == 0) & np.isnan(result)] = 0
+        column[valid] = result
+    solved[valid] = part.solved
+    status[valid] = part.status
+    return BatchResult(*columns, solved, status)
+
+
+def read_csv_chunks(lines, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    逐块读取带表头的 CSV，产出 BatchResult。
+    表头含 solved 和 status 列时按原样保存，否则按 cli.py 的规则解析并用 batch.solve_batch 求解。
+    """
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        return
+    missing = [field for field in FIELDS if field not in header]
+    if missing:
+        raise ValueError(f"CSV 表头缺少字段: {', '.join(missing)}")
+    indexes = [header.index(field) for field in FIELDS]
+    solved_status = 'solved' in header and 'status' in header
+    if solved_status:
+        indexes += [header.index('solved'), header.index('status')]
+    width = max(indexes) + 1
+    solved_codes = {field: i for i, field in enumerate(FIELDS)}
+    while True:
+        rows = [row for row in itertools.islice(reader, chunk_size) if row]
+        if not rows:
+            break
+        if not solved_status:
+            # 与 cli.CsvSolver 相同：比表头短的行记为 invalid
+            yield _solve_rows(rows, indexes, len(header))
+            continue
+        rows = [row if len(row) >= width else row + [''] * (width - len(row)) for row in rows]
+        texts = list(zip(*rows))
+        columns = [_parse_column(texts[i]) for i in indexes[:4]]
+        solved = np.array([solved_codes.get(text, SOLVED_NONE) for text in texts[indexes[4]]], dtype=np.int8)
+        status = np.array([STATUS_CODES.get(text, STATUS_INVALID_CODE) for text in texts[indexes[5]]],
+                          dtype=np.int8)
+        yield BatchResult(*columns, solved, status)
+
+
+def from_csv(lines, path, chunk_size=DEFAULT_CHUNK_SIZE, append=False):
+    """把 CSV 文本行转成列式结果文件，每 chunk_size 行一块，返回写入的行数"""
+    with ColumnWriter(path, append) as writer:
+        before = writer.rows
+        for result in read_csv_chunks(lines, chunk_size):
+            writer.write(result)
+        return writer.rows - before
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="列式结果文件与 CSV 互转、合并")
+    commands = parser.add_subparsers(dest='command', required=True)
+    command = commands.add_parser('from-csv', help="CSV 转列式，没有 solved/status 列时先求解")
+    command.add_argument('input')
+    command.add_argument('output')
+    command.add_argument('--append', action='store_true', help="追加到已有文件")
+    command.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="每块的行数")
+    command = commands.add_parser('to-csv', help="列式转 CSV")
+    command.add_argument('input')
+    command.add_argument('output', nargs='?', default='-')
+    command = commands.add_parser('concat', help="合并多个列式文件")
+    command.add_argument('inputs', nargs='+')
+    command.add_argument('-o', '--output', required=True)
+    command = commands.add_parser('compact', help="合成一块")
+    command.add_argument('input')
+    command.add_argument('output')
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == 'from-csv':
+            with open(args.input, encoding='utf-8', newline='') as f:
+                rows = from_csv(f, args.output, args.chunk_size, args.append)
+            print(f"{rows} rows written to {args.output}", file=sys.stderr)
+        elif args.command == 'to-csv':
+            if args.output == '-':
+                to_csv(args.input, sys.stdout)
+            else:
+                with open(args.output, 'w', encoding='utf-8', newline='') as f:
+                    to_csv(args.input, f)
+        elif args.command == 'concat':
+            concat(args.inputs, args.output)
+        else:
+            compact(args.input, args.output)
+    except ValueError as e:
+        print(f"输入格式错误: {e}", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,239 @@
+"""
+Description: 计算历史 - 每次成功求解记为一条定长记录（时间戳、四个数值、被求解的字段），
+内存中是有上限的环形缓冲区（一块 bytearray，不为每条记录建对象），
+同时追加写入二进制日志，下次启动用 mmap 映射日志后一次拷贝尾部即可恢复。
+
+日志格式: 16 字节文件头（魔数 + 记录长度），之后是连续的 48 字节小端记录
+    timestamp f64 | prob1 f64 | people1 f64 | prob2 f64 | people2 f64 | solved i8 | 7 字节填充
+未知值为 NaN，solved 为 solver.FIELDS 的下标（与 batch.SOLVED_* 相同）。
+"""
+
+from __future__ import annotations
+
+import math
+import mmap
+import os
+import struct
+import time
+
+from solver import FIELDS
+
+MAGIC = b'QCHIST\x00\x01'
+HEADER = struct.Struct('<8sI4x')
+RECORD = struct.Struct('<dddddb7x')
+DEFAULT_CAPACITY = 1 << 20
+LOG_BUFFER = 1 << 16  # 日志的写缓冲，约 1300 条记录写一次盘
+
+_record_dtype = None
+
+
+def _numpy():
+    """numpy 只在过滤或导出数组时才导入，主窗口启动时不加载（约 100 ms）；没装时返回 None"""
+    try:
+        import numpy
+    except ImportError:  # 没有 numpy 时逐条过滤
+        return None
+    return numpy
+
+
+def _require_numpy():
+    np = _numpy()
+    if np is None:
+        raise ImportError("历史记录转成数组需要安装 numpy")
+    return np
+
+
+def record_dtype():
+    """日志记录对应的 numpy 结构化类型，需要 numpy"""
+    global _record_dtype
+    if _record_dtype is None:
+        _record_dtype = _require_numpy().dtype({
+            'names': ['timestamp', 'prob1', 'people1', 'prob2', 'people2', 'solved'],
+            'formats': ['<f8', '<f8', '<f8', '<f8', '<f8', 'i1'],
+            'offsets': [0, 8, 16, 24, 32, 40],
+            'itemsize': RECORD.size,
+        })
+    return _record_dtype
+
+
+class HistoryRecord:
+    """一条历史记录，只在读取时临时创建"""
+
+    __slots__ = ('timestamp', 'prob1', 'people1', 'prob2', 'people2', 'solved')
+
+    def __init__(self, timestamp, prob1, people1, prob2, people2, solved):
+        self.timestamp = timestamp
+        self.prob1 = prob1
+        self.people1 = people1
+        self.prob2 = prob2
+        self.people2 = people2
+        self.solved = solved
+
+    @property
+    def solved_name(self):
+        return FIELDS[self.solved] if self.solved >= 0 else None
+
+    def values(self):
+        return self.prob1, self.people1, self.prob2, self.people2
+
+
+def _number(value):
+    return math.nan if value is None else float(value)
+
+
+class HistoryLog:
+    """
+    只追加的二进制日志。距上次 flush 不到 flush_interval 秒的记录先留在文件缓冲里，
+    实时推送每秒触发上千次求解时不会每条都写一次磁盘；进程崩溃最多丢失这段时间内的记录。
+    调用方空闲下来后应调用 flush（主窗口用单次计时器），close 时也会写出。
+    """
+
+    def __init__(self, path, flush_interval=1.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._file = None
+        self._flushed = -math.inf
+
+    def append(self, data):
+        if self._file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, 'ab', buffering=LOG_BUFFER)
+            size = self._file.tell()
+            if size < HEADER.size:  # 新文件，或者上次连文件头都没写完
+                self._file.truncate(0)
+                self._file.write(HEADER.pack(MAGIC, RECORD.size))
+            elif (size - HEADER.size) % RECORD.size:
+                # 上次崩溃时写了一半的记录截掉，否则之后追加的记录全部错位
+                self._file.truncate(HEADER.size + (size - HEADER.size) // RECORD.size * RECORD.size)
+        self._file.write(data)
+        now = time.monotonic()
+        if now - self._flushed >= self.flush_interval:
+            self._file.flush()
+            self._flushed = now
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+            self._flushed = time.monotonic()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def read_tail(self, limit):
+        """映射日志，把最后 limit 条记录直接拷进新的 bytearray；末尾写了一半的记录被忽略"""
+        if not os.path.exists(self.path) or os.path.getsize(self.path) <= HEADER.size:
+            return bytearray()
+        with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            magic, size = HEADER.unpack_from(mm)
+            if magic != MAGIC or size != RECORD.size:
+                raise ValueError(f"不是历史日志或版本不符: {self.path}")
+            count = (len(mm) - HEADER.size) // RECORD.size
+            first = HEADER.size + max(0, count - limit) * RECORD.size
+            with memoryview(mm) as view:
+                return bytearray(view[first:HEADER.size + count * RECORD.size])
+
+
+class History:
+    """
+    环形缓冲区：最多保留 capacity 条，满了覆盖最旧的。
+    下标 0 是保留的最旧记录，len-1 是最新记录。
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, log=None):
+        self.capacity = capacity
+        self.log = log
+        self.buffer = bytearray()
+        self.start = 0      # 最旧记录所在的槽位
+        self.total = 0      # 累计添加的条数，含已被覆盖的
+        if log is not None:
+            self._load(log.read_tail(capacity))
+
+    def _load(self, data):
+        self.buffer = data
+        self.total = len(self.buffer) // RECORD.size
+
+    def __len__(self):
+        return len(self.buffer) // RECORD.size
+
+    def add(self, prob1, people1, prob2, people2, solved, timestamp=None):
+        """添加一条记录，solved 为字段名或 FIELDS 下标"""
+        if isinstance(solved, str):
+            solved = FIELDS.index(solved)
+        data = RECORD.pack(time.time() if timestamp is None else timestamp,
+                           _number(prob1), _number(people1), _number(prob2), _number(people2),
+                           -1 if solved is None else solved)
+        if len(self) < self.capacity:
+            self.buffer += data
+        else:
+            offset = self.start * RECORD.size
+            self.buffer[offset:offset + RECORD.size] = data
+            self.start = (self.start + 1) % self.capacity
+        self.total += 1
+        if self.log is not None:
+            self.log.append(data)
+
+    def _slot(self, i):
+        count = len(self)
+        if not -count <= i < count:
+            raise IndexError(i)
+        return (self.start + i % count) % max(count, 1)
+
+    def record(self, i):
+        return HistoryRecord(*RECORD.unpack_from(self.buffer, self._slot(i) * RECORD.size))
+
+    def odds(self, i):
+        """只取第 i 条的两个赔率，过滤时不创建记录对象"""
+        offset = self._slot(i) * RECORD.size
+        return struct.unpack_from('<d8xd', self.buffer, offset + 8)
+
+    def array(self):
+        """按时间顺序返回结构化数组（拷贝，不持有缓冲区，之后仍可继续 add），需要 numpy"""
+        np = _require_numpy()
+        view = np.frombuffer(self.buffer, dtype=record_dtype())
+        try:
+            return np.concatenate((view[self.start:], view[:self.start]))
+        finally:
+            del view
+
+    def filter_odds(self, low=None, high=None):
+        """
+        A台或B台赔率落在 [low, high] 内的记录下标（时间顺序），None 表示不限。
+        装了 numpy 时一次向量化比较，100 万条约十几毫秒。
+        """
+        np = _numpy()
+        if np is None:
+            return [i for i in range(len(self)) if any(_within(o, low, high) for o in self.odds(i))]
+        view = np.frombuffer(self.buffer, dtype=record_dtype())
+        try:
+            mask = _mask(np, view['prob1'], low, high) | _mask(np, view['prob2'], low, high)
+            slots = np.flatnonzero(mask)
+        finally:
+            del view
+        # 槽位换算成时间顺序的下标：start 之后的槽位在前，回绕的在后，两段本身有序
+        split = np.searchsorted(slots, self.start)
+        return np.concatenate((slots[split:] - self.start, slots[:split] + (len(self) - self.start)))
+
+    def flush(self):
+        if self.log is not None:
+            self.log.flush()
+
+    def close(self):
+        if self.log is not None:
+            self.log.close()
+
+
+def _within(value, low, high):
+    return (low is None or value >= low) and (high is None or value <= high)
+
+
+def _mask(np, column, low, high):
+    mask = ~np.isnan(column)
+    if low is not None:
+        mask &= column >= low
+    if high is not None:
+        mask &= column <= high
+    return mask
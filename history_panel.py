@@ -0,0 +1,146 @@
+"""
+Description: 历史面板 - QTableView + 按需取数的表格模型，只格式化屏幕上可见的几十行，
+100 万条记录滚动和打开都不卡；按赔率区间过滤（A台或B台赔率落在区间内）。
+"""
+
+import math
+from datetime import datetime
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, QTimer
+from PyQt5.QtGui import QBrush, QColor, QDoubleValidator
+from PyQt5.QtWidgets import (QHBoxLayout, QHeaderView, QLabel, QLineEdit, QTableView,
+                             QVBoxLayout, QWidget)
+
+from solver import FIELDS, PROB1, PROB2
+
+HEADERS = ('时间', 'A台赔率', 'A台金额', 'B台赔率', 'B台金额')
+FILTER_DELAY = 150  # 输入停顿后再过滤，毫秒
+
+
+def _display(field, value):
+    if math.isnan(value):
+        return ''
+    if field in (PROB1, PROB2):
+        return f"{value:.2f}"
+    return str(int(value))
+
+
+class HistoryModel(QAbstractTableModel):
+    """最新的记录在最上面；rows 为过滤后的记录下标（时间顺序），None 表示全部"""
+
+    def __init__(self, history, parent=None):
+        super().__init__(parent)
+        self.history = history
+        self.rows = None
+        self._solved_brush = QBrush(QColor('#0078d4'))
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self.rows = rows
+        self.endResetModel()
+
+    def record_index(self, row):
+        if self.rows is None:
+            return len(self.history) - 1 - row
+        return int(self.rows[len(self.rows) - 1 - row])
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.history) if self.rows is None else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+        if role == Qt.DisplayRole:
+            record = self.history.record(self.record_index(index.row()))
+            if column == 0:
+                return datetime.fromtimestamp(record.timestamp).strftime('%m-%d %H:%M:%S')
+            field = FIELDS[column - 1]
+            return _display(field, getattr(record, field))
+        if role == Qt.ForegroundRole and column > 0:
+            # 被求解出来的那一格用强调色
+            record = self.history.record(self.record_index(index.row()))
+            return self._solved_brush if record.solved == column - 1 else None
+        if role == Qt.TextAlignmentRole and column > 0:
+            return Qt.AlignRight | Qt.AlignVCenter
+        return None
+
+
+class HistoryPanel(QWidget):
+    """历史窗口：赔率区间过滤 + 虚拟化表格"""
+
+    def __init__(self, history, parent=None):
+        super().__init__(parent, Qt.Tool)
+        self.setObjectName("history_panel")
+        self.setWindowTitle("计算历史")
+        self.resize(480, 420)
+        self.history = history
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(8, 8, 8, 8)
+        layout.setSpacing(6)
+
+        filter_layout = QHBoxLayout()
+        self.low_entry = QLineEdit()
+        self.high_entry = QLineEdit()
+        for entry, placeholder in ((self.low_entry, "最低赔率"), (self.high_entry, "最高赔率")):
+            entry.setPlaceholderText(placeholder)
+            entry.setValidator(QDoubleValidator(0.0, 1000.0, 2, entry))
+            entry.textChanged.connect(self.schedule_filter)
+            filter_layout.addWidget(entry)
+        self.count_label = QLabel()
+        filter_layout.addWidget(self.count_label)
+        layout.addLayout(filter_layout)
+
+        self.view = QTableView()
+        self.view.setWordWrap(False)
+        self.view.setSelectionBehavior(QTableView.SelectRows)
+        self.view.verticalHeader().hide()
+        # 固定行高，视图不必逐行测量。要在挂上模型之前设好，并且先挂空模型再由 refresh 填入，
+        # 否则 setDefaultSectionSize / setModel 都会按 100 万行逐段初始化表头
+        self.view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.view.verticalHeader().setDefaultSectionSize(22)
+        self.model = HistoryModel(history, self)
+        self.model.rows = ()
+        self.view.setModel(self.model)
+        self.view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.view.horizontalHeader().setSectionResizeMode(0, QHeaderView.Fixed)
+        self.view.horizontalHeader().resizeSection(0, self.fontMetrics().horizontalAdvance('00-00 00:00:00') + 20)
+        layout.addWidget(self.view)
+
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(FILTER_DELAY)
+        self._filter_timer.timeout.connect(self.refresh)
+        self.refresh()
+
+    def odds_range(self):
+        def bound(entry):
+            text = entry.text().strip()
+            try:
+                return float(text) if text else None
+            except ValueError:
+                return None
+        return bound(self.low_entry), bound(self.high_entry)
+
+    def schedule_filter(self):
+        self._filter_timer.start()
+
+    def refresh(self):
+        """按当前区间重新过滤；没有区间时不建下标数组"""
+        low, high = self.odds_range()
+        if low is None and high is None:
+            self.model.set_rows(None)
+        else:
+            self.model.set_rows(self.history.filter_odds(low, high))
+        self.count_label.setText(f"{self.model.rowCount()} / {len(self.history)}")
@@ -0,0 +1,218 @@
+"""
+Description: 表格导入 - 在工作线程里读取 CSV/XLSX 导出文件、逐块求解，
+每块求好后通过信号交给界面线程一次插入工作表，界面线程只做数组拼接，不会卡住。
+支持进度和取消。
+
+表头可以是 prob1/people1/prob2/people2，也可以是 A台赔率/A台金额/B台赔率/B台金额；
+第一行是数字时视为没有表头，取前四列。XLSX 需要安装 openpyxl。
+"""
+
+import csv
+import gc
+import io
+import os
+import threading
+from contextlib import contextmanager
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from cli import parse_values
+from solver import FIELDS
+from worksheet import HEADERS, solve_columns
+
+CHUNK_SIZE = 4096
+# 导入期间第 2 代回收的阈值（默认 10）：openpyxl 读 XLSX 时积累几万个 XML 元素，每次完整回收持有 GIL 15～30ms，
+# 会卡住界面线程；第 0、1 代照常回收，只是推迟完整回收，最后一个导入结束后恢复原阈值
+IMPORT_GC_THRESHOLD2 = 1000
+
+_gc_lock = threading.Lock()
+_gc_imports = 0
+_gc_threshold = None
+HEADER_ALIASES = {name: field for name, field in zip(HEADERS, FIELDS)}
+HEADER_ALIASES.update({field: field for field in FIELDS})
+
+
+class ImportCancelled(Exception):
+    pass
+
+
+def detect_encoding(path, size=65536):
+    """Excel 导出的 CSV 常见 UTF-8（带 BOM）和 GBK 两种"""
+    with open(path, 'rb') as f:
+        head = f.read(size)
+    try:
+        head.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # 截断在多字节字符中间不算
+        if e.start < len(head) - 3:
+            return 'gbk'
+    return 'utf-8-sig'
+
+
+def locate_columns(row):
+    """
+    根据第一行确定四个字段所在的列，返回 (列号列表, 第一行是否为表头)。
+    第一行是数字（不是表头）时按前四列处理。
+    """
+    names = [str(cell).strip() if cell is not None else '' for cell in row]
+    found = {HEADER_ALIASES[name]: i for i, name in enumerate(names) if name in HEADER_ALIASES}
+    if found:
+        missing = [field for field in FIELDS if field not in found]
+        if missing:
+            raise ValueError(f"表头缺少字段: {', '.join(missing)}")
+        return [found[field] for field in FIELDS], True
+    cells = list(row[:len(FIELDS)]) + [''] * (len(FIELDS) - len(row))
+    if parse_values(cells) is None:
+        raise ValueError("无法识别表头，需要 prob1/people1/prob2/people2 或 A台赔率/A台金额/B台赔率/B台金额")
+    return list(range(len(FIELDS))), False
+
+
+def read_csv(path, progress):
+    """逐行产出原始行；progress(已读字节, 总字节)"""
+    total = os.path.getsize(path) or 1
+    with open(path, 'rb') as raw:
+        text = io.TextIOWrapper(raw, encoding=detect_encoding(path), newline='')
+        for i, row in enumerate(csv.reader(text)):
+            if i % CHUNK_SIZE == 0:
+                progress(raw.tell(), total)
+            yield row
+
+
+def read_xlsx(path, progress):
+    """逐行产出第一个工作表的单元格值；progress(已读行数, 总行数)"""
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError("导入 XLSX 需要安装 openpyxl") from None
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        total = sheet.max_row or 0
+        for i, row in enumerate(sheet.iter_rows(values_only=True)):
+            if i % CHUNK_SIZE == 0:
+                progress(i, max(total, i + 1))
+            yield row
+    finally:
+        workbook.close()
+
+
+def read_rows(path, progress):
+    if os.path.splitext(path)[1].lower() in ('.xlsx', '.xlsm'):
+        return read_xlsx(path, progress)
+    return read_csv(path, progress)
+
+
+@contextmanager
+def deferred_full_collection():
+    """调高第 2 代回收阈值直到退出；可以嵌套或在多个线程里同时使用，最后一个退出时恢复"""
+    global _gc_imports, _gc_threshold
+    with _gc_lock:
+        if _gc_imports == 0:
+            _gc_threshold = gc.get_threshold()
+            gc.set_threshold(*_gc_threshold[:2], max(_gc_threshold[2], IMPORT_GC_THRESHOLD2))
+        _gc_imports += 1
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_imports -= 1
+            if _gc_imports == 0:
+                gc.set_threshold(*_gc_threshold)
+
+
+class ImportWorker(QObject):
+    """
+    放到 QThread 里运行。chunk 信号的参数是 solve_columns 的结果
+    (四个 array 列, solved, status)，由界面线程交给 WorksheetModel.extend_solved。
+    """
+
+    chunk = pyqtSignal(object)
+    progress = pyqtSignal(int)          # 0-100
+    finished = pyqtSignal(int, int)     # 导入行数, 跳过的无效行数
+    failed = pyqtSignal(str)
+
+    def __init__(self, path, chunk_size=CHUNK_SIZE):
+        super().__init__()
+        self.path = path
+        self.chunk_size = chunk_size
+        self._cancel = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+        self._percent = -1
+
+    def cancel(self):
+        """可在任意线程调用，工作线程在下一行检查"""
+        self._cancel.set()
+        self._running.set()
+
+    def pause(self):
+        """暂停读取，可在任意线程调用；界面线程插入和重绘期间调用，单核上不必和工作线程抢 CPU"""
+        self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    def _progress(self, done, total):
+        if self._cancel.is_set():
+            raise ImportCancelled()
+        percent = min(100, done * 100 // total)
+        if percent != self._percent:
+            self._percent = percent
+            self.progress.emit(percent)
+
+    def run(self):
+        with deferred_full_collection():
+            self._run()
+
+    def _run(self):
+        imported = invalid = 0
+        try:
+            rows = read_rows(self.path, self._progress)
+            first = next(rows, None)
+            if first is None:
+                self.finished.emit(0, 0)
+                return
+            indexes, has_header = locate_columns(first)
+            if not has_header:
+                rows = _chain(first, rows)
+            width = max(indexes) + 1
+            columns = ([], [], [], [])
+            for row in rows:
+                if not self._running.is_set():
+                    self._running.wait()
+                if not row:
+                    continue
+                if len(row) < width:
+                    # XLSX 只读模式和手写的 CSV 会省掉末尾的空单元格
+                    row = list(row) + [''] * (width - len(row))
+                values = parse_values([row[i] for i in indexes])
+                if values is None:
+                    invalid += 1
+                    continue
+                if values.count(None) == len(values):
+                    continue  # 空行
+                for column, value in zip(columns, values):
+                    column.append(value)
+                if len(columns[0]) >= self.chunk_size:
+                    imported += self._emit(columns)
+                    columns = ([], [], [], [])
+            imported += self._emit(columns)
+            self.progress.emit(100)
+            self.finished.emit(imported, invalid)
+        except ImportCancelled:
+            self.finished.emit(imported, invalid)
+        except (OSError, ValueError, csv.Error) as e:
+            self.failed.emit(str(e))
+
+    def _emit(self, columns):
+        if self._cancel.is_set():
+            raise ImportCancelled()
+        if not columns[0]:
+            return 0
+        self.chunk.emit(solve_columns(*columns))
+        return len(columns[0])
+
+
+def _chain(first, rows):
+    yield first
+    yield from rows
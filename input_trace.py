@@ -0,0 +1,357 @@
+"""
+Description: 操作录制与回放 - 录下发给主窗口的按键、鼠标（含小键盘按钮）事件，写成紧凑的二进制轨迹；
+回放时在 offscreen 平台上按原速或最快速度重新投递，统计每个事件的处理耗时（含重绘），
+并与录制结束时的输入框内容比较，真实的操作轨迹即可作为性能和正确性的回归用例。默认不录制。
+
+轨迹格式: 24 字节文件头（魔数 + 记录长度 + 录制开始时间），之后是连续的 24 字节小端记录
+    dt_us u32 | kind u8 | flags u8 | target u16 | code u32 | modifiers u32 | x i16 | y i16 | char u32
+dt_us 为距上一条记录的微秒数；code 为按键码或鼠标按钮（移动时为按住的按钮）；char 为按键文字的码位。
+KIND_TARGET 和 KIND_STATE 记录之后紧跟 code 字节的 UTF-8 数据：
+目标控件名（首次出现时登记，之后的事件只写编号）和 JSON 格式的输入框状态（录制开始与结束各一条）。
+"""
+
+import json
+import struct
+import time
+
+from PyQt5 import sip
+from PyQt5.QtCore import QEvent, QObject, QPoint, Qt
+from PyQt5.QtGui import QKeyEvent, QMouseEvent
+from PyQt5.QtWidgets import QApplication, QPushButton, QWidget
+
+from solver import FIELDS
+
+MAGIC = b'QCTRACE\x01'
+HEADER = struct.Struct('<8sI4xd')
+RECORD = struct.Struct('<IBBHIIhhI')
+
+KIND_KEY_PRESS = 1
+KIND_KEY_RELEASE = 2
+KIND_MOUSE_PRESS = 3
+KIND_MOUSE_RELEASE = 4
+KIND_MOUSE_DOUBLE = 5
+KIND_MOUSE_MOVE = 6
+KIND_TARGET = 7
+KIND_STATE = 8
+
+FLAG_AUTO_REPEAT = 1  # 按键事件：按住不放的自动重复
+FLAG_FINAL = 1        # 状态记录：录制结束时的状态（否则为开始时）
+
+EVENT_KINDS = {
+    QEvent.KeyPress: KIND_KEY_PRESS,
+    QEvent.KeyRelease: KIND_KEY_RELEASE,
+    QEvent.MouseButtonPress: KIND_MOUSE_PRESS,
+    QEvent.MouseButtonRelease: KIND_MOUSE_RELEASE,
+    QEvent.MouseButtonDblClick: KIND_MOUSE_DOUBLE,
+    QEvent.MouseMove: KIND_MOUSE_MOVE,
+}
+MOUSE_KINDS = (KIND_MOUSE_PRESS, KIND_MOUSE_RELEASE, KIND_MOUSE_DOUBLE, KIND_MOUSE_MOVE)
+MAX_DT_US = 0xFFFFFFFF
+
+# 按属性名登记的控件，比按控件树位置定位更不容易因为界面调整而失效
+NAMED_WIDGETS = ('prob1_entry', 'people1_entry', 'prob2_entry', 'people2_entry',
+                 'toggle_button', 'transparency_slider', 'ad_label', 'numpad_widget')
+
+
+def target_name(window, widget):
+    """
+    控件在轨迹里的名字：window、主窗口的属性名、numpad:按钮文字、#objectName，
+    都不是时为 /类名[同类序号]/... 形式的控件树路径
+    """
+    if widget is window:
+        return 'window'
+    for attr in NAMED_WIDGETS:
+        if getattr(window, attr, None) is widget:
+            return attr
+    if widget.property('numpad'):
+        return 'numpad:' + widget.text()
+    name = widget.objectName()
+    if name and window.findChild(QWidget, name) is widget:
+        return '#' + name
+    segments = []
+    while widget is not window:
+        parent = widget.parentWidget()
+        class_name = widget.metaObject().className()
+        siblings = [w for w in parent.children() if w.isWidgetType() and w.metaObject().className() == class_name]
+        segments.append(f"{class_name}[{siblings.index(widget)}]")
+        widget = parent
+    return '/' + '/'.join(reversed(segments))
+
+
+def resolve_target(window, name):
+    """按 target_name 的名字找回控件，找不到（例如小键盘还没创建）时返回 None"""
+    if name == 'window':
+        return window
+    if name in NAMED_WIDGETS:
+        return getattr(window, name, None)
+    if name.startswith('numpad:'):
+        if window.numpad_widget is None:
+            return None
+        text = name[len('numpad:'):]
+        return next((b for b in window.numpad_widget.findChildren(QPushButton) if b.text() == text), None)
+    if name.startswith('#'):
+        return window.findChild(QWidget, name[1:])
+    widget = window
+    for segment in name.strip('/').split('/'):
+        class_name, index = segment[:-1].split('[')
+        siblings = [w for w in widget.children() if w.isWidgetType() and w.metaObject().className() == class_name]
+        if int(index) >= len(siblings):
+            return None
+        widget = siblings[int(index)]
+    return widget
+
+
+def field_state(window):
+    """四个输入框的内容和小键盘是否展开"""
+    if window.released_state is not None:  # 托盘模式下控件树已释放
+        state = window.released_state.fields()
+        state['numpad_visible'] = window.released_state.numpad_visible
+        return state
+    state = {field: getattr(window, field + '_entry').text() for field in FIELDS}
+    state['numpad_visible'] = window.numpad_visible
+    return state
+
+
+class TraceRecorder(QObject):
+    """
+    在 QApplication 上装事件过滤器，录下发往 window 及其子控件的按键和左键事件（移动只录按住左键时的）。
+    右键菜单是模态的，回放会卡住，不录制。事件没被接受时 Qt 会把同一个事件再发给父控件，只录第一次投递。
+    """
+
+    def __init__(self, window, path):
+        super().__init__(window)
+        self.window = window
+        self.path = path
+        self.count = 0
+        self._file = open(path, 'wb')
+        self._targets = {}
+        self._last = None      # 上一个录下的 (控件, kind, code, 时间戳)，用来识别向父控件的转发
+        self.started = time.perf_counter()
+        self._previous = self.started
+        self._file.write(HEADER.pack(MAGIC, RECORD.size, time.time()))
+        self._write_state(0)
+        QApplication.instance().installEventFilter(self)
+
+    def close(self):
+        """写入结束时的状态并关闭文件，可重复调用"""
+        if self._file is None:
+            return
+        QApplication.instance().removeEventFilter(self)
+        self._write_state(FLAG_FINAL)
+        self._file.close()
+        self._file = None
+
+    def eventFilter(self, obj, event):
+        kind = EVENT_KINDS.get(event.type())
+        if kind is None or not obj.isWidgetType() or obj.window() is not self.window:
+            return False
+        if kind in MOUSE_KINDS:
+            code = int(event.buttons() if kind == KIND_MOUSE_MOVE else event.button())
+            if not code & Qt.LeftButton:
+                return False
+            x, y = event.x(), event.y()
+            char = 0
+        else:
+            code = event.key()
+            x = y = 0
+            text = event.text()
+            char = ord(text[0]) if text else 0
+        if self._propagated(obj, kind, code, event.timestamp()):
+            return False
+        self._last = (obj, kind, code, event.timestamp())
+        target = self._target(obj)
+        flags = FLAG_AUTO_REPEAT if kind in (KIND_KEY_PRESS, KIND_KEY_RELEASE) and event.isAutoRepeat() else 0
+        self._write(kind, flags, target, code, int(event.modifiers()), x, y, char)
+        self.count += 1
+        return False
+
+    def _propagated(self, obj, kind, code, timestamp):
+        if self._last is None:
+            return False
+        last, last_kind, last_code, last_timestamp = self._last
+        if sip.isdeleted(last) or (kind, code, timestamp) != (last_kind, last_code, last_timestamp):
+            return False
+        return obj is not last and obj.isAncestorOf(last)
+
+    def _target(self, widget):
+        name = target_name(self.window, widget)
+        target = self._targets.get(name)
+        if target is None:
+            target = self._targets[name] = len(self._targets)
+            self._write(KIND_TARGET, 0, target, 0, 0, 0, 0, 0, name.encode('utf-8'))
+        return target
+
+    def _write_state(self, flags):
+        state = field_state(self.window)
+        state['stake_rules'] = [[rule.unit, rule.minimum, rule.maximum] for rule in self.window.stake_rules]
+        self._write(KIND_STATE, flags, 0, 0, 0, 0, 0, 0, json.dumps(state, ensure_ascii=False).encode('utf-8'))
+
+    def _write(self, kind, flags, target, code, modifiers, x, y, char, payload=b''):
+        now = time.perf_counter()
+        dt = min(MAX_DT_US, int((now - self._previous) * 1e6))
+        self._previous = now
+        x = max(-0x8000, min(0x7FFF, x))
+        y = max(-0x8000, min(0x7FFF, y))
+        self._file.write(RECORD.pack(dt, kind, flags, target, len(payload) if payload else code,
+                                     modifiers, x, y, char))
+        if payload:
+            self._file.write(payload)
+
+
+class TraceEvent:
+    """轨迹中的一个输入事件，time 为距录制开始的秒数"""
+
+    __slots__ = ('time', 'kind', 'flags', 'target', 'code', 'modifiers', 'x', 'y', 'char')
+
+    def __init__(self, time, kind, flags, target, code, modifiers, x, y, char):
+        self.time = time
+        self.kind = kind
+        self.flags = flags
+        self.target = target
+        self.code = code
+        self.modifiers = modifiers
+        self.x = x
+        self.y = y
+        self.char = char
+
+    @property
+    def category(self):
+        """统计耗时的分类：key / mouse / numpad / move"""
+        if self.kind in (KIND_KEY_PRESS, KIND_KEY_RELEASE):
+            return 'key'
+        if self.kind == KIND_MOUSE_MOVE:
+            return 'move'
+        return 'numpad' if self.target.startswith('numpad:') else 'mouse'
+
+
+class Trace:
+    """读入的轨迹：events 为 TraceEvent 列表，initial/final 为开始和结束时的状态（没写完的轨迹 final 为 None）"""
+
+    def __init__(self, started, events, initial, final):
+        self.started = started
+        self.events = events
+        self.initial = initial
+        self.final = final
+
+    @property
+    def duration(self):
+        return self.events[-1].time if self.events else 0.0
+
+
+def read_trace(path):
+    """读取轨迹文件；末尾写了一半的记录被忽略"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < HEADER.size:
+        raise ValueError(f"不是操作轨迹: {path}")
+    magic, size, started = HEADER.unpack_from(data)
+    if magic != MAGIC or size != RECORD.size:
+        raise ValueError(f"不是操作轨迹或版本不符: {path}")
+    events, targets = [], {}
+    initial = final = None
+    elapsed = 0
+    offset = HEADER.size
+    while offset + RECORD.size <= len(data):
+        dt, kind, flags, target, code, modifiers, x, y, char = RECORD.unpack_from(data, offset)
+        offset += RECORD.size
+        elapsed += dt
+        if kind in (KIND_TARGET, KIND_STATE):
+            if offset + code > len(data):
+                break
+            payload = data[offset:offset + code].decode('utf-8')
+            offset += code
+            if kind == KIND_TARGET:
+                targets[target] = payload
+            elif flags & FLAG_FINAL:
+                final = json.loads(payload)
+            else:
+                initial = json.loads(payload)
+            continue
+        events.append(TraceEvent(elapsed / 1e6, kind, flags, targets[target], code, modifiers, x, y, char))
+    return Trace(started, events, initial, final)
+
+
+class ReplayResult:
+    """回放结果：latencies 为 {分类: [每个事件的耗时（秒）]}，skipped 为找不到目标控件的事件数"""
+
+    def __init__(self):
+        self.latencies = {}
+        self.skipped = 0
+        self.elapsed = 0.0
+        self.final = None
+
+    def mismatches(self, expected):
+        """与录制结束时的状态不同的项 [(名字, 录制值, 回放值)]"""
+        if expected is None:
+            return []
+        return [(name, value, self.final.get(name)) for name, value in expected.items()
+                if name in self.final and self.final[name] != value]
+
+
+def apply_state(window, state):
+    """把窗口恢复到录制开始时的状态"""
+    from rounding import StakeRule
+    if state.get('stake_rules'):
+        window.set_stake_rules(*(StakeRule(*rule) for rule in state['stake_rules']))
+    if window.numpad_visible != state.get('numpad_visible', False):
+        window.toggle_numpad()
+    for field in FIELDS:
+        getattr(window, field + '_entry').setText(state.get(field, ''))
+    window.current_entry = window.prob1_entry
+    window.prob1_entry.setFocus()
+
+
+def _dispatch(window, event):
+    widget = resolve_target(window, event.target)
+    if widget is None:
+        return False
+    modifiers = Qt.KeyboardModifiers(event.modifiers)
+    if event.kind in (KIND_KEY_PRESS, KIND_KEY_RELEASE):
+        qt_type = QEvent.KeyPress if event.kind == KIND_KEY_PRESS else QEvent.KeyRelease
+        text = chr(event.char) if event.char else ''
+        QApplication.sendEvent(widget, QKeyEvent(qt_type, event.code, modifiers, text,
+                                                 bool(event.flags & FLAG_AUTO_REPEAT)))
+        return True
+    # 按下/松开走 QTest，按自发事件投递，点击切换焦点等行为与真实操作一致
+    from PyQt5.QtTest import QTest
+    pos = QPoint(event.x, event.y)
+    button = Qt.MouseButton(event.code)
+    if event.kind == KIND_MOUSE_PRESS:
+        QTest.mousePress(widget, button, modifiers, pos)
+    elif event.kind == KIND_MOUSE_RELEASE:
+        QTest.mouseRelease(widget, button, modifiers, pos)
+    elif event.kind == KIND_MOUSE_DOUBLE:
+        QTest.mouseDClick(widget, button, modifiers, pos)
+    else:
+        QApplication.sendEvent(widget, QMouseEvent(QEvent.MouseMove, pos, widget.mapToGlobal(pos),
+                                                   Qt.NoButton, Qt.MouseButtons(event.code), modifiers))
+    return True
+
+
+def replay(window, trace, speed=None):
+    """
+    把轨迹投递给 window。speed 为 None 时一个接一个尽快投递，否则按录制时的间隔除以 speed 等待。
+    每个事件的耗时从投递开始到事件队列处理完（含重绘）为止。
+    """
+    app = QApplication.instance()
+    result = ReplayResult()
+    if trace.initial is not None:
+        apply_state(window, trace.initial)
+    app.processEvents()
+    started = time.perf_counter()
+    for event in trace.events:
+        if speed:
+            remaining = started + event.time / speed - time.perf_counter()
+            if remaining > 0:
+                # 等待期间照常处理事件（提示淡出、滚动文字等）
+                from PyQt5.QtTest import QTest
+                QTest.qWait(int(remaining * 1000))
+        begin = time.perf_counter()
+        if not _dispatch(window, event):
+            result.skipped += 1
+            continue
+        app.processEvents()
+        result.latencies.setdefault(event.category, []).append(time.perf_counter() - begin)
+    result.elapsed = time.perf_counter() - started
+    result.final = field_state(window)
+    return result
@@ -0,0 +1,78 @@
+"""
+Description: 常驻单实例 - 第一次启动的计算器用 QLocalServer 监听本地端点，
+之后的启动只把命令行参数转发给它（显示窗口、预填数值）然后退出。
+本模块只用标准库，转发时不需要导入 PyQt5，重新启动只花解释器启动的时间。
+
+消息:  参数之间用 \0 分隔，以换行结尾，例如 --prob1\01.95\0--people1\01000\n
+应答:  ok
+转发路径上的每个导入都计入重新启动耗时，这里刻意不用 json、tempfile、getpass。
+"""
+
+import os
+import socket
+import sys
+
+DEFAULT_NAME = 'qiancheng-calculator'
+REPLY_TIMEOUT = 5.0
+
+
+def server_name(name=DEFAULT_NAME):
+    """
+    QLocalServer 的监听名。Unix 上用临时目录下的绝对路径（QLocalServer 直接把它当作 socket 文件），
+    Windows 上是命名管道名。名字里带用户名，多个用户登录同一台机器时互不干扰。
+    """
+    user = os.environ.get('USER') or os.environ.get('USERNAME') or 'user'
+    name = f"{name}-{user}"
+    if sys.platform == 'win32':
+        return name
+    return os.path.join(os.environ.get('TMPDIR') or '/tmp', name)
+
+
+def instance_name(argv):
+    """从参数中取 --instance-name，不解析其它参数，转发路径上不导入 argparse"""
+    for i, arg in enumerate(argv):
+        if arg == '--instance-name' and i + 1 < len(argv):
+            return argv[i + 1]
+        if arg.startswith('--instance-name='):
+            return arg.split('=', 1)[1]
+    return DEFAULT_NAME
+
+
+def encode_message(argv):
+    if any('\n' in arg for arg in argv):
+        raise ValueError("参数中不能有换行")
+    return ('\0'.join(argv) + '\n').encode('utf-8')
+
+
+def decode_message(data):
+    if not data.endswith(b'\n'):
+        raise ValueError(f"无效消息: {data!r}")
+    text = data[:-1].decode('utf-8')
+    return text.split('\0') if text else []
+
+
+def forward_to_running(argv, name=None):
+    """
+    把参数发给已在运行的实例并等它应答（窗口已显示）。
+    成功返回 True；没有实例在监听时返回 False，由调用方自己启动界面。
+    """
+    name = name or server_name(instance_name(argv))
+    message = encode_message(argv)
+    if sys.platform == 'win32':
+        try:
+            with open(r'\\.\pipe' '\\' + name, 'r+b', buffering=0) as pipe:
+                pipe.write(message)
+                return pipe.readline().strip() == b'ok'
+        except OSError:
+            return False
+
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.settimeout(REPLY_TIMEOUT)
+        client.connect(name)
+        client.sendall(message)
+        return client.makefile('rb').readline().strip() == b'ok'
+    except OSError:
+        return False
+    finally:
+        client.close()
@@ -0,0 +1,148 @@
+"""
+Description: 延迟统计 - 给热点路径（按键、小键盘、计算、点击复制、滚动文字）计时，默认关闭。
+关闭时被装饰的方法只多一次函数调用；开启后每个指标写入预分配的环形缓冲区（最近 CAPACITY 次），
+查看时才排序求 p50/p95/p99/max，可导出为 JSON。只依赖标准库。
+"""
+
+import functools
+import json
+import os
+import time
+from array import array
+
+CAPACITY = 4096
+# 导出 JSON 时直方图的桶边界，毫秒
+HISTOGRAM_EDGES = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 16, 33, 66, 100, 250, 1000)
+
+_perf_counter = time.perf_counter
+_recorder = None
+
+
+class LatencySeries:
+    """一个指标最近 capacity 次的耗时（秒），缓冲区创建时一次分配好"""
+
+    __slots__ = ('name', 'samples', 'count', 'index', 'worst')
+
+    def __init__(self, name, capacity=CAPACITY):
+        self.name = name
+        self.samples = array('d', bytes(8 * capacity))
+        self.count = 0
+        self.index = 0
+        self.worst = 0.0  # 开启以来的最大值，不随环形缓冲区滚动
+
+    def add(self, seconds):
+        self.samples[self.index] = seconds
+        self.index += 1
+        if self.index == len(self.samples):
+            self.index = 0
+        self.count += 1
+        if seconds > self.worst:
+            self.worst = seconds
+
+    def recent(self):
+        return self.samples[:min(self.count, len(self.samples))]
+
+    def summary(self):
+        """最近样本的百分位（毫秒）"""
+        values = sorted(self.recent())
+        if not values:
+            return {'count': 0}
+
+        def percentile(p):
+            return values[min(len(values) - 1, int(len(values) * p))] * 1000
+
+        return {
+            'count': self.count,
+            'window': len(values),
+            'p50_ms': percentile(0.50),
+            'p95_ms': percentile(0.95),
+            'p99_ms': percentile(0.99),
+            'max_ms': values[-1] * 1000,
+            'max_all_ms': self.worst * 1000,
+        }
+
+    def histogram(self):
+        """最近样本按 HISTOGRAM_EDGES 分桶，最后一个桶为超过最大边界的"""
+        counts = [0] * (len(HISTOGRAM_EDGES) + 1)
+        for seconds in self.recent():
+            milliseconds = seconds * 1000
+            bucket = 0
+            while bucket < len(HISTOGRAM_EDGES) and milliseconds > HISTOGRAM_EDGES[bucket]:
+                bucket += 1
+            counts[bucket] += 1
+        return counts
+
+
+class LatencyRecorder:
+    """按名字保存多个指标"""
+
+    def __init__(self, capacity=CAPACITY):
+        self.capacity = capacity
+        self.series = {}
+        self.started = time.time()
+
+    def add(self, name, seconds):
+        series = self.series.get(name)
+        if series is None:
+            series = self.series[name] = LatencySeries(name, self.capacity)
+        series.add(seconds)
+
+    def summary(self):
+        return {name: self.series[name].summary() for name in sorted(self.series)}
+
+    def dump(self, path):
+        """写出 JSON：各指标的百分位和直方图"""
+        data = {
+            'started': self.started,
+            'dumped': time.time(),
+            'capacity': self.capacity,
+            'histogram_edges_ms': HISTOGRAM_EDGES,
+            'metrics': {name: dict(self.series[name].summary(), histogram=self.series[name].histogram())
+                        for name in sorted(self.series)},
+        }
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def enable(capacity=CAPACITY):
+    """开启计时，已开启时返回现有的记录器"""
+    global _recorder
+    if _recorder is None:
+        _recorder = LatencyRecorder(capacity)
+    return _recorder
+
+
+def disable():
+    global _recorder
+    _recorder = None
+
+
+def recorder():
+    """当前的记录器，未开启时为 None"""
+    return _recorder
+
+
+def timed(name):
+    """
+    方法计时装饰器。name 可以是指标名，也可以是 name(*args) -> 指标名或 None 的函数
+    （例如按按键区分，返回 None 的调用不计时）。
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            recorder = _recorder
+            if recorder is None:
+                return func(*args, **kwargs)
+            label = name(*args, **kwargs) if callable(name) else name
+            if label is None:
+                return func(*args, **kwargs)
+            start = _perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                recorder.add(label, _perf_counter() - start)
+        return wrapper
+    return decorate
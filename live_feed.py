@@ -0,0 +1,209 @@
+"""
+Description: 实时赔率推送 - 通过本地 UNIX socket 或命名管道订阅赔率更新，
+按 台子 -> 对冲组合 的依赖索引只重算引用了该台子的组合。
+
+消息格式为一行一条： table,odds[,sent_ns]
+sent_ns 为发送时的 time.monotonic_ns()，用于统计端到端延迟（同机进程间可比）。
+"""
+
+import os
+import selectors
+import socket
+import stat
+import time
+
+from solver import solve_pair
+
+
+class HedgePair:
+    """一个对冲组合：A 台下注金额固定，B 台金额随两边赔率变化"""
+
+    __slots__ = ('pair_id', 'table_a', 'table_b', 'stake_a', 'stake_b', 'odds_a', 'odds_b')
+
+    def __init__(self, pair_id, table_a, table_b, stake_a):
+        self.pair_id = pair_id
+        self.table_a = table_a
+        self.table_b = table_b
+        self.stake_a = stake_a
+        self.stake_b = None
+        self.odds_a = None
+        self.odds_b = None
+
+
+class HedgeBook:
+    """
+    维护最新赔率和全部对冲组合。
+    deps 为 台子 -> 组合列表 的依赖索引，一次更新只重算引用了该台子的组合。
+    """
+
+    def __init__(self, on_change=None):
+        self.prices = {}
+        self.pairs = {}
+        self.deps = {}
+        self.on_change = on_change  # 回调 on_change(pair)，组合金额刷新后调用
+        self.updates = 0
+        self.recomputed = 0
+
+    def add_pair(self, pair_id, table_a, table_b, stake_a):
+        """添加组合，同名的旧组合被替换"""
+        if pair_id in self.pairs:
+            self.remove_pair(pair_id)
+        pair = HedgePair(pair_id, table_a, table_b, stake_a)
+        self.pairs[pair_id] = pair
+        self.deps.setdefault(table_a, []).append(pair)
+        if table_b != table_a:
+            self.deps.setdefault(table_b, []).append(pair)
+        self._recompute(pair)
+        return pair
+
+    def remove_pair(self, pair_id):
+        pair = self.pairs.pop(pair_id)
+        for table in {pair.table_a, pair.table_b}:
+            self.deps[table].remove(pair)
+            if not self.deps[table]:
+                del self.deps[table]
+
+    def update(self, table, odds):
+        """应用一条赔率更新，返回被重算的组合数"""
+        self.updates += 1
+        if self.prices.get(table) == odds:
+            return 0
+        self.prices[table] = odds
+        pairs = self.deps.get(table, ())
+        for pair in pairs:
+            self._recompute(pair)
+        return len(pairs)
+
+    def _recompute(self, pair):
+        pair.odds_a = self.prices.get(pair.table_a)
+        pair.odds_b = self.prices.get(pair.table_b)
+        result = solve_pair(pair.odds_a, pair.stake_a, pair.odds_b, None)
+        pair.stake_b = result.people2 if result.ok else None
+        self.recomputed += 1
+        if self.on_change is not None:
+            self.on_change(pair)
+
+
+def parse_update(line):
+    """解析一行更新消息，返回 (table, odds, sent_ns)，格式不对返回 None"""
+    parts = line.split(',')
+    if len(parts) < 2:
+        return None
+    try:
+        odds = float(parts[1])
+        sent = int(parts[2]) if len(parts) > 2 and parts[2] else None
+    except ValueError:
+        return None
+    return parts[0].strip(), odds, sent
+
+
+class FeedSubscriber:
+    """
+    订阅端：连接 UNIX socket 或打开命名管道，非阻塞读取并应用更新。
+    既可以 run() 独立运行，也可以把 fileno() 交给 Qt 的 QSocketNotifier，可读时调用 poll()。
+    命名管道在没有写入方时读到的是 EOF（还没连上或推送进程重启），所以自己再打开一个写端，
+    读端就只会在有数据时可读，推送进程可以随时连上、断开再连上。
+    """
+
+    def __init__(self, path, book, on_update=None):
+        self.path = path
+        self.book = book
+        self.on_update = on_update  # 回调 on_update(table, odds, sent_ns)，更新应用后调用
+        self.malformed = 0          # 格式不对或不是 UTF-8 而跳过的行数
+        self._buffer = b''
+        self._sock = None
+        self._fd = None
+        self._keepalive = None
+        if stat.S_ISFIFO(os.stat(path).st_mode):
+            self._fd = os.open(path, os.O_RDONLY | os.O_NONBLOCK)
+            self._keepalive = os.open(path, os.O_WRONLY | os.O_NONBLOCK)
+        else:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.connect(path)
+            self._sock.setblocking(False)
+
+    def fileno(self):
+        return self._sock.fileno() if self._sock is not None else self._fd
+
+    def _read(self):
+        try:
+            if self._sock is not None:
+                return self._sock.recv(65536)
+            return os.read(self._fd, 65536)
+        except BlockingIOError:
+            return None
+
+    def poll(self):
+        """读取当前可读的全部数据并应用，返回处理的消息数；socket 连接关闭返回 -1（命名管道不会）"""
+        handled = 0
+        while True:
+            data = self._read()
+            if data is None:
+                return handled
+            if not data:
+                return -1 if handled == 0 else handled
+            lines = (self._buffer + data).split(b'\n')
+            self._buffer = lines.pop()
+            for line in lines:
+                try:
+                    update = parse_update(line.decode('utf-8'))
+                except UnicodeDecodeError:
+                    update = None
+                if update is None:
+                    self.malformed += 1
+                    continue
+                table, odds, sent = update
+                self.book.update(table, odds)
+                handled += 1
+                if self.on_update is not None:
+                    self.on_update(table, odds, sent)
+
+    def run(self, until=None):
+        """阻塞运行直到 socket 连接关闭（或 until() 返回 True）"""
+        with selectors.DefaultSelector() as selector:
+            selector.register(self.fileno(), selectors.EVENT_READ)
+            while until is None or not until():
+                if selector.select(timeout=0.5) and self.poll() < 0:
+                    break
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+        elif self._fd is not None:
+            os.close(self._fd)
+            os.close(self._keepalive)
+
+
+class FeedPublisher:
+    """本地推送端：在 UNIX socket 上接受订阅者并广播更新，可用于测试和基准"""
+
+    def __init__(self, path):
+        self.path = path
+        if os.path.exists(path):
+            os.unlink(path)
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._server.bind(path)
+        self._server.listen()
+        self._clients = []
+
+    def accept(self, count=1, timeout=None):
+        """等待 count 个订阅者连接"""
+        self._server.settimeout(timeout)
+        for _ in range(count):
+            client, _ = self._server.accept()
+            self._clients.append(client)
+
+    def publish(self, table, odds, timestamp=True):
+        sent = time.monotonic_ns() if timestamp else ''
+        self.send(f"{table},{odds},{sent}\n".encode('utf-8'))
+
+    def send(self, data):
+        for client in self._clients:
+            client.sendall(data)
+
+    def close(self):
+        for client in self._clients:
+            client.close()
+        self._server.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
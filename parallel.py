@@ -0,0 +1,131 @@
+"""
+Description: 多进程分片求解 - 内存映射输入文件，按行边界切成每核一片，进程池并行求解
+输出顺序与输入一致，结果与 cli.py 单进程输出逐字节相同。
+
+用法:
+    python parallel.py exports.csv -o solved.csv [--workers 16] [--keep-parts]
+
+每个分片写入 <输出>.part-00000 这样的有序分片文件，默认全部完成后按顺序合并；
+加 --keep-parts 则保留分片文件、不合并。
+注意：按行切分要求 CSV 字段内不含换行符。
+"""
+
+import argparse
+import csv
+import mmap
+import os
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from cli import (DEFAULT_CHUNK_SIZE, CsvSolver, StreamStats, detect_format,
+                 solve_csv_rows, stream_jsonl)
+
+
+def _iter_lines(mm, start, end):
+    """逐行读取映射区 [start, end) 内的文本行"""
+    mm.seek(start)
+    while mm.tell() < end:
+        yield mm.readline().decode('utf-8')
+
+
+def split_shards(mm, start, count):
+    """从 start 开始把映射区切成 count 片，每片的边界都落在换行符之后"""
+    size = len(mm)
+    bounds = [start]
+    for i in range(1, count):
+        target = max(start + (size - start) * i // count, bounds[-1])
+        newline = mm.find(b'\n', target)
+        bounds.append(size if newline == -1 else newline + 1)
+    bounds.append(size)
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def part_path(output, index):
+    return f"{output}.part-{index:05d}"
+
+
+def _solve_shard(path, fmt, header, start, end, part, chunk_size):
+    """子进程：求解一个分片并写入分片文件，返回该分片的统计"""
+    stats = StreamStats()
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+            open(part, 'w', encoding='utf-8', newline='') as out:
+        lines = _iter_lines(mm, start, end)
+        if fmt == 'jsonl':
+            stream_jsonl(lines, out, chunk_size, stats)
+        else:
+            writer = csv.writer(out, lineterminator='\n')
+            solve_csv_rows(CsvSolver(header), csv.reader(lines), writer, chunk_size, stats)
+    return stats
+
+
+def solve_file(path, output, fmt='auto', workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+               keep_parts=False, stats=None):
+    """
+    并行求解 path，结果写入 output（keep_parts 时只保留有序分片文件）。
+    返回分片文件路径列表（合并后已删除的返回空列表）。
+    """
+    fmt = detect_format(path, fmt)
+    workers = workers or os.cpu_count() or 1
+    stats = stats if stats is not None else StreamStats()
+
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            open(output, 'w').close()
+            return []
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            header = None
+            body = 0
+            if fmt == 'csv':
+                # 表头由主进程解析并写出，各分片只处理数据行
+                body = mm.find(b'\n') + 1 or len(mm)
+                header = next(csv.reader([mm[:body].decode('utf-8')]))
+                header_solver = CsvSolver(header)
+            shards = split_shards(mm, body, workers)
+
+    parts = [part_path(output, i) for i in range(len(shards))]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_solve_shard, path, fmt, header, start, end, part, chunk_size)
+                   for (start, end), part in zip(shards, parts)]
+        for future in futures:
+            stats.merge(future.result())
+
+    with open(output, 'w', encoding='utf-8', newline='') as out:
+        if header is not None:
+            csv.writer(out, lineterminator='\n').writerow(header_solver.header)
+        if keep_parts:
+            return parts
+        out.flush()
+        for part in parts:
+            with open(part, 'rb') as f:
+                shutil.copyfileobj(f, out.buffer, 1 << 20)
+            os.remove(part)
+    return []
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="多进程分片求解大文件")
+    parser.add_argument('input', help="输入文件（需要可内存映射的普通文件）")
+    parser.add_argument('-o', '--output', required=True, help="输出文件")
+    parser.add_argument('--format', choices=('auto', 'csv', 'jsonl'), default='auto')
+    parser.add_argument('--workers', type=int, default=None, help="进程数，默认 CPU 核数")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--keep-parts', action='store_true',
+                        help="保留有序分片文件，不合并（CSV 表头单独写入输出文件）")
+    parser.add_argument('--quiet', action='store_true')
+    args = parser.parse_args(argv)
+
+    stats = StreamStats()
+    try:
+        solve_file(args.input, args.output, args.format, args.workers, args.chunk_size,
+                   args.keep_parts, stats)
+    except ValueError as e:
+        print(f"输入格式错误: {e}", file=sys.stderr)
+        return 2
+    if not args.quiet:
+        stats.report()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,277 @@
+"""
+Description: 整数金额取整求解 - 平台只接受某个单位的整数倍（如 10、100）并限制最低/最高金额时，
+求两边派彩差 |赔率1*金额1 - 赔率2*金额2| 最小的金额组合，而不是把求出的金额直接截断。
+
+一边金额已知时，另一边取区间内最近的整数倍，O(1)；
+两边都待定时，在金额区间内用类欧几里得算法加二分精确求出最小派彩差，不逐个枚举金额。
+赔率按两位小数计算，全部使用整数运算，没有浮点误差。
+"""
+
+from __future__ import annotations
+
+from math import gcd
+
+from solver import (PEOPLE1, PEOPLE2, STATUS_ERROR, STATUS_NOT_ENOUGH, STATUS_NOTHING_TO_DO,
+                    STATUS_OK, LegsResult, format_value)
+
+ODDS_SCALE = 100  # 赔率精确到 0.01
+
+
+class StakeRule:
+    """一个平台的下注规则：金额为 unit 的整数倍，且不低于 minimum、不高于 maximum（None 表示不限）"""
+
+    __slots__ = ('unit', 'minimum', 'maximum')
+
+    def __init__(self, unit=1, minimum=None, maximum=None):
+        if unit < 1:
+            raise ValueError("下注单位必须是正整数")
+        self.unit = int(unit)
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def __repr__(self):
+        return f"StakeRule(unit={self.unit!r}, minimum={self.minimum!r}, maximum={self.maximum!r})"
+
+    @property
+    def active(self) -> bool:
+        """是否比“任意正整数”更严格"""
+        return self.unit > 1 or bool(self.minimum) or self.maximum is not None
+
+    def multiples(self):
+        """
+        允许的倍数区间 (lo, hi)，金额 = 倍数 * unit，hi 为 None 表示不限；
+        区间内没有合法金额时返回 None
+        """
+        lo = max(1, -(-int(self.minimum) // self.unit)) if self.minimum else 1
+        hi = None if self.maximum is None else int(self.maximum) // self.unit
+        if hi is not None and hi < lo:
+            return None
+        return lo, hi
+
+
+DEFAULT_RULE = StakeRule()
+
+
+class RoundedPair:
+    """取整求解的结果；solved 为被求解的字段名元组，两边都待定时为 (people1, people2)"""
+
+    __slots__ = ('prob1', 'people1', 'prob2', 'people2', 'imbalance', 'solved', 'status')
+
+    prob1: float | None
+    people1: int | None
+    prob2: float | None
+    people2: int | None
+    imbalance: float | None  # 赔率1*金额1 - 赔率2*金额2
+    solved: tuple
+    status: int
+
+    def __init__(self, prob1, people1, prob2, people2, imbalance=None, solved=(), status=STATUS_OK):
+        self.prob1 = prob1
+        self.people1 = people1
+        self.prob2 = prob2
+        self.people2 = people2
+        self.imbalance = imbalance
+        self.solved = solved
+        self.status = status
+
+    def as_tuple(self):
+        return (self.prob1, self.people1, self.prob2, self.people2, self.imbalance, self.solved, self.status)
+
+    def __eq__(self, other):
+        if not isinstance(other, RoundedPair):
+            return NotImplemented
+        return self.as_tuple() == other.as_tuple()
+
+    def __repr__(self):
+        return ("RoundedPair(prob1={!r}, people1={!r}, prob2={!r}, people2={!r}, "
+                "imbalance={!r}, solved={!r}, status={!r})".format(*self.as_tuple()))
+
+    @property
+    def ok(self) -> bool:
+        return self.status == STATUS_OK
+
+    def text(self, field: str) -> str:
+        return format_value(field, getattr(self, field))
+
+
+def odds_units(odds) -> int:
+    """赔率转为以 0.01 为单位的整数"""
+    return int(round(odds * ODDS_SCALE))
+
+
+def nearest_multiple(payout, odds, rule):
+    """
+    金额取整：payout 为派彩（赔率单位 * 金额），返回使 odds*金额 最接近 payout 的合法倍数，
+    正好在两个倍数中间时取较小的；没有合法金额时返回 None。全部为整数运算。
+    """
+    bounds = rule.multiples()
+    if bounds is None:
+        return None
+    step = odds * rule.unit
+    k = (2 * payout + step - 1) // (2 * step)
+    lo, hi = bounds
+    if k < lo:
+        return lo
+    if hi is not None and k > hi:
+        return hi
+    return k
+
+
+def _first_in_range(a, m, lo, hi):
+    """最小的 x >= 0，使 lo <= a*x mod m <= hi（0 <= lo <= hi < m），不存在时返回 None。类欧几里得递归，O(log m)"""
+    a %= m
+    if lo == 0:
+        return 0
+    if a == 0:
+        return None
+    x = (lo + a - 1) // a
+    if a * x <= hi:
+        return x
+    # a*x 越过了区间，换成对 a 取模的同类问题求 x 对应的“绕圈数”y
+    y = _first_in_range(m % a, a, (a - hi % a) % a, (a - lo % a) % a)
+    if y is None:
+        return None
+    x = (m * y + lo + a - 1) // a
+    if a * x - m * y > hi:
+        return None
+    return x
+
+
+def _first_near(a, c, m, d):
+    """最小的 x >= 0，使 (a*x + c) mod m 与 0 的距离（考虑绕回）不超过 d"""
+    if 2 * d + 1 >= m:
+        return 0
+    target = -c % m
+    lo, hi = (target - d) % m, (target + d) % m
+    if lo > hi:
+        return 0  # 区间绕过了 0，x = 0 即满足
+    return _first_in_range(a, m, lo, hi)
+
+
+def _closest_in_window(a, m, lo, hi):
+    """
+    在 k ∈ [lo, hi]（hi 为 None 表示不限）中找使 a*k 离 m 的倍数最近的 k，距离相同取最小的 k。
+    距离只能是 gcd(a, m) 的倍数，先判断能否为 0，否则对距离二分，每次用 _first_near 判断窗口里是否有解。
+    返回 (k, 距离)。
+    """
+    g = gcd(a, m)
+    period = m // g
+    first = -(-lo // period) * period
+    if hi is None or first <= hi:
+        return first, 0
+    count = hi - lo + 1
+    c = a * lo % m
+    low, high = 1, m // (2 * g)
+    while low < high:
+        middle = (low + high) // 2
+        x = _first_near(a, c, m, middle * g)
+        if x is not None and x < count:
+            high = middle
+        else:
+            low = middle + 1
+    distance = low * g
+    return lo + _first_near(a, c, m, distance), distance
+
+
+def _best_pair(a, b, bounds1, bounds2):
+    """
+    两边都待定：在倍数区间内求 (k1, k2) 使 |a*k1 - b*k2| 最小，
+    a、b 为 赔率单位 * 下注单位。返回 (k1, k2)，相同时取较小的金额。
+    """
+    lo1, hi1 = bounds1
+    lo2, hi2 = bounds2
+
+    def clamp2(k1):
+        # 对给定 k1，最近的 k2（正好居中取较小的）并限制在区间内
+        k2 = (2 * a * k1 + b - 1) // (2 * b)
+        return max(lo2, k2 if hi2 is None else min(k2, hi2))
+
+    def clamp1(k2):
+        k1 = (2 * b * k2 + a - 1) // (2 * a)
+        return max(lo1, k1 if hi1 is None else min(k1, hi1))
+
+    candidates = []
+    # k2 不会被区间截断的 k1 范围：a*k1/b 落在 [lo2, hi2] 内
+    inner_lo = max(lo1, -(-b * lo2 // a))
+    inner_hi = hi1 if hi2 is None else (b * hi2 // a if hi1 is None else min(hi1, b * hi2 // a))
+    if inner_hi is None or inner_lo <= inner_hi:
+        k1, _ = _closest_in_window(a, b, inner_lo, inner_hi)
+        candidates.append((k1, clamp2(k1)))
+    # 范围之外 k2 被截断在边界上，差值单调变化，只需比较靠近范围的端点
+    for k2 in (lo2, hi2):
+        if k2 is not None:
+            candidates.append((clamp1(k2), k2))
+    for k1 in (lo1, hi1):
+        if k1 is not None:
+            candidates.append((k1, clamp2(k1)))
+    return min(candidates, key=lambda pair: (abs(a * pair[0] - b * pair[1]), pair[0], pair[1]))
+
+
+def round_pair(prob1, people1, prob2, people2, rule1=DEFAULT_RULE, rule2=DEFAULT_RULE) -> RoundedPair:
+    """
+    按下注规则求金额。两边赔率必须已知；0 与空值一样视为未知。
+    一边金额已知：另一边取派彩最接近的合法金额；两边都待定：求派彩差最小的一组合法金额。
+    已知的金额原样保留，不按规则调整。
+    """
+    if not (prob1 and prob2):
+        return RoundedPair(prob1, people1, prob2, people2, None, (), STATUS_NOT_ENOUGH)
+    try:
+        odds1, odds2 = odds_units(prob1), odds_units(prob2)
+        if odds1 <= 0 or odds2 <= 0:
+            raise ValueError(prob1, prob2)
+        if people1 and people2:
+            return RoundedPair(prob1, people1, prob2, people2,
+                               (odds1 * people1 - odds2 * people2) / ODDS_SCALE, (), STATUS_NOTHING_TO_DO)
+        if people1:
+            k = nearest_multiple(odds1 * int(people1), odds2, rule2)
+            solved = (PEOPLE2,)
+            if k is not None:
+                people2 = k * rule2.unit
+        elif people2:
+            k = nearest_multiple(odds2 * int(people2), odds1, rule1)
+            solved = (PEOPLE1,)
+            if k is not None:
+                people1 = k * rule1.unit
+        else:
+            bounds1, bounds2 = rule1.multiples(), rule2.multiples()
+            solved = (PEOPLE1, PEOPLE2)
+            k = None
+            if bounds1 is not None and bounds2 is not None:
+                k1, k2 = _best_pair(odds1 * rule1.unit, odds2 * rule2.unit, bounds1, bounds2)
+                people1, people2, k = k1 * rule1.unit, k2 * rule2.unit, k1
+        if k is None:
+            return RoundedPair(prob1, people1, prob2, people2, None, (), STATUS_ERROR)
+    except (ArithmeticError, ValueError):
+        return RoundedPair(prob1, people1, prob2, people2, None, (), STATUS_ERROR)
+    return RoundedPair(prob1, people1, prob2, people2,
+                       (odds1 * people1 - odds2 * people2) / ODDS_SCALE, solved, STATUS_OK)
+
+
+def round_legs(odds, stakes, rules=None) -> LegsResult:
+    """
+    N 腿版本：以已知金额中派彩最大的一腿为基准（同 solver.solve_legs），
+    其余每腿独立取派彩最接近基准的合法金额。rules 为每腿的 StakeRule，None 表示都用默认规则。
+    """
+    odds = list(odds)
+    stakes = list(stakes)
+    rules = list(rules) if rules is not None else [DEFAULT_RULE] * len(odds)
+    if not len(odds) == len(stakes) == len(rules):
+        raise ValueError("赔率、金额和规则的数量必须一致")
+    if len(odds) < 2 or not all(odds):
+        return LegsResult(odds, stakes, None, STATUS_NOT_ENOUGH)
+    fixed = [(odds_units(o), int(s)) for o, s in zip(odds, stakes) if s]
+    if not fixed:
+        return LegsResult(odds, stakes, None, STATUS_NOT_ENOUGH)
+    payout = max(o * s for o, s in fixed)
+    if len(fixed) == len(odds):
+        return LegsResult(odds, stakes, payout / ODDS_SCALE, STATUS_NOTHING_TO_DO)
+    solved = []
+    for o, s, rule in zip(odds, stakes, rules):
+        if s:
+            solved.append(s)
+            continue
+        k = nearest_multiple(payout, odds_units(o), rule)
+        if k is None:
+            return LegsResult(odds, stakes, payout / ODDS_SCALE, STATUS_ERROR)
+        solved.append(k * rule.unit)
+    return LegsResult(odds, solved, payout / ODDS_SCALE, STATUS_OK)
@@ -0,0 +1,187 @@
+"""
+Description: 赔率求解核心 - 不依赖 PyQt5/pyperclip，可在后台脚本中直接导入
+原理: A1*A2=B1*B2，即 赔率1*金额1 = 赔率2*金额2，满三算一
+"""
+
+from __future__ import annotations
+
+# 字段名（与界面上的四个输入框一一对应）
+PROB1 = 'prob1'
+PEOPLE1 = 'people1'
+PROB2 = 'prob2'
+PEOPLE2 = 'people2'
+FIELDS = (PROB1, PEOPLE1, PROB2, PEOPLE2)
+
+# 求解状态码
+STATUS_OK = 0             # 已求出第四个值
+STATUS_NOT_ENOUGH = 1     # 已知值不足三个
+STATUS_NOTHING_TO_DO = 2  # 四个值都已给出，无需计算
+STATUS_ERROR = 3          # 计算出错（溢出、非数字等）
+
+STATUS_NAMES = {
+    STATUS_OK: 'ok',
+    STATUS_NOT_ENOUGH: 'not_enough',
+    STATUS_NOTHING_TO_DO: 'nothing_to_do',
+    STATUS_ERROR: 'error',
+}
+
+
+class PairResult:
+    """一组 A台/B台 的求解结果"""
+
+    __slots__ = ('prob1', 'people1', 'prob2', 'people2', 'solved', 'status')
+
+    prob1: float | None
+    people1: int | None
+    prob2: float | None
+    people2: int | None
+    solved: str | None
+    status: int
+
+    def __init__(self, prob1, people1, prob2, people2, solved=None, status=STATUS_OK):
+        self.prob1 = prob1
+        self.people1 = people1
+        self.prob2 = prob2
+        self.people2 = people2
+        self.solved = solved
+        self.status = status
+
+    def as_tuple(self):
+        return (self.prob1, self.people1, self.prob2, self.people2, self.solved, self.status)
+
+    def __eq__(self, other):
+        if not isinstance(other, PairResult):
+            return NotImplemented
+        return self.as_tuple() == other.as_tuple()
+
+    def __repr__(self):
+        return ("PairResult(prob1={!r}, people1={!r}, prob2={!r}, people2={!r}, "
+                "solved={!r}, status={!r})".format(*self.as_tuple()))
+
+    @property
+    def ok(self) -> bool:
+        return self.status == STATUS_OK
+
+    def text(self, field: str) -> str:
+        """返回某个字段在界面上显示的文本"""
+        return format_value(field, getattr(self, field))
+
+
+def parse_value(text: str, is_float: bool = True) -> float | int | None:
+    """把输入框文本解析为数字，空值或无法解析时返回 None"""
+    text = text.strip()
+    if not text or text == '.' or text == '0.':
+        return None
+    try:
+        return float(text) if is_float else int(text)
+    except ValueError:
+        return None
+
+
+def format_value(field: str, value: float | int | None) -> str:
+    """把数值格式化为界面文本：赔率保留两位小数，金额为整数"""
+    if value is None:
+        return ''
+    if field in (PROB1, PROB2):
+        return f"{value:.2f}"
+    return str(value)
+
+
+def solve_pair(prob1: float | None, people1: int | None,
+               prob2: float | None, people2: int | None) -> PairResult:
+    """
+    给出任意三个值，求第四个值。
+    金额结果截断为整数，赔率结果保留两位小数；0 与空值一样视为未知。
+    """
+    try:
+        if prob1 and people1 and prob2 and not people2:
+            # 计算金额2
+            people2 = int((prob1 * people1) / prob2)
+            return PairResult(prob1, people1, prob2, people2, PEOPLE2)
+        elif prob1 and people1 and people2 and not prob2:
+            # 计算赔率2
+            prob2 = round((prob1 * people1) / people2, 2)
+            return PairResult(prob1, people1, prob2, people2, PROB2)
+        elif prob1 and prob2 and people2 and not people1:
+            # 计算金额1
+            people1 = int((prob2 * people2) / prob1)
+            return PairResult(prob1, people1, prob2, people2, PEOPLE1)
+        elif prob2 and people1 and people2 and not prob1:
+            # 计算赔率1
+            prob1 = round((prob2 * people2) / people1, 2)
+            return PairResult(prob1, people1, prob2, people2, PROB1)
+    except (ArithmeticError, ValueError):
+        return PairResult(prob1, people1, prob2, people2, None, STATUS_ERROR)
+
+    if prob1 and people1 and prob2 and people2:
+        status = STATUS_NOTHING_TO_DO
+    else:
+        status = STATUS_NOT_ENOUGH
+    return PairResult(prob1, people1, prob2, people2, None, status)
+
+
+def solve_text(prob1: str, people1: str, prob2: str, people2: str) -> PairResult:
+    """直接对四个输入框的文本求解"""
+    return solve_pair(parse_value(prob1, True), parse_value(people1, False),
+                      parse_value(prob2, True), parse_value(people2, False))
+
+
+class LegsResult:
+    """N 个平台分摊同一仓位的求解结果"""
+
+    __slots__ = ('odds', 'stakes', 'payout', 'status')
+
+    odds: list
+    stakes: list
+    payout: float | None
+    status: int
+
+    def __init__(self, odds, stakes, payout=None, status=STATUS_OK):
+        self.odds = odds
+        self.stakes = stakes
+        self.payout = payout
+        self.status = status
+
+    def __eq__(self, other):
+        if not isinstance(other, LegsResult):
+            return NotImplemented
+        return (self.odds, self.stakes, self.payout, self.status) == \
+            (other.odds, other.stakes, other.payout, other.status)
+
+    def __repr__(self):
+        return (f"LegsResult(odds={self.odds!r}, stakes={self.stakes!r}, "
+                f"payout={self.payout!r}, status={self.status!r})")
+
+    @property
+    def ok(self) -> bool:
+        return self.status == STATUS_OK
+
+
+def solve_legs(odds, stakes) -> LegsResult:
+    """
+    N 腿对冲：已知每一腿的赔率和至少一腿的金额，求其余各腿金额，使 赔率*金额 处处相等。
+    stakes 中 None/0 表示待求。多腿金额已定且派彩不一致时以最大派彩为准，
+    保证每一腿都被覆盖。两腿时与 solve_pair 求金额的结果完全一致。
+    """
+    odds = list(odds)
+    stakes = list(stakes)
+    if len(odds) != len(stakes):
+        raise ValueError("赔率和金额的数量必须一致")
+    if len(odds) < 2 or not all(odds):
+        return LegsResult(odds, stakes, None, STATUS_NOT_ENOUGH)
+
+    fixed = [(o, s) for o, s in zip(odds, stakes) if s]
+    if not fixed:
+        return LegsResult(odds, stakes, None, STATUS_NOT_ENOUGH)
+    # 与两台公式相同的运算顺序：int((赔率1 * 金额1) / 赔率2)
+    reference_odds, reference_stake = max(fixed, key=lambda leg: leg[0] * leg[1])
+    payout = reference_odds * reference_stake
+    if len(fixed) == len(odds):
+        return LegsResult(odds, stakes, payout, STATUS_NOTHING_TO_DO)
+
+    try:
+        solved = [s if s else int(payout / o)
+                  for o, s in zip(odds, stakes)]
+    except (ArithmeticError, ValueError):
+        return LegsResult(odds, stakes, payout, STATUS_ERROR)
+    return LegsResult(odds, solved, payout, STATUS_OK)
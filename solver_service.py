@@ -0,0 +1,236 @@
+"""
+Description: 本地求解服务 - asyncio 行分隔 JSON 协议（TCP 回环或 UNIX socket），
+并发请求在服务端合并为微批次一次求解（装了 numpy 时走 batch.solve_batch），
+队列有上限形成反压，并提供 p50/p99 延迟统计。
+
+请求:  {"id": 1, "prob1": 1.95, "people1": 1000, "prob2": 2.05}
+响应:  {"id": 1, "prob1": 1.95, "people1": 1000, "prob2": 2.05, "people2": 951,
+        "solved": "people2", "status": "ok"}
+统计:  {"op": "stats"}
+
+用法:
+    python solver_service.py --port 8765
+    python solver_service.py --unix /tmp/solver.sock
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from array import array
+
+from cli import STATUS_INVALID, parse_values
+from solver import FIELDS, PROB1, PROB2, STATUS_NAMES, STATUS_OK, solve_pair
+
+try:
+    import numpy as np
+    from batch import SOLVED_NONE, solve_batch
+except ImportError:  # 没有 numpy 时逐条求解
+    np = None
+
+BATCH_THRESHOLD = 32  # 批次小于此值时逐条求解反而更快
+LATENCY_WINDOW = 65536
+
+
+class LatencyStats:
+    """最近 LATENCY_WINDOW 个请求的延迟，存放在预分配的环形缓冲区里"""
+
+    def __init__(self, size=LATENCY_WINDOW):
+        self.samples = array('d', bytes(8 * size))
+        self.count = 0
+
+    def record(self, seconds):
+        self.samples[self.count % len(self.samples)] = seconds
+        self.count += 1
+
+    def percentiles(self, *qs):
+        filled = sorted(self.samples[:min(self.count, len(self.samples))])
+        if not filled:
+            return [0.0 for _ in qs]
+        return [filled[min(len(filled) - 1, int(len(filled) * q))] for q in qs]
+
+
+def _encode(record):
+    return (json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+def _respond(record, field, value, status):
+    """把求解结果写回请求记录"""
+    if field is not None:
+        record[field] = value
+    record['solved'] = field
+    record['status'] = status
+    return _encode(record)
+
+
+def solve_requests(items):
+    """
+    求解一批 (请求记录, 解析后的四个数值) ，返回每条请求的响应字节串。
+    批次够大且装了 numpy 时一次向量化求解，否则逐条调用 solve_pair。
+    """
+    if np is None or len(items) < BATCH_THRESHOLD:
+        responses = []
+        for record, numbers in items:
+            result = solve_pair(*numbers)
+            field = result.solved if result.status == STATUS_OK else None
+            value = getattr(result, field) if field else None
+            responses.append(_respond(record, field, value, STATUS_NAMES[result.status]))
+        return responses
+
+    columns = np.array([numbers for _, numbers in items], dtype=np.float64)
+    result = solve_batch(columns[:, 0], columns[:, 1], columns[:, 2], columns[:, 3])
+    solved = result.solved.tolist()
+    status = result.status.tolist()
+    values = np.choose(np.maximum(result.solved, 0), result.columns()).tolist()
+    responses = []
+    for i, (record, _) in enumerate(items):
+        index = solved[i]
+        if index == SOLVED_NONE:
+            responses.append(_respond(record, None, None, STATUS_NAMES[status[i]]))
+            continue
+        field = FIELDS[index]
+        value = values[i] if field in (PROB1, PROB2) else int(values[i])
+        responses.append(_respond(record, field, value, STATUS_NAMES[status[i]]))
+    return responses
+
+
+class SolverService:
+    """
+    每个连接按请求顺序写回响应；所有连接的请求进入同一个有界队列，
+    由批处理协程把当前排队的请求一次取出合并求解。
+    队列满时读取协程在 put 处等待，不再读 socket，反压自然传回客户端。
+    """
+
+    def __init__(self, max_queue=4096, max_batch=1024, max_inflight=256):
+        self.queue = asyncio.Queue(max_queue)
+        self.max_batch = max_batch
+        self.max_inflight = max_inflight
+        self.latency = LatencyStats()
+        self.requests = 0
+        self.batches = 0
+        self.largest_batch = 0
+
+    def stats(self):
+        p50, p99 = self.latency.percentiles(0.5, 0.99)
+        return {
+            'requests': self.requests,
+            'batches': self.batches,
+            'mean_batch': round(self.requests / self.batches, 2) if self.batches else 0,
+            'largest_batch': self.largest_batch,
+            'queued': self.queue.qsize(),
+            'p50_ms': round(p50 * 1000, 3),
+            'p99_ms': round(p99 * 1000, 3),
+        }
+
+    async def run_batches(self):
+        while True:
+            items = [await self.queue.get()]
+            while len(items) < self.max_batch:
+                try:
+                    items.append(self.queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            try:
+                responses = solve_requests([(record, numbers) for record, numbers, _ in items])
+            except Exception as e:
+                responses = [_encode({'id': record.get('id'), 'status': 'error', 'message': str(e)})
+                             for record, _, _ in items]
+            for (_, _, future), response in zip(items, responses):
+                if not future.done():
+                    future.set_result(response)
+            self.requests += len(items)
+            self.batches += 1
+            self.largest_batch = max(self.largest_batch, len(items))
+            # 队列一直非空时 get() 不会让出事件循环，这里主动让读写协程运行
+            await asyncio.sleep(0)
+
+    async def handle(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        pending = asyncio.Queue(self.max_inflight)
+        writer_task = asyncio.create_task(self._write_responses(pending, writer))
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                received = time.perf_counter()
+                future = loop.create_future()
+                await pending.put((future, received))
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None
+                if not isinstance(record, dict):
+                    future.set_result(_encode({'status': STATUS_INVALID}))
+                elif record.get('op') == 'stats':
+                    future.set_result(_encode(dict(self.stats(), id=record.get('id'))))
+                else:
+                    numbers = parse_values([record.get(field) for field in FIELDS])
+                    if numbers is None:
+                        future.set_result(_respond(record, None, None, STATUS_INVALID))
+                    else:
+                        await self.queue.put((record, numbers, future))
+        except ConnectionError:
+            pass
+        finally:
+            await pending.put(None)
+            await writer_task
+            writer.close()
+
+    async def _write_responses(self, pending, writer):
+        # 客户端断开后仍要取完 pending，避免读取协程在 put 处卡住
+        connected = True
+        while True:
+            item = await pending.get()
+            if item is None:
+                break
+            future, received = item
+            response = await future
+            if not connected:
+                continue
+            writer.write(response)
+            self.latency.record(time.perf_counter() - received)
+            if pending.empty():
+                try:
+                    await writer.drain()
+                except ConnectionError:
+                    connected = False
+
+    async def serve(self, host='127.0.0.1', port=8765, unix=None, ready=None):
+        batcher = asyncio.create_task(self.run_batches())
+        if unix:
+            server = await asyncio.start_unix_server(self.handle, path=unix, backlog=4096)
+        else:
+            server = await asyncio.start_server(self.handle, host, port, backlog=4096)
+        if ready is not None:
+            ready()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="本地 JSON 求解服务")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--unix', help="监听 UNIX socket 路径（指定后忽略 host/port）")
+    parser.add_argument('--max-queue', type=int, default=4096, help="全局排队上限")
+    parser.add_argument('--max-batch', type=int, default=1024, help="单个微批次最大请求数")
+    parser.add_argument('--max-inflight', type=int, default=256, help="单连接在途请求上限")
+    args = parser.parse_args(argv)
+
+    service = SolverService(args.max_queue, args.max_batch, args.max_inflight)
+    where = args.unix or f"{args.host}:{args.port}"
+    try:
+        asyncio.run(service.serve(args.host, args.port, args.unix,
+                                  ready=lambda: print(f"listening on {where}", flush=True)))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
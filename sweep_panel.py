@@ -0,0 +1,217 @@
+"""
+Description: 敏感度面板 - A台赔率固定，在 B台赔率 × A台金额 两个区间上一次向量化算出 500×500 的网格
+（所需B台金额或保底净收益），映射为 8 位色号写进预分配的 NumPy 缓冲区。
+QImage 直接引用这块内存（Indexed8 + 调色板），拖动区间滑块时原地重算、重绘，不复制也不分配新内存。
+"""
+
+import time
+
+import numpy as np
+from PyQt5 import sip
+from PyQt5.QtCore import QRect, Qt, pyqtSignal
+from PyQt5.QtGui import QColor, QImage, QPainter
+from PyQt5.QtWidgets import QComboBox, QGridLayout, QLabel, QVBoxLayout, QWidget
+
+from batch import round_odds
+from widgets import RangeSlider
+
+GRID_SIZE = 500
+MODE_STAKE = 0   # 所需B台金额
+MODE_PROFIT = 1  # 保底净收益：两边各自打出时的派彩减去总投入，取较小的
+MODE_NAMES = ('所需B台金额', '保底净收益')
+ODDS_LIMITS = (1.01, 10.0)
+STAKE_LIMITS = (10, 100000)
+
+
+def _gradient(stops):
+    """按色标插值出 256 色的调色板（QImage.setColorTable 要的 ARGB 整数列表）"""
+    positions = np.linspace(0, 1, 256)
+    points = [position for position, _ in stops]
+    channels = [np.interp(positions, points, [QColor(color).getRgb()[i] for _, color in stops])
+                for i in range(3)]
+    return [QColor(int(r), int(g), int(b)).rgba() for r, g, b in zip(*channels)]
+
+
+COLOR_TABLES = {
+    MODE_STAKE: _gradient([(0.0, '#f4f8fd'), (0.5, '#5fa8e8'), (1.0, '#0b3d91')]),
+    # 以 0 为中点：亏损为红，盈利为绿
+    MODE_PROFIT: _gradient([(0.0, '#c62828'), (0.5, '#f7f7f7'), (1.0, '#2e7d32')]),
+}
+
+
+class SweepGrid:
+    """
+    预分配的网格：列为 B台赔率，行为 A台金额（上面大下面小）。
+    坐标取界面上显示的精度（赔率两位小数、金额整数），values 为 float64 结果，与 calculate 用同样的数和运算顺序；
+    只有 indexes（uint8 色号）是窄类型。每次 compute 都原地写入。
+    """
+
+    def __init__(self, width=GRID_SIZE, height=GRID_SIZE):
+        # QImage 要求每行字节数是 4 的倍数
+        self.stride = (width + 3) // 4 * 4
+        self.width = width
+        self.height = height
+        self.odds = np.empty(width, dtype=np.float64)
+        self.stakes = np.empty(height, dtype=np.float64)
+        self.values = np.empty((height, width), dtype=np.float64)
+        self._work = np.empty((height, width), dtype=np.float64)
+        self._buffer = np.zeros((height, self.stride), dtype=np.uint8)
+        self.indexes = self._buffer[:, :width]
+        self._ramp_x = np.linspace(0, 1, width)
+        self._ramp_y = np.linspace(1, 0, height)
+        self.low = self.high = 0.0
+
+    def image(self):
+        """
+        引用 indexes 内存的 QImage，网格对象存在期间一直有效。
+        要传裸指针：传 bytes 类对象时 Qt 视为只读数据，setColorTable 会把整张图复制一份
+        """
+        return QImage(sip.voidptr(self._buffer.ctypes.data), self.width, self.height, self.stride,
+                      QImage.Format_Indexed8)
+
+    def compute(self, prob1, odds_range, stake_range, mode=MODE_STAKE):
+        """一次向量化算出整张网格并映射为色号，返回 (最小值, 最大值)"""
+        values, work = self.values, self._work
+        np.multiply(self._ramp_x, odds_range[1] - odds_range[0], out=self.odds)
+        self.odds += odds_range[0]
+        self.odds[:] = round_odds(self.odds)
+        np.multiply(self._ramp_y, stake_range[1] - stake_range[0], out=self.stakes)
+        self.stakes += stake_range[0]
+        np.rint(self.stakes, out=self.stakes)
+
+        # 所需B台金额 = int(赔率1 * 金额1 / 赔率2)，与 calculate 一致
+        payout = self.stakes * prob1
+        np.divide(payout[:, None], self.odds[None, :], out=values)
+        np.trunc(values, out=values)
+        if mode == MODE_PROFIT:
+            # min(A台派彩, B台派彩) - (金额1 + 金额2)
+            np.multiply(values, self.odds[None, :], out=work)
+            np.minimum(work, payout[:, None], out=work)
+            work -= values
+            work -= self.stakes[:, None]
+            values, work = work, values
+            self.values, self._work = values, work
+            self.low, self.high = float(values.min()), float(values.max())
+            limit = max(abs(self.low), abs(self.high), 1e-9)
+            low, scale = -limit, 255 / (2 * limit)
+        else:
+            self.low, self.high = float(values.min()), float(values.max())
+            low, scale = self.low, 255 / max(self.high - self.low, 1e-9)
+
+        np.subtract(values, low, out=work)
+        work *= scale
+        np.clip(work, 0, 255, out=work)
+        np.copyto(self.indexes, work, casting='unsafe')
+        return self.low, self.high
+
+
+class HeatmapView(QWidget):
+    """把网格图像拉伸绘制到控件上；鼠标移动时发出所在格子的 (行, 列)"""
+
+    hovered = pyqtSignal(int, int)
+
+    def __init__(self, grid, parent=None):
+        super().__init__(parent)
+        self.grid = grid
+        self.image = grid.image()
+        self.setMinimumSize(250, 250)
+        self.setMouseTracking(True)
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+
+    def set_color_table(self, table):
+        self.image.setColorTable(table)
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.drawImage(QRect(0, 0, self.width(), self.height()), self.image)
+
+    def mouseMoveEvent(self, event):
+        column = event.pos().x() * self.grid.width // max(1, self.width())
+        row = event.pos().y() * self.grid.height // max(1, self.height())
+        if 0 <= row < self.grid.height and 0 <= column < self.grid.width:
+            self.hovered.emit(row, column)
+
+
+class SweepPanel(QWidget):
+    """敏感度窗口：两个区间滑块 + 热力图，拖动时同步重算"""
+
+    def __init__(self, parent=None, size=GRID_SIZE):
+        super().__init__(parent, Qt.Tool)
+        self.setObjectName("sweep_panel")
+        self.setWindowTitle("敏感度")
+        self.resize(560, 640)
+        self.prob1 = 2.0
+        self.grid = SweepGrid(size, size)
+        self.last_compute = 0.0
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(8, 8, 8, 8)
+        layout.setSpacing(6)
+
+        controls = QGridLayout()
+        self.mode_box = QComboBox()
+        self.mode_box.addItems(MODE_NAMES)
+        self.mode_box.currentIndexChanged.connect(self.change_mode)
+        self.prob1_label = QLabel()
+        controls.addWidget(self.mode_box, 0, 0)
+        controls.addWidget(self.prob1_label, 0, 1)
+        # 赔率滑块以 0.01 为单位
+        self.odds_slider = RangeSlider(round(ODDS_LIMITS[0] * 100), round(ODDS_LIMITS[1] * 100))
+        self.stake_slider = RangeSlider(*STAKE_LIMITS)
+        self.odds_label = QLabel()
+        self.stake_label = QLabel()
+        controls.addWidget(self.odds_label, 1, 0)
+        controls.addWidget(self.odds_slider, 1, 1)
+        controls.addWidget(self.stake_label, 2, 0)
+        controls.addWidget(self.stake_slider, 2, 1)
+        controls.setColumnStretch(1, 1)
+        layout.addLayout(controls)
+
+        self.view = HeatmapView(self.grid)
+        self.view.hovered.connect(self.show_cell)
+        layout.addWidget(self.view, 1)
+        self.info_label = QLabel()
+        layout.addWidget(self.info_label)
+
+        self.odds_slider.setValues(150, 300)
+        self.stake_slider.setValues(100, 5000)
+        self.odds_slider.rangeChanged.connect(self.refresh)
+        self.stake_slider.rangeChanged.connect(self.refresh)
+        self.view.set_color_table(COLOR_TABLES[MODE_STAKE])
+        self.refresh()
+
+    def set_center(self, prob1, people1=None, prob2=None):
+        """以主界面的当前值为中心：B台赔率 ±30%，A台金额 0.5～1.5 倍"""
+        self.prob1 = prob1
+        if prob2:
+            self.odds_slider.setValues(round(prob2 * 70), round(prob2 * 130))
+        if people1:
+            self.stake_slider.setValues(people1 // 2, people1 * 3 // 2)
+        self.refresh()
+
+    def ranges(self):
+        low, high = self.odds_slider.values()
+        return (low / 100, high / 100), self.stake_slider.values()
+
+    def change_mode(self, mode):
+        self.view.set_color_table(COLOR_TABLES[mode])
+        self.refresh()
+
+    def refresh(self, *args):
+        """重算网格并重绘；拖动滑块时每次移动都会调用"""
+        odds_range, stake_range = self.ranges()
+        start = time.perf_counter()
+        low, high = self.grid.compute(self.prob1, odds_range, stake_range, self.mode_box.currentIndex())
+        self.last_compute = time.perf_counter() - start
+        self.prob1_label.setText(f"A台赔率 {self.prob1:.2f}")
+        self.odds_label.setText(f"B台赔率 {odds_range[0]:.2f}～{odds_range[1]:.2f}")
+        self.stake_label.setText(f"A台金额 {stake_range[0]}～{stake_range[1]}")
+        self.info_label.setText(f"{MODE_NAMES[self.mode_box.currentIndex()]} {low:.0f}～{high:.0f}"
+                                f"（计算 {self.last_compute * 1000:.1f} ms）")
+        self.view.update()
+
+    def show_cell(self, row, column):
+        grid = self.grid
+        self.info_label.setText(f"B台赔率 {grid.odds[column]:.2f}，A台金额 {grid.stakes[row]:.0f}："
+                                f"{MODE_NAMES[self.mode_box.currentIndex()]} {grid.values[row, column]:.0f}")
@@ -0,0 +1,68 @@
+"""batch.solve_batch 必须与逐行的 solver.solve_pair 结果逐位一致"""
+
+import math
+
+import numpy as np
+import pytest
+
+from batch import round_odds, solve_batch
+from solver import FIELDS, solve_pair
+
+
+def random_rows(n, seed):
+    """赔率两位小数、金额整数，每行随机挑 0～2 列置空，偶尔填 0"""
+    rng = np.random.default_rng(seed)
+    columns = [
+        rng.uniform(1.01, 10.0, n).round(2),
+        rng.integers(1, 200000, n).astype(np.float64),
+        rng.uniform(1.01, 10.0, n).round(2),
+        rng.integers(1, 200000, n).astype(np.float64),
+    ]
+    for _ in range(2):
+        blank = rng.integers(0, 6, n)  # 4、5 表示这一轮不置空
+        for j, column in enumerate(columns):
+            column[blank == j] = np.nan
+    columns[1][rng.random(n) < 0.01] = 0
+    return columns
+
+
+def scalar(value):
+    return None if math.isnan(value) else value
+
+
+def assert_matches_scalar(columns):
+    result = solve_batch(*columns)
+    rows = zip(*(column.tolist() for column in columns))
+    for i, row in enumerate(rows):
+        expected = solve_pair(*(scalar(v) for v in row))
+        assert result.status[i] == expected.status, (row, expected)
+        assert result.solved_name(i) == expected.solved, (row, expected)
+        for field, column in zip(FIELDS, result.columns()):
+            value = getattr(expected, field)
+            # 输入的 0 与空值一样是未知，批量结果里为 NaN；求出来的 0 照常比较
+            if value is None or (value == 0 and field != expected.solved):
+                assert math.isnan(column[i]), (row, field)
+            else:
+                assert column[i] == value, (row, field, column[i], value)
+
+
+def test_known_mismatch_row():
+    result = solve_batch([1.23], [84036], [np.nan], [46248])
+    assert result.prob2[0] == solve_pair(1.23, 84036, None, 46248).prob2 == 2.23
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_solve_batch_matches_solve_pair(seed):
+    assert_matches_scalar(random_rows(50000, seed))
+
+
+def test_round_odds_matches_round():
+    rng = np.random.default_rng(7)
+    values = np.concatenate([
+        rng.uniform(0, 1000, 100000) * rng.uniform(0, 1, 100000),
+        np.arange(100000) / 1000 + 0.005,  # 恰好落在 .xx5 附近
+        [np.nan, np.inf, -1.005, 1.7e307],
+    ])
+    rounded = round_odds(values)
+    expected = [round(v, 2) for v in values.tolist()]
+    assert all(a == b or (math.isnan(a) and math.isnan(b)) for a, b in zip(rounded.tolist(), expected))
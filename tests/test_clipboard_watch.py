@@ -0,0 +1,24 @@
+"""剪贴板解析：标签后带冒号的数值要提取，时间、日期、百分比里的数字忽略"""
+
+import pytest
+
+from clipboard_watch import KIND_ODDS, KIND_STAKE, parse_clipboard
+
+
+@pytest.mark.parametrize('text', ['赔率：1.95', '赔率:1.95', '赔率: 1.95', 'A台：１．９５'])
+def test_label_colon(text):
+    assert parse_clipboard(text) == [(KIND_ODDS, 1.95)]
+
+
+def test_label_colon_pair():
+    text = 'A台赔率：1.95 下注：1,000\nB台赔率:2.05 下注:800'
+    assert parse_clipboard(text) == [(KIND_ODDS, 1.95), (KIND_STAKE, 1000), (KIND_ODDS, 2.05), (KIND_STAKE, 800)]
+
+
+@pytest.mark.parametrize('text', ['12:30', '12：30:45', '2024/05/01', '2024-05-01', '85%', '05/01 12:30 80%'])
+def test_times_dates_percentages_ignored(text):
+    assert parse_clipboard(text) == []
+
+
+def test_time_next_to_odds():
+    assert parse_clipboard('开赛 20:45 赔率：1.95') == [(KIND_ODDS, 1.95)]
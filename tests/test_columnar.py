@@ -0,0 +1,60 @@
+"""列式结果文件与 CSV 互转：cli.py 输出的 CSV 转成列式再转回来逐字节不变"""
+
+import io
+import math
+
+import cli
+import columnar
+from solver import FIELDS, PROB1, PROB2, parse_value
+from test_batch import random_rows
+
+# cli.py 记为 invalid 的行：字段不是数字、金额带小数、比表头少一列
+INVALID_ROWS = ['abc,1000,2.05,', '1.95,100.5,2.05,', '1.95,1000,2.05', '1.95,1e3,,800', '1.95,,x,']
+
+
+def input_csv(n, seed):
+    lines = ['prob1,people1,prob2,people2', '2.00,1000,,1000', '1.23,84036,,46248']
+    for row in zip(*(column.tolist() for column in random_rows(n, seed))):
+        lines.append(','.join('' if math.isnan(v) else (f"{v:.2f}" if i % 2 == 0 else str(int(v)))
+                              for i, v in enumerate(row)))
+    return '\n'.join(lines) + '\n'
+
+
+def test_cli_csv_round_trip(tmp_path):
+    solved = io.StringIO()
+    cli.stream_csv(io.StringIO(input_csv(20000, 31)), solved)
+    text = solved.getvalue()
+    assert '2.00,1000,2.00,1000,prob2,ok' in text.splitlines()
+
+    path = str(tmp_path / 'solved.qcc')
+    rows = columnar.from_csv(io.StringIO(text), path, chunk_size=4096)
+    assert rows == text.count('\n') - 1
+    out = io.StringIO()
+    columnar.to_csv(path, out)
+    assert out.getvalue() == text
+
+
+def stored_line(line):
+    """列式文件只存数值：invalid 行里 solver.parse_value 解析不了的字段转回 CSV 后为空"""
+    fields = line.split(',')
+    if fields[-1] != 'invalid':
+        return line
+    return ','.join('' if parse_value(text, field in (PROB1, PROB2)) is None else text
+                    for text, field in zip(fields, FIELDS)) + ',' + ','.join(fields[4:])
+
+
+def test_unsolved_csv_matches_cli(tmp_path):
+    # 没有 solved/status 列时 from_csv 按 cli.parse_values 解析、用 solve_batch 求解，结果与 cli.py 逐行求解相同
+    lines = input_csv(20000, 32).splitlines()
+    for i, row in enumerate(INVALID_ROWS):
+        lines.insert(1 + i * 997, row)
+    text = '\n'.join(lines) + '\n'
+    expected = io.StringIO()
+    cli.stream_csv(io.StringIO(text), expected)
+    assert expected.getvalue().count(',invalid\n') == len(INVALID_ROWS)
+
+    path = str(tmp_path / 'batch.qcc')
+    columnar.from_csv(io.StringIO(text), path, chunk_size=4096)
+    out = io.StringIO()
+    columnar.to_csv(path, out)
+    assert out.getvalue().splitlines() == [stored_line(line) for line in expected.getvalue().splitlines()]
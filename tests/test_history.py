@@ -0,0 +1,77 @@
+"""历史日志：崩溃留下的半条记录在下次追加前截掉；导入 history 不加载 numpy"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from history import HEADER, MAGIC, RECORD, History, HistoryLog
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_append_cuts_partial_record(tmp_path):
+    path = str(tmp_path / 'history.bin')
+    history = History(log=HistoryLog(path))
+    history.add(1.95, 1000, 2.05, None, 'people2', timestamp=1)
+    history.add(1.80, 500, 2.20, None, 'people2', timestamp=2)
+    history.close()
+    with open(path, 'ab') as f:  # 模拟写到一半时崩溃
+        f.write(RECORD.pack(3, 1, 1, 1, 1, 0)[:20])
+
+    history = History(log=HistoryLog(path))
+    assert len(history) == 2
+    history.add(1.50, 200, 3.00, None, 'people2', timestamp=4)
+    history.close()
+
+    with open(path, 'rb') as f:
+        size = len(f.read())
+    assert size == HEADER.size + 3 * RECORD.size
+    history = History(log=HistoryLog(path))
+    assert [history.record(i).timestamp for i in range(len(history))] == [1, 2, 4]
+    assert history.record(2).prob1 == 1.50
+
+
+def test_append_rewrites_partial_header(tmp_path):
+    path = str(tmp_path / 'history.bin')
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, RECORD.size)[:5])
+    history = History(log=HistoryLog(path))
+    history.add(1.95, 1000, 2.05, None, 'people2', timestamp=1)
+    history.close()
+    assert History(log=HistoryLog(path)).record(0).prob1 == 1.95
+
+
+def test_import_does_not_load_numpy():
+    code = "import sys, history; print('numpy' in sys.modules)"
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                         cwd=ROOT)
+    assert out.stdout.strip() == 'False'
+
+
+def test_log_flushes_at_most_once_per_interval(tmp_path):
+    path = str(tmp_path / 'history.bin')
+    history = History(log=HistoryLog(path, flush_interval=3600))
+    for i in range(100):
+        history.add(1.95, 1000 + i, 2.05, None, 'people2', timestamp=i)
+    # 第一条立即写出，之后的留在缓冲里
+    assert os.path.getsize(path) == HEADER.size + RECORD.size
+    history.flush()
+    assert os.path.getsize(path) == HEADER.size + 100 * RECORD.size
+    history.close()
+
+
+def test_array_without_numpy(monkeypatch):
+    import history as module
+
+    history = History()
+    history.add(1.95, 1000, 2.05, None, 'people2', timestamp=1)
+    history.add(3.00, 500, 1.40, None, 'people2', timestamp=2)
+    monkeypatch.setattr(module, '_numpy', lambda: None)
+    monkeypatch.setattr(module, '_record_dtype', None)
+    with pytest.raises(ImportError, match='numpy'):
+        history.array()
+    with pytest.raises(ImportError, match='numpy'):
+        module.record_dtype()
+    assert history.filter_odds(1.5, 2.0) == [0]
@@ -0,0 +1,37 @@
+"""操作轨迹：bench_replay --record-demo 录下的轨迹回放到新窗口后，输入框内容与录制结束时一致"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+
+@pytest.fixture
+def app():
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+def test_demo_trace_replays_without_mismatch(app, tmp_path):
+    from bench_replay import new_window, record_demo
+    from input_trace import read_trace, replay
+
+    path = str(tmp_path / 'demo.trace')
+    record_demo(path, 6)
+    trace = read_trace(path)
+    assert trace.events and trace.final is not None
+    assert trace.final['people1'] == '1005'
+
+    window = new_window()
+    try:
+        result = replay(window, trace)
+    finally:
+        window.close()
+    assert result.skipped == 0
+    assert set(result.latencies) >= {'key', 'mouse', 'numpad'}
+    assert result.mismatches(trace.final) == []
+    assert {name: result.final[name] for name in ('prob1', 'people1', 'prob2')} == \
+        {'prob1': '1.95', 'people1': '1005', 'prob2': '2.05'}
@@ -0,0 +1,52 @@
+"""常驻单实例：只有确认端点是崩溃残留的 socket 文件时才接管，已有实例太忙没应答时不能抢它的端点"""
+
+import os
+import socket
+
+import pytest
+
+
+@pytest.fixture
+def app():
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+def test_takes_over_stale_socket(app, tmp_path):
+    import calculator
+    from history import History
+    from instance import forward_to_running
+
+    name = str(tmp_path / 'resident')
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(name)  # 绑定后不监听、不删除，与崩溃后留下的 socket 文件一样
+    stale.close()
+    window = calculator.FloatingCalculator(history=History())
+    try:
+        window.listen_resident(name)
+        assert window.resident_server is not None and window.resident_server.isListening()
+    finally:
+        window.resident_server.close()
+        window.close()
+    assert not forward_to_running(['--hide'], name)
+
+
+def test_keeps_busy_instance_endpoint(app, tmp_path):
+    import calculator
+    from history import History
+
+    name = str(tmp_path / 'resident')
+    busy = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    busy.bind(name)
+    busy.listen()  # 在监听但不应答，与忙着的常驻实例一样
+    window = calculator.FloatingCalculator(history=History())
+    try:
+        window.listen_resident(name)
+        assert window.resident_server is None
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        probe.connect(name)  # socket 文件还在，连的仍是原来的实例
+        probe.close()
+    finally:
+        window.close()
+        busy.close()
@@ -0,0 +1,64 @@
+"""batch.solve_legs_batch 必须与逐组的 solver.solve_legs 结果一致"""
+
+import math
+
+import numpy as np
+import pytest
+
+from batch import solve_legs_batch
+from solver import STATUS_ERROR, STATUS_NOT_ENOUGH, STATUS_OK, solve_legs
+
+LEGS = 4
+
+
+def random_groups(n, seed):
+    """每组 1～4 腿，不足 4 腿的用 NaN 补齐；金额随机置空或填 0，偶尔有一腿赔率为 0"""
+    rng = np.random.default_rng(seed)
+    odds = rng.uniform(1.01, 10.0, (n, LEGS)).round(2)
+    stakes = rng.integers(1, 200000, (n, LEGS)).astype(np.float64)
+    stakes[rng.random((n, LEGS)) < 0.5] = np.nan
+    stakes[rng.random((n, LEGS)) < 0.05] = 0
+    odds[rng.random((n, LEGS)) < 0.02] = 0
+    legs = rng.integers(1, LEGS + 1, n)
+    odds[np.arange(LEGS) >= legs[:, None]] = np.nan
+    return odds, stakes
+
+
+def assert_matches_scalar(odds, stakes):
+    result = solve_legs_batch(odds, stakes)
+    for i, (group_odds, group_stakes) in enumerate(zip(odds.tolist(), stakes.tolist())):
+        n = sum(not math.isnan(o) for o in group_odds)
+        expected = solve_legs(group_odds[:n], [None if math.isnan(s) else s for s in group_stakes[:n]])
+        assert result.status[i] == expected.status, (group_odds, group_stakes, expected)
+        if expected.payout is None:
+            assert math.isnan(result.payout[i])
+        else:
+            assert result.payout[i] == expected.payout
+        got = result.stakes[i].tolist()
+        for j, stake in enumerate(expected.stakes):
+            # 输入的 0 与空值一样是未知，批量结果里为 NaN
+            if not stake:
+                assert math.isnan(got[j]), (group_odds, group_stakes, j)
+            else:
+                assert got[j] == stake, (group_odds, group_stakes, j, got[j], stake)
+        assert all(math.isnan(s) for s in got[n:])
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_solve_legs_batch_matches_solve_legs(seed):
+    assert_matches_scalar(*random_groups(20000, seed))
+
+
+def test_zero_odds_is_not_padding():
+    odds = np.array([[2.0, 0, 3.0], [2.0, np.nan, 3.0]])
+    stakes = np.array([[100, np.nan, np.nan], [100, np.nan, np.nan]])
+    result = solve_legs_batch(odds, stakes)
+    assert solve_legs([2.0, 0, 3.0], [100, None, None]).status == STATUS_NOT_ENOUGH
+    assert result.status.tolist() == [STATUS_NOT_ENOUGH, STATUS_OK]
+    assert result.stakes[1].tolist()[::2] == [100, 66]
+
+
+def test_overflow_is_error():
+    odds, stakes = np.array([[1e300, 1e-300]]), np.array([[1e300, np.nan]])
+    assert_matches_scalar(odds, stakes)
+    assert solve_legs_batch(odds, stakes).status[0] == STATUS_ERROR
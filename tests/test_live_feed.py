@@ -0,0 +1,104 @@
+"""实时推送：命名管道在写入方连上之前、断开之后都不算关闭；界面计算后把当前这组登记进 HedgeBook"""
+
+import os
+import select
+
+import pytest
+
+from live_feed import FeedPublisher, FeedSubscriber, HedgeBook
+
+
+def write_fifo(path, data):
+    fd = os.open(path, os.O_WRONLY)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+def test_fifo_before_and_between_writers(tmp_path):
+    path = str(tmp_path / 'feed')
+    os.mkfifo(path)
+    book = HedgeBook()
+    subscriber = FeedSubscriber(path, book)
+    try:
+        assert subscriber.poll() == 0  # 还没有写入方
+        write_fifo(path, b'A,1.95\nB,2.05\n')
+        assert subscriber.poll() == 2
+        assert subscriber.poll() == 0  # 写入方断开
+        write_fifo(path, b'A,1.90\n')
+        assert subscriber.poll() == 1
+        assert book.prices == {'A': 1.90, 'B': 2.05}
+    finally:
+        subscriber.close()
+
+
+def test_bad_bytes_are_skipped(tmp_path):
+    path = str(tmp_path / 'feed.sock')
+    publisher = FeedPublisher(path)
+    book = HedgeBook()
+    subscriber = FeedSubscriber(path, book)
+    try:
+        publisher.accept(1, timeout=5)
+        publisher.send(b'A,1.95\n\xff\xfe,2.00\nB,x\nB,2.05\n')
+        assert select.select([subscriber.fileno()], [], [], 5)[0]
+        assert subscriber.poll() == 2
+        assert subscriber.malformed == 2
+        assert book.prices == {'A': 1.95, 'B': 2.05}
+    finally:
+        subscriber.close()
+        publisher.close()
+
+
+def test_add_pair_replaces_same_id():
+    book = HedgeBook()
+    book.update('A', 1.95)
+    book.update('B', 2.05)
+    book.add_pair('p', 'A', 'B', 1000)
+    pair = book.add_pair('p', 'A', 'B', 2000)
+    assert book.deps == {'A': [pair], 'B': [pair]}
+    assert book.update('A', 1.90) == 1
+    assert pair.stake_b == 1853
+    book.remove_pair('p')
+    assert book.pairs == {} and book.deps == {}
+
+
+@pytest.fixture
+def app():
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+def test_calculate_registers_current_pair(app, tmp_path):
+    import calculator
+    from history import History
+
+    path = str(tmp_path / 'feed.sock')
+    publisher = FeedPublisher(path)
+    window = calculator.FloatingCalculator(history=History())
+    try:
+        window.attach_feed(path, 'A', 'B')
+        publisher.accept(1, timeout=5)
+        for field, text in zip(calculator.FIELDS, ('1.95', '1000', '2.05', '')):
+            getattr(window, field + '_entry').setText(text)
+        window.calculate()
+        pair = window.feed.book.pairs[calculator.FEED_PAIR]
+        assert (pair.table_a, pair.table_b, pair.stake_a) == ('A', 'B', 1000)
+        assert window.feed.book.deps == {'A': [pair], 'B': [pair]}
+
+        publisher.send(b'B,2.10\n')
+        assert select.select([window.feed.fileno()], [], [], 5)[0]
+        assert window.feed.poll() == 1
+        assert window.people2_entry.text() == str(pair.stake_b)
+
+        # 控件树释放期间B台金额直接取组合重算的结果
+        window.release_widgets()
+        publisher.send(b'A,2.00\n')
+        assert select.select([window.feed.fileno()], [], [], 5)[0]
+        assert window.feed.poll() == 1
+        assert window.released_state.fields()[calculator.PEOPLE2] == str(pair.stake_b) == '952'
+    finally:
+        window.feed.close()
+        window.close()
+        publisher.close()
@@ -0,0 +1,125 @@
+"""取整求解：batch.round_pairs_batch 与逐行的 rounding.round_pair 一致，_best_pair 与暴力枚举一致，边界情况手算核对"""
+
+import itertools
+import math
+import random
+
+import numpy as np
+import pytest
+
+from batch import SOLVED_NONE, SOLVED_PEOPLE1, SOLVED_PEOPLE2, SOLVED_STAKES, round_pairs_batch
+from rounding import DEFAULT_RULE, StakeRule, _best_pair, round_pair
+from solver import PEOPLE1, PEOPLE2, STATUS_ERROR, STATUS_NOT_ENOUGH, STATUS_NOTHING_TO_DO, STATUS_OK
+
+SOLVED_CODES = {(): SOLVED_NONE, (PEOPLE1,): SOLVED_PEOPLE1, (PEOPLE2,): SOLVED_PEOPLE2,
+                (PEOPLE1, PEOPLE2): SOLVED_STAKES}
+
+RULES = [
+    (DEFAULT_RULE, DEFAULT_RULE),
+    (StakeRule(10, 50, 5000), StakeRule(100, 1000)),
+    (StakeRule(7, 100, 160), StakeRule(3, 90, 120)),     # 区间很窄，两边待定时走窗口搜索
+    (StakeRule(50, 200, 100), DEFAULT_RULE),             # A台最低高于最高，没有合法金额
+]
+
+
+def random_rows(n, seed):
+    rng = np.random.default_rng(seed)
+    prob1 = rng.uniform(1.01, 10.0, n).round(2)
+    prob2 = rng.uniform(1.01, 10.0, n).round(2)
+    people1 = rng.integers(1, 20000, n).astype(np.float64)
+    people2 = rng.integers(1, 20000, n).astype(np.float64)
+    blank = rng.integers(0, 4, n)  # 0：A台金额待求，1：B台，2：两边，3：都已知
+    people1[(blank == 0) | (blank == 2)] = np.nan
+    people2[(blank == 1) | (blank == 2)] = np.nan
+    prob2[rng.random(n) < 0.02] = np.nan
+    return prob1, people1, prob2, people2
+
+
+def scalar(value, is_float):
+    if math.isnan(value):
+        return None
+    return value if is_float else int(value)
+
+
+@pytest.mark.parametrize('rules', RULES)
+def test_round_pairs_batch_matches_round_pair(rules):
+    columns = random_rows(5000, 11)
+    result = round_pairs_batch(*columns, *rules)
+    for i, row in enumerate(zip(*(column.tolist() for column in columns))):
+        expected = round_pair(*(scalar(v, j % 2 == 0) for j, v in enumerate(row)), *rules)
+        assert result.status[i] == expected.status, (row, expected)
+        if expected.status in (STATUS_OK, STATUS_NOTHING_TO_DO):
+            assert result.solved[i] == SOLVED_CODES[expected.solved], (row, expected)
+            assert (result.people1[i], result.people2[i]) == (expected.people1, expected.people2), (row, expected)
+            assert result.imbalance[i] == expected.imbalance, (row, expected)
+        else:
+            assert math.isnan(result.imbalance[i])
+
+
+def brute_best_pair(a, b, bounds1, bounds2):
+    pairs = itertools.product(range(bounds1[0], bounds1[1] + 1), range(bounds2[0], bounds2[1] + 1))
+    return min(pairs, key=lambda pair: (abs(a * pair[0] - b * pair[1]), pair[0], pair[1]))
+
+
+def test_best_pair_matches_brute_force():
+    rng = random.Random(5)
+    for _ in range(3000):
+        a, b = rng.randint(101, 1000) * rng.choice((1, 10, 7)), rng.randint(101, 1000) * rng.choice((1, 10, 3))
+        lo1, lo2 = rng.randint(1, 60), rng.randint(1, 60)
+        bounds1, bounds2 = (lo1, lo1 + rng.randint(0, 40)), (lo2, lo2 + rng.randint(0, 40))
+        assert _best_pair(a, b, bounds1, bounds2) == brute_best_pair(a, b, bounds1, bounds2), (a, b, bounds1, bounds2)
+
+
+def both(*args, rules=(DEFAULT_RULE, DEFAULT_RULE)):
+    """逐行和批量各算一次，确认一致后返回逐行的结果"""
+    expected = round_pair(*args, *rules)
+    batch = round_pairs_batch(*([np.nan if v is None else v] for v in args), *rules)
+    assert batch.status[0] == expected.status
+    if expected.ok:
+        assert (batch.people1[0], batch.people2[0], batch.imbalance[0]) == \
+            (expected.people1, expected.people2, expected.imbalance)
+    return expected
+
+
+def test_minimum_above_maximum():
+    rule = StakeRule(10, minimum=200, maximum=150)
+    assert rule.multiples() is None
+    assert both(1.95, 1000, 2.05, None, rules=(DEFAULT_RULE, rule)).status == STATUS_ERROR
+    assert both(1.95, None, 2.05, None, rules=(rule, DEFAULT_RULE)).status == STATUS_ERROR
+
+
+def test_no_legal_stake():
+    # 单位比最高金额还大，连一个单位都下不了
+    rule = StakeRule(500, maximum=300)
+    assert rule.multiples() is None
+    assert both(1.95, None, 2.05, 800, rules=(rule, DEFAULT_RULE)).status == STATUS_ERROR
+
+
+def test_one_side_nearest_multiple():
+    # 195000 / 2050 = 95.1 个单位，取 95 -> 950，派彩差 (195000 - 194750) / 100
+    result = both(1.95, 1000, 2.05, None, rules=(DEFAULT_RULE, StakeRule(10)))
+    assert (result.people2, result.imbalance, result.solved) == (950, 2.5, (PEOPLE2,))
+    # 正好在两个倍数中间（1.5 个单位）取较小的
+    assert both(2.00, 15, 1.00, None, rules=(DEFAULT_RULE, StakeRule(20))).people2 == 20
+    # 超过最高金额时取最高，低于最低时取最低
+    assert both(1.95, 100000, 2.05, None, rules=(DEFAULT_RULE, StakeRule(10, maximum=5000))).people2 == 5000
+    assert both(1.95, 10, 2.05, None, rules=(DEFAULT_RULE, StakeRule(10, minimum=100))).people2 == 100
+
+
+def test_both_sides_solved():
+    # 2.00*3 = 3.00*2，派彩差为 0 的最小组合
+    result = both(2.00, None, 3.00, None)
+    assert (result.people1, result.people2, result.imbalance) == (3, 2, 0)
+    assert result.solved == (PEOPLE1, PEOPLE2)
+    # 单位 10、最低 100：k1 是 3 的倍数且 k2 = 2*k1/3 >= 10，最小为 (15, 10)
+    rule = StakeRule(10, minimum=100)
+    assert both(2.00, None, 3.00, None, rules=(rule, rule)).as_tuple()[1:5] == (150, 3.00, 100, 0)
+    # 区间 [5, 6] 内凑不出派彩差为 0：(5,5) 差 -0.5、(6,6) 差 -0.6、(6,5) 差 1.45、(5,6) 差 -2.55
+    rule = StakeRule(1, minimum=5, maximum=6)
+    result = both(1.95, None, 2.05, None, rules=(rule, rule))
+    assert (result.people1, result.people2, result.imbalance) == (5, 5, -0.5)
+
+
+def test_not_enough():
+    assert both(1.95, 1000, None, None).status == STATUS_NOT_ENOUGH
+    assert both(1.95, 1000, 2.05, 951).status == STATUS_NOTHING_TO_DO
@@ -0,0 +1,35 @@
+"""同一个请求单独发送（逐条求解）和混在大批次里（solve_batch）必须得到相同的响应"""
+
+import json
+import math
+
+from solver_service import BATCH_THRESHOLD, solve_requests
+from test_batch import random_rows
+
+
+def make_items(n, seed):
+    items = []
+    for i, row in enumerate(zip(*(column.tolist() for column in random_rows(n, seed)))):
+        numbers = [None if math.isnan(v) else v for v in row]
+        numbers[1] = None if numbers[1] is None else int(numbers[1])
+        numbers[3] = None if numbers[3] is None else int(numbers[3])
+        items.append(({'id': i}, numbers))
+    return items
+
+
+def test_batched_responses_match_single_requests():
+    items = make_items(200000, 11)
+    assert len(items) >= BATCH_THRESHOLD
+    batched = solve_requests(items)
+    single = [solve_requests([item])[0] for item in items]
+    for got, expected in zip(batched, single):
+        assert json.loads(got) == json.loads(expected)
+
+
+def test_reported_row_does_not_depend_on_batch_size():
+    item = ({'id': 1}, [1.23, 84036, None, 46248])
+    alone = json.loads(solve_requests([item])[0])
+    filler = [({'id': 0}, [1.95, 1000, 2.05, None])] * (BATCH_THRESHOLD * 2)
+    batched = json.loads(solve_requests(filler + [item])[-1])
+    assert alone == batched
+    assert alone['prob2'] == 2.23
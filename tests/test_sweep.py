@@ -0,0 +1,24 @@
+"""敏感度网格每一格都要与 calculate 用界面上显示的数求出的结果相同"""
+
+import numpy as np
+import pytest
+
+from solver import solve_text
+from sweep_panel import MODE_STAKE, SweepGrid
+
+
+@pytest.mark.parametrize('prob1, odds_range, stake_range', [
+    (1.95, (1.50, 3.00), (100, 5000)),
+    (2.37, (1.01, 10.0), (10, 100000)),
+    (1.23, (2.05, 2.11), (84000, 84100)),
+])
+def test_grid_matches_calculate(prob1, odds_range, stake_range):
+    grid = SweepGrid(160, 120)
+    grid.compute(prob1, odds_range, stake_range, MODE_STAKE)
+    assert grid.values.dtype == np.float64
+    odds = [f"{o:.2f}" for o in grid.odds.tolist()]
+    stakes = [f"{s:.0f}" for s in grid.stakes.tolist()]
+    assert all(float(text) == o for text, o in zip(odds, grid.odds.tolist()))
+    for row, stake in enumerate(stakes):
+        expected = [solve_text(f"{prob1:.2f}", stake, text, '').people2 for text in odds]
+        assert grid.values[row].tolist() == expected, (row, stake)
@@ -0,0 +1,65 @@
+"""托盘模式：空闲释放控件树、释放期间收到推送、重建后输入框和界面状态完整"""
+
+import os
+import select
+
+import pytest
+
+from live_feed import FeedPublisher
+
+
+@pytest.fixture
+def app():
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+def test_release_restore_with_feed_update(app, tmp_path):
+    import calculator
+    from history import History
+    from tray import TrayController
+
+    path = str(tmp_path / 'feed.sock')
+    publisher = FeedPublisher(path)
+    window = calculator.FloatingCalculator(history=History())
+    try:
+        window.attach_feed(path, 'A', 'B')
+        publisher.accept(1, timeout=5)
+        tray = TrayController(window, idle_seconds=3600)
+        window.show()
+        for field, text in zip(calculator.FIELDS, ('1.95', '1000', '2.05', '')):
+            getattr(window, field + '_entry').setText(text)
+        window.calculate()
+        assert window.people2_entry.text() == '951'
+        window.transparency_slider.setValue(80)
+        window.toggle_numpad()
+        window.current_entry = window.people1_entry
+
+        window.hide()
+        assert tray.idle_timer.isActive()
+        tray.release()
+        assert window.released_state is not None
+        assert window.central_widget is None and window.prob1_entry is None and window.numpad_widget is None
+
+        # 释放期间A台赔率变化：只改 CompactState，B台金额取 HedgeBook 重算的结果
+        publisher.send(b'A,2.00\n')
+        assert select.select([window.feed.fileno()], [], [], 5)[0]
+        assert window.feed.poll() == 1
+        state = window.released_state
+        assert state.stale
+        assert state.fields() == {'prob1': '2.00', 'people1': '1000', 'prob2': '2.05', 'people2': '975'}
+
+        tray.restore()
+        assert window.released_state is None and window.isVisible()
+        assert not tray.idle_timer.isActive()
+        assert [getattr(window, field + '_entry').text() for field in calculator.FIELDS] == \
+            ['2.00', '1000', '2.05', '975']
+        assert window.transparency_slider.value() == 80
+        assert window.numpad_visible and window.numpad_widget is not None
+        # 推送时 B 台金额已经求出，重建后四格都有值，不再多记一条历史
+        assert len(window.history) == 1
+    finally:
+        window.feed.close()
+        window.close()
+        publisher.close()
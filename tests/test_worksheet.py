@@ -0,0 +1,110 @@
+"""工作表批量追加（solve_columns / solve_batch）和编辑一格后的逐行重算（solve_row / solve_pair）必须一致；后台导入分批插入"""
+
+import gc
+import math
+import os
+import time
+
+import pytest
+
+from test_batch import random_rows
+from worksheet import WorksheetModel, solve_columns
+
+
+def same(a, b):
+    return a == b or (math.isnan(a) and math.isnan(b))
+
+
+def cell_text(value, is_float):
+    if math.isnan(value):
+        return ''
+    return f"{value:.2f}" if is_float else str(int(value))
+
+
+def test_append_rows_matches_edits():
+    columns = random_rows(20000, 21)
+    batched = WorksheetModel()
+    batched.append_rows(*columns)
+
+    # 同样的数逐格输入，每输入一格 setData 都用 solve_row 重算这一行
+    edited = WorksheetModel()
+    edited.append_empty(len(columns[0]))
+    for column, (values, is_float) in enumerate(zip(columns, (True, False, True, False))):
+        for row, value in enumerate(values.tolist()):
+            edited.setData(edited.index(row, column), cell_text(value, is_float))
+
+    assert batched.solved == edited.solved
+    assert batched.status == edited.status
+    for got, expected in zip(batched.columns, edited.columns):
+        mismatches = [row for row in range(len(got)) if not same(got[row], expected[row])]
+        assert not mismatches, [(row, got[row], expected[row]) for row in mismatches[:5]]
+
+
+def test_reported_row_same_after_edit():
+    # 批量取整与 round(x, 2) 不一致时这一行曾经得到 2.24 和 2.23
+    row = ([1.23], [84036.0], [math.nan], [46248.0])
+    batched = WorksheetModel()
+    batched.append_rows(*row)
+
+    edited = WorksheetModel()
+    edited.append_empty(1)
+    for column, text in enumerate(('1.23', '84036', '', '46248')):
+        edited.setData(edited.index(0, column), text)
+
+    for column in range(len(row)):
+        assert batched.data(batched.index(0, column)) == edited.data(edited.index(0, column))
+    assert edited.columns[2][0] == 2.23
+    columns, _, _ = solve_columns(*row)
+    assert columns[2][0] == 2.23
+
+
+@pytest.fixture
+def app():
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+
+def wait_import(app, window, timeout=30):
+    deadline = time.perf_counter() + timeout
+    while window.is_importing():
+        assert time.perf_counter() < deadline, "import did not finish"
+        app.processEvents()
+        time.sleep(0.001)
+
+
+def test_import_reuses_flush_timer_and_caps_inserts(app, tmp_path, monkeypatch):
+    from worksheet import IMPORT_FLUSH_ROWS, WorksheetWindow
+
+    path = tmp_path / 'odds.csv'
+    rows = 3 * IMPORT_FLUSH_ROWS + 100
+    path.write_text('prob1,people1,prob2,people2\n' + '1.95,1000,2.05,\n' * rows, encoding='utf-8')
+    window = WorksheetWindow()
+    timer = window.flush_timer
+    inserted = []
+    window.model.rowsInserted.connect(lambda parent, first, last: inserted.append(last - first + 1))
+    try:
+        for _ in range(2):
+            window.start_import(str(path))
+            wait_import(app, window)
+            assert window.flush_timer is timer and not timer.isActive()
+            assert window.import_button.isEnabled() and window.import_bar.isHidden()
+        assert window.model.rowCount() == 2 * rows
+        assert max(inserted) <= IMPORT_FLUSH_ROWS
+        assert window.count_label.text() == f"{2 * rows} 组（导入 {rows}，跳过 0）"
+        assert window.model.data(window.model.index(rows - 1, 3)) == '951'
+    finally:
+        window.close()
+
+
+def test_deferred_full_collection_restores_threshold():
+    from importer import IMPORT_GC_THRESHOLD2, deferred_full_collection
+
+    threshold = gc.get_threshold()
+    with pytest.raises(RuntimeError):
+        with deferred_full_collection():
+            with deferred_full_collection():
+                assert gc.get_threshold()[2] == max(threshold[2], IMPORT_GC_THRESHOLD2)
+            assert gc.get_threshold()[2] == max(threshold[2], IMPORT_GC_THRESHOLD2)  # 另一个导入还没结束
+            raise RuntimeError
+    assert gc.isenabled() and gc.get_threshold() == threshold
@@ -0,0 +1,247 @@
+"""
+Description: 界面主题 - 整个程序只有一份样式表，按 objectName / 动态属性选择控件，
+在 QApplication 上设置一次；切换主题只替换这份样式表，不重建控件。
+"""
+
+from string import Template
+
+DEFAULT_THEME = 'light'
+
+LIGHT = {
+    'window': '#f0f0f0',
+    'text': '#000000',
+    'chrome': '#f0f0f0',
+    'chrome_hover': '#e0e0e0',
+    'chrome_text': '#333333',
+    'panel': '#f8f8f8',
+    'entry': 'white',
+    'entry_border': '#dcdcdc',
+    'accent': '#0078d4',
+    'accent_hover': '#106ebe',
+    'danger': '#e81123',
+    'danger_hover': '#c41019',
+    'key': 'white',
+    'key_border': '#dcdcdc',
+    'key_hover': '#f0f0f0',
+    'groove': '#cccccc',
+    'groove_border': '#999999',
+    'toast': 'rgba(0, 0, 0, 0.7)',
+    'toast_text': 'white',
+    'title_size': '16px',
+    'label_size': '14px',
+    'action_size': '24px',
+    'key_size': '20pt',
+    'backspace_size': '18px',
+    'entry_padding': '8px',
+    'radius': '8px',
+    'key_radius': '5px',
+}
+
+DARK = dict(
+    LIGHT,
+    window='#202124',
+    text='#e8eaed',
+    chrome='#202124',
+    chrome_hover='#3c4043',
+    chrome_text='#e8eaed',
+    panel='#2d2e31',
+    entry='#2d2e31',
+    entry_border='#5f6368',
+    key='#2d2e31',
+    key_border='#5f6368',
+    key_hover='#3c4043',
+    groove='#5f6368',
+    groove_border='#80868b',
+    toast='rgba(255, 255, 255, 0.85)',
+    toast_text='#202124',
+)
+
+COMPACT = dict(
+    LIGHT,
+    title_size='13px',
+    label_size='12px',
+    action_size='18px',
+    key_size='15pt',
+    backspace_size='14px',
+    entry_padding='3px',
+    radius='4px',
+    key_radius='3px',
+)
+
+THEMES = {'light': LIGHT, 'dark': DARK, 'compact': COMPACT}
+
+STYLESHEET = Template("""
+#calculator {
+    background-color: $window;
+}
+#calculator QLabel {
+    color: $text;
+    font-family: "Microsoft YaHei";
+    font-weight: bold;
+}
+#title_label {
+    font-size: $title_size;
+}
+#transparency_label {
+    font-size: $label_size;
+}
+
+QPushButton#min_button, QPushButton#close_button {
+    background-color: $chrome;
+    border: none;
+    color: $chrome_text;
+    font-family: "Microsoft YaHei";
+    font-weight: bold;
+    font-size: $title_size;
+}
+QPushButton#min_button:hover {
+    background-color: $chrome_hover;
+}
+QPushButton#close_button:hover {
+    background-color: #e81123;
+    color: white;
+}
+
+MarqueeLabel#ad_label {
+    color: $text;
+    font-family: "Microsoft YaHei";
+    font-size: $label_size;
+    font-weight: bold;
+    background-color: $panel;
+    border-radius: $radius;
+}
+
+QLineEdit {
+    padding: $entry_padding;
+    border: 2px solid $entry_border;
+    border-radius: $radius;
+    background-color: $entry;
+    color: $text;
+    selection-background-color: $accent;
+    selection-color: white;
+}
+QLineEdit:focus {
+    border: 2px solid $accent;
+}
+
+QPushButton#toggle_button {
+    font-family: "Microsoft YaHei";
+    background-color: $chrome;
+    color: $chrome_text;
+    border-radius: $radius;
+    font-weight: bold;
+    font-size: $title_size;
+}
+QPushButton#toggle_button:hover {
+    background-color: $chrome_hover;
+}
+QPushButton#calc_button, QPushButton#clear_button {
+    font-family: "Microsoft YaHei";
+    color: white;
+    border-radius: $radius;
+    font-weight: bold;
+    font-size: $action_size;
+}
+QPushButton#calc_button {
+    background-color: $accent;
+}
+QPushButton#calc_button:hover {
+    background-color: $accent_hover;
+}
+QPushButton#clear_button {
+    background-color: $danger;
+}
+QPushButton#clear_button:hover {
+    background-color: $danger_hover;
+}
+
+QPushButton[numpad="true"] {
+    font-family: "Microsoft YaHei";
+    background-color: $key;
+    color: $text;
+    border: 1px solid $key_border;
+    border-radius: $key_radius;
+    font-weight: bold;
+    font-size: $key_size;
+}
+QPushButton[numpad="true"]:hover {
+    background-color: $key_hover;
+}
+QPushButton#backspace_button {
+    background-color: $accent;
+    color: white;
+    border: 1px solid $accent;
+    font-size: $backspace_size;
+}
+QPushButton#backspace_button:hover {
+    background-color: $accent_hover;
+}
+
+QSlider#transparency_slider::groove:horizontal {
+    border: 1px solid $groove_border;
+    height: 4px;
+    background: $groove;
+    margin: 2px 0;
+    border-radius: 2px;
+}
+QSlider#transparency_slider::handle:horizontal {
+    background: $accent;
+    border: 2px solid $accent;
+    width: 16px;
+    height: 16px;
+    margin: -8px 0;
+    border-radius: 10px;
+}
+QSlider#transparency_slider::handle:horizontal:hover {
+    background: $accent_hover;
+    border: 2px solid $accent_hover;
+}
+QSlider#transparency_slider::sub-page:horizontal {
+    background: $groove;
+    border-radius: 2px;
+}
+
+QLabel#toast {
+    background-color: $toast;
+    color: $toast_text;
+    padding: 8px 12px;
+    border-radius: 4px;
+    font-size: 12px;
+}
+
+QLabel#latency_overlay {
+    background-color: $toast;
+    color: $toast_text;
+    padding: 4px 6px;
+    border-radius: 4px;
+    font-family: monospace;
+    font-size: 10px;
+    font-weight: normal;
+}
+""")
+
+_compiled = {}
+
+
+def stylesheet(name=DEFAULT_THEME):
+    """生成主题样式表，同名主题只生成一次"""
+    if name not in THEMES:
+        raise ValueError(f"未知主题: {name}，可选 {', '.join(THEMES)}")
+    if name not in _compiled:
+        _compiled[name] = STYLESHEET.substitute(THEMES[name])
+    return _compiled[name]
+
+
+def apply_theme(app, name=DEFAULT_THEME):
+    """在应用程序级设置样式表，已有控件由 Qt 重新 polish，无需重建"""
+    app.setStyleSheet(stylesheet(name))
+    app.setProperty('theme', name)
+
+
+def current_theme(app):
+    return app.property('theme') or DEFAULT_THEME
+
+
+def next_theme(name):
+    names = list(THEMES)
+    return names[(names.index(name) + 1) % len(names)]
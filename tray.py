@@ -0,0 +1,123 @@
+"""
+Description: 托盘模式 - 窗口隐藏或最小化超过 idle_seconds 后拆掉整个控件树（小键盘、滚动广告、滑块、输入框等），
+只把四个数值和设置留在 CompactState 里；点击托盘图标或再次以 --resident 启动（可绑定为系统快捷键）时重建。
+Qt 没有跨平台的全局快捷键接口，快捷键交给系统去执行 calculator.py --resident。
+"""
+
+from PyQt5 import sip
+from PyQt5.QtCore import QEvent, QObject, Qt, QTimer
+from PyQt5.QtWidgets import QApplication, QMenu, QStyle, QSystemTrayIcon
+
+from solver import FIELDS
+
+DEFAULT_IDLE_SECONDS = 60
+
+
+class CompactState:
+    """控件树释放期间的全部界面状态；values 为四个输入框的文字，stale 表示释放期间数值有变化、重建后要重新计算"""
+
+    __slots__ = ('values', 'current_field', 'opacity', 'numpad_visible', 'stale')
+
+    def __init__(self, values, current_field=None, opacity=100, numpad_visible=False):
+        self.values = values
+        self.current_field = current_field
+        self.opacity = opacity
+        self.numpad_visible = numpad_visible
+        self.stale = False
+
+    @classmethod
+    def capture(cls, window):
+        current = next((field for field in FIELDS if getattr(window, field + '_entry') is window.current_entry), None)
+        return cls([getattr(window, field + '_entry').text() for field in FIELDS], current,
+                   window.transparency_slider.value(), window.numpad_visible)
+
+    def set(self, field, text):
+        self.values[FIELDS.index(field)] = text
+        self.stale = True
+
+    def fields(self):
+        return dict(zip(FIELDS, self.values))
+
+    def apply(self, window):
+        """写回重建好的窗口"""
+        for field, text in zip(FIELDS, self.values):
+            getattr(window, field + '_entry').setText(text)
+        window.transparency_slider.setValue(self.opacity)
+        window.setWindowOpacity(self.opacity / 100)  # 原生窗口重新创建过，滑块值没变时不会触发 valueChanged
+        if self.numpad_visible != window.numpad_visible:
+            window.toggle_numpad()
+        if self.current_field:
+            window.current_entry = getattr(window, self.current_field + '_entry')
+        if self.stale:
+            window.calculate()
+
+
+class TrayController(QObject):
+    """
+    托盘图标和空闲释放。窗口隐藏或最小化时开始计时，超时仍未显示就调用 window.release_widgets()；
+    系统没有托盘时（例如 offscreen 平台）不显示图标，空闲释放照常进行。
+    """
+
+    def __init__(self, window, idle_seconds=DEFAULT_IDLE_SECONDS):
+        super().__init__(window)
+        self.window = window
+        self.idle_timer = QTimer(self)
+        self.idle_timer.setSingleShot(True)
+        self.idle_timer.setTimerType(Qt.VeryCoarseTimer)
+        self.idle_timer.setInterval(int(idle_seconds * 1000))
+        self.idle_timer.timeout.connect(self.release)
+        self.icon = None
+        self.menu = None
+        if QSystemTrayIcon.isSystemTrayAvailable():
+            self._create_icon()
+        window.installEventFilter(self)
+
+    def _create_icon(self):
+        icon = self.window.windowIcon()
+        if icon.isNull():
+            icon = QApplication.style().standardIcon(QStyle.SP_ComputerIcon)
+        self.icon = QSystemTrayIcon(icon, self)
+        self.icon.setToolTip(self.window.windowTitle())
+        self.menu = QMenu()
+        self.menu.addAction("显示", self.restore)
+        self.menu.addAction("退出", self.quit)
+        self.icon.setContextMenu(self.menu)
+        self.icon.activated.connect(self._activated)
+        self.icon.show()
+
+    @property
+    def available(self):
+        return self.icon is not None
+
+    def idle(self):
+        return not self.window.isVisible() or self.window.isMinimized()
+
+    def eventFilter(self, obj, event):
+        if sip.isdeleted(self.window):  # 退出时窗口析构过程中仍会收到隐藏事件
+            return False
+        if event.type() in (QEvent.Hide, QEvent.Show, QEvent.WindowStateChange):
+            if self.idle():
+                if not self.idle_timer.isActive():
+                    self.idle_timer.start()
+            else:
+                self.idle_timer.stop()
+        return False
+
+    def release(self):
+        if self.idle():
+            self.window.release_widgets()
+
+    def restore(self):
+        self.window.bring_to_front()
+
+    def _activated(self, reason):
+        if reason not in (QSystemTrayIcon.Trigger, QSystemTrayIcon.DoubleClick):
+            return
+        if self.idle():
+            self.restore()
+        else:
+            self.window.hide()
+
+    def quit(self):
+        self.window.quitting = True
+        QApplication.quit()
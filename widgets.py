@@ -0,0 +1,386 @@
+"""
+Description: 自绘界面组件
+"""
+
+from collections import deque
+
+from PyQt5.QtCore import (QElapsedTimer, QEvent, QPointF, QPropertyAnimation, QRectF, QSize, Qt, QTimer,
+                          pyqtSignal)
+from PyQt5.QtGui import QPainter, QPalette, QPixmap
+from PyQt5.QtWidgets import QGraphicsOpacityEffect, QLabel, QStyle, QStyleOption, QWidget
+
+import latency
+
+
+class MarqueeLabel(QWidget):
+    """
+    滚动文字条：文字只渲染一次到缓存位图，之后每帧按时间平移绘制，
+    不调用 setText、不触发重新布局，支持亚像素平滑滚动。
+    所在窗口隐藏、最小化、被完全遮挡或全透明时自动停止计时器，不再唤醒 CPU。
+    默认每 33ms 一帧（约 30 帧/秒），按默认速度每帧平移约 1 像素；帧率越高可见时的 CPU 开销越大。
+    """
+
+    def __init__(self, text='', parent=None, speed=30.0, interval=33):
+        super().__init__(parent)
+        self._text = text
+        self._speed = speed          # 每秒滚动的像素数
+        self._pixmap = None
+        self._background = None
+        self._offset = 0.0
+        self._base_offset = 0.0
+        self._clock = QElapsedTimer()
+        self._watched = None
+        self.ticks = 0               # 计时器唤醒次数，便于测量
+
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.CoarseTimer)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self.scroll_text)
+        self.setAttribute(Qt.WA_OpaquePaintEvent, False)
+
+    def text(self):
+        return self._text
+
+    def setText(self, text):
+        self._text = text
+        self._pixmap = None
+        self.update()
+
+    def sizeHint(self):
+        margins = self.contentsMargins()
+        return QSize(self.fontMetrics().horizontalAdvance(self._text) + margins.left() + margins.right(),
+                     self.fontMetrics().height() + margins.top() + margins.bottom())
+
+    def minimumSizeHint(self):
+        return QSize(0, self.sizeHint().height())
+
+    def is_running(self):
+        return self._timer.isActive()
+
+    # ---- 缓存位图 ----
+
+    def _text_pixmap(self):
+        """文字渲染到透明位图并缓存，文字或字体变化时重建"""
+        if self._pixmap is None:
+            ratio = self.devicePixelRatioF()
+            metrics = self.fontMetrics()
+            # 文字首尾相接循环，间隔由文字末尾的空格决定
+            width = metrics.horizontalAdvance(self._text)
+            pixmap = QPixmap(max(1, int(width * ratio)), max(1, int(metrics.height() * ratio)))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            painter.setFont(self.font())
+            painter.setPen(self.palette().color(self.foregroundRole()))
+            painter.drawText(0, metrics.ascent(), self._text)
+            painter.end()
+            self._pixmap = pixmap
+        return self._pixmap
+
+    def _background_pixmap(self):
+        """样式表背景（圆角、底色）每帧都一样，画一次后缓存，尺寸或样式变化时重建"""
+        if self._background is None or self._background.size() != self.size() * self._background.devicePixelRatio():
+            ratio = self.devicePixelRatioF()
+            pixmap = QPixmap(self.size() * ratio)
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.transparent)
+            painter = QPainter(pixmap)
+            option = QStyleOption()
+            option.initFrom(self)
+            self.style().drawPrimitive(QStyle.PE_Widget, option, painter, self)
+            painter.end()
+            self._background = pixmap
+        return self._background
+
+    def changeEvent(self, event):
+        if event.type() in (QEvent.FontChange, QEvent.PaletteChange, QEvent.StyleChange):
+            self._pixmap = None
+            self._background = None
+        super().changeEvent(event)
+
+    # ---- 滚动 ----
+
+    @latency.timed('scroll_text')
+    def scroll_text(self):
+        """计时器回调：按经过的时间计算偏移，只重绘本控件"""
+        self.ticks += 1
+        pixmap = self._text_pixmap()
+        cycle = pixmap.width() / pixmap.devicePixelRatio()
+        self._offset = (self._base_offset + self._clock.elapsed() * self._speed / 1000.0) % cycle
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self._background_pixmap())
+
+        pixmap = self._text_pixmap()
+        rect = self.contentsRect()
+        cycle = pixmap.width() / pixmap.devicePixelRatio()
+        y = rect.top() + (rect.height() - pixmap.height() / pixmap.devicePixelRatio()) / 2
+        painter.setClipRect(rect)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        x = rect.left() - self._offset
+        while x < rect.right():
+            painter.drawPixmap(QPointF(x, y), pixmap)
+            x += cycle
+
+    # ---- 自动暂停 ----
+
+    def _should_run(self):
+        window = self.window()
+        handle = window.windowHandle()
+        return (self.isVisible() and not window.isMinimized()
+                and window.windowOpacity() > 0
+                and (handle is None or handle.isExposed()))
+
+    def _update_running(self):
+        if self._should_run():
+            if not self._timer.isActive():
+                self._clock.start()
+                self._timer.start()
+        elif self._timer.isActive():
+            # 记下当前位置，恢复后从这里接着滚动
+            self._base_offset = self._offset
+            self._timer.stop()
+
+    def _watch_window(self):
+        """监听顶层窗口的最小化和曝光变化"""
+        handle = self.window().windowHandle()
+        if handle is not None and handle is not self._watched:
+            if self._watched is not None:
+                self._watched.removeEventFilter(self)
+            handle.installEventFilter(self)
+            self._watched = handle
+        self.window().installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() in (QEvent.Expose, QEvent.WindowStateChange, QEvent.Show, QEvent.Hide):
+            # 状态变化事件处理完后再判断
+            QTimer.singleShot(0, self._update_running)
+        return False
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._watch_window()
+        self._update_running()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._update_running()
+
+
+class Toast(QLabel):
+    """
+    居中淡入淡出的提示浮层，整个窗口只创建一个，反复显示时原地重新计时。
+    显示中再来同样的消息只延长显示时间并累计次数；不同的消息排队，当前消息结束后依次显示。
+    样式见 themes.py 的 #toast。
+    """
+
+    FADE_IN = 120
+    FADE_OUT = 200
+
+    def __init__(self, parent, duration=1000, max_queue=8):
+        super().__init__(parent)
+        self.setObjectName("toast")
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.hide()
+        self.duration = duration
+        self.queue = deque(maxlen=max_queue)
+        self.message = None
+        self.repeats = 0
+
+        self._effect = QGraphicsOpacityEffect(self)
+        self._effect.setOpacity(0.0)
+        self.setGraphicsEffect(self._effect)
+        self._fade = QPropertyAnimation(self._effect, b"opacity", self)
+        self._fade.finished.connect(self._fade_finished)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._fade_out)
+
+    def show_message(self, message):
+        if message == self.message:
+            # 重复消息：不排队，原地延长并显示次数
+            self.repeats += 1
+            self._set_text(f"{message} ×{self.repeats}" if self.repeats > 1 else message)
+            if self._fade.endValue() == 0.0:
+                self._fade_in()
+            self._timer.start(self.duration)
+        elif self.message is None:
+            self._start(message)
+        elif message not in self.queue:
+            self.queue.append(message)
+
+    def _start(self, message):
+        self.message = message
+        self.repeats = 1
+        self._set_text(message)
+        self.show()
+        self.raise_()
+        self._fade_in()
+        self._timer.start(self.duration)
+
+    def _set_text(self, text):
+        if text != self.text():
+            self.setText(text)
+            self.adjustSize()
+        parent = self.parentWidget()
+        self.move((parent.width() - self.width()) // 2, (parent.height() - self.height()) // 2)
+
+    def _fade_in(self):
+        self._animate(1.0, self.FADE_IN)
+
+    def _fade_out(self):
+        self._animate(0.0, self.FADE_OUT)
+
+    def _animate(self, end, duration):
+        self._fade.stop()
+        self._fade.setStartValue(self._effect.opacity())
+        self._fade.setEndValue(end)
+        self._fade.setDuration(duration)
+        self._fade.start()
+
+    def _fade_finished(self):
+        if self._fade.endValue() != 0.0:
+            return
+        self.hide()
+        self.message = None
+        if self.queue:
+            self._start(self.queue.popleft())
+
+
+class RangeSlider(QWidget):
+    """
+    双手柄区间滑块：拖动时持续发出 rangeChanged(low, high)，两个手柄不会交叉。
+    点击轨道时移动离得近的那个手柄。
+    """
+
+    rangeChanged = pyqtSignal(int, int)
+
+    HANDLE = 14  # 手柄直径，像素
+
+    def __init__(self, minimum=0, maximum=100, parent=None):
+        super().__init__(parent)
+        self._minimum = minimum
+        self._maximum = maximum
+        self._low = minimum
+        self._high = maximum
+        self._dragging = None  # 0 为低端手柄，1 为高端手柄
+        self.setFocusPolicy(Qt.StrongFocus)
+
+    def sizeHint(self):
+        return QSize(200, self.HANDLE + 8)
+
+    def minimumSizeHint(self):
+        return QSize(self.HANDLE * 4, self.HANDLE + 8)
+
+    def setRange(self, minimum, maximum):
+        self._minimum, self._maximum = minimum, max(minimum, maximum)
+        self.setValues(self._low, self._high)
+
+    def values(self):
+        return self._low, self._high
+
+    def setValues(self, low, high):
+        low = min(max(low, self._minimum), self._maximum)
+        high = min(max(high, low), self._maximum)
+        if (low, high) == (self._low, self._high):
+            return
+        self._low, self._high = low, high
+        self.update()
+        self.rangeChanged.emit(low, high)
+
+    # ---- 坐标换算 ----
+
+    def _span(self):
+        return max(1, self.width() - self.HANDLE)
+
+    def _position(self, value):
+        extent = max(1, self._maximum - self._minimum)
+        return self.HANDLE / 2 + (value - self._minimum) * self._span() / extent
+
+    def _value_at(self, x):
+        extent = self._maximum - self._minimum
+        ratio = min(max((x - self.HANDLE / 2) / self._span(), 0.0), 1.0)
+        return self._minimum + round(ratio * extent)
+
+    # ---- 绘制与交互 ----
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        palette = self.palette()
+        middle = self.height() / 2
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(palette.color(QPalette.Mid))
+        painter.drawRoundedRect(QRectF(self.HANDLE / 2, middle - 2, self._span(), 4), 2, 2)
+        low, high = self._position(self._low), self._position(self._high)
+        painter.setBrush(palette.color(QPalette.Highlight))
+        painter.drawRect(QRectF(low, middle - 2, high - low, 4))
+        painter.setPen(palette.color(QPalette.Highlight))
+        painter.setBrush(palette.color(QPalette.Base))
+        radius = self.HANDLE / 2 - 1
+        for x in (low, high):
+            painter.drawEllipse(QPointF(x, middle), radius, radius)
+
+    def mousePressEvent(self, event):
+        if event.button() != Qt.LeftButton:
+            return super().mousePressEvent(event)
+        x = event.pos().x()
+        low, high = self._position(self._low), self._position(self._high)
+        # 两个手柄重合时往哪边拖就动哪个，先按点击位置选一个
+        self._dragging = 0 if abs(x - low) < abs(x - high) or (low == high and x < low) else 1
+        self._move_to(x)
+
+    def mouseMoveEvent(self, event):
+        if self._dragging is not None:
+            self._move_to(event.pos().x())
+
+    def mouseReleaseEvent(self, event):
+        self._dragging = None
+
+    def _move_to(self, x):
+        value = self._value_at(x)
+        if self._dragging == 0:
+            self.setValues(min(value, self._high), self._high)
+        else:
+            self.setValues(self._low, max(value, self._low))
+
+
+class LatencyOverlay(QLabel):
+    """
+    延迟统计浮层：盖在窗口左上角，显示各指标最近样本的 p50/p95/p99/max（毫秒）。
+    只在显示时每隔 interval 毫秒刷新，隐藏后计时器停止。
+    """
+
+    def __init__(self, parent, interval=500):
+        super().__init__(parent)
+        self.setObjectName("latency_overlay")
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setTextFormat(Qt.PlainText)
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self.refresh)
+        self.hide()
+
+    def refresh(self):
+        recorder = latency.recorder()
+        lines = [f"{'':<18}{'n':>6}{'p50':>7}{'p95':>7}{'p99':>7}{'max':>7}"]
+        for name, stats in (recorder.summary() if recorder else {}).items():
+            if stats['count']:
+                lines.append(f"{name:<18}{stats['count']:>6}{stats['p50_ms']:>7.2f}{stats['p95_ms']:>7.2f}"
+                             f"{stats['p99_ms']:>7.2f}{stats['max_ms']:>7.2f}")
+        self.setText('\n'.join(lines))
+        self.adjustSize()
+        self.move(4, 4)
+        self.raise_()
+
+    def showEvent(self, event):
+        self.refresh()
+        self._timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self._timer.stop()
+        super().hideEvent(event)
@@ -0,0 +1,409 @@
+"""
+Description: 多组对冲工作表 - QTableView + 列式存储的表格模型，每行一组 A台/B台，
+求解规则与主界面的 calculate 相同（满三算一）。视图只向模型要可见的几十行，
+编辑一格只重算这一行，并只对变化的格子发出 dataChanged。
+
+每行记住上次求出的是哪一格：之后修改其它格时重新求这一格；直接改这一格则它变为已知值。
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+
+from PyQt5.QtCore import QAbstractTableModel, QEvent, QModelIndex, Qt, QThread, QTimer
+from PyQt5.QtGui import QBrush, QColor
+from PyQt5.QtWidgets import (QApplication, QFileDialog, QHBoxLayout, QHeaderView, QLabel, QProgressBar,
+                             QPushButton, QTableView, QVBoxLayout, QWidget)
+
+from solver import (FIELDS, PROB1, PROB2, STATUS_NAMES, STATUS_NOT_ENOUGH, STATUS_OK,
+                    parse_value, solve_pair)
+
+try:
+    import numpy as np
+    from batch import solve_batch
+except ImportError:  # 没有 numpy 时批量追加也逐行求解
+    np = None
+
+HEADERS = ('A台赔率', 'A台金额', 'B台赔率', 'B台金额', '状态')
+STATUS_COLUMN = len(FIELDS)
+_IS_FLOAT = tuple(field in (PROB1, PROB2) for field in FIELDS)
+NAN = math.nan
+_DATA_ROLES = frozenset((Qt.DisplayRole, Qt.EditRole, Qt.ForegroundRole, Qt.TextAlignmentRole))
+IMPORT_FLUSH_INTERVAL = 100  # 导入时每隔多少毫秒把收到的块插入表格，毫秒
+IMPORT_FLUSH_ROWS = 16384  # 每次最多插入的行数，其余留到下一次，一次插入不超过一帧
+IMPORT_DRAIN_INTERVAL = 16  # 工作线程结束后插入剩余块的间隔，毫秒
+IMPORT_PAUSE_MAX = 50  # 插入后暂停读取直到视图重绘完，最多暂停多少毫秒
+
+
+def _input(value, is_float):
+    """列中的 NaN 转为 solve_pair 的 None，金额转为整数"""
+    if value != value:
+        return None
+    return value if is_float else int(value)
+
+
+def _runs(columns):
+    """把变化的列号合并成连续区间，减少 dataChanged 次数又不扩大范围"""
+    runs = []
+    for column in sorted(columns):
+        if runs and runs[-1][1] == column - 1:
+            runs[-1][1] = column
+        else:
+            runs.append([column, column])
+    return runs
+
+
+class WorksheetModel(QAbstractTableModel):
+    """四个 float64 列（未知为 NaN）加 solved / status 两个 int8 列，都是 array，不为每行建对象"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.columns = [array('d') for _ in FIELDS]
+        self.solved = array('b')
+        self.status = array('b')
+        self._solved_brush = QBrush(QColor('#0078d4'))
+
+    # ---- 存取 ----
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.status)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def row_values(self, row):
+        return tuple(_input(column[row], is_float) for column, is_float in zip(self.columns, _IS_FLOAT))
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return section + 1
+
+    def data(self, index, role=Qt.DisplayRole):
+        # 视图每格要问七八种角色，用不到的先返回，少调几次 index 的方法，导入时重绘更快
+        if role not in _DATA_ROLES or not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            if column == STATUS_COLUMN:
+                # 求解成功和还没填满三格的行不显示状态，只提示四格都填了或出错的行
+                status = self.status[row]
+                return '' if status in (STATUS_OK, STATUS_NOT_ENOUGH) else STATUS_NAMES[status]
+            value = self.columns[column][row]
+            if value != value:
+                return ''
+            return f"{value:.2f}" if _IS_FLOAT[column] else str(int(value))
+        if role == Qt.ForegroundRole and column == self.solved[row]:
+            return self._solved_brush
+        if role == Qt.TextAlignmentRole and column != STATUS_COLUMN:
+            return Qt.AlignRight | Qt.AlignVCenter
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.isValid() and index.column() != STATUS_COLUMN:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    # ---- 编辑 ----
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid() or index.column() == STATUS_COLUMN:
+            return False
+        row, column = index.row(), index.column()
+        text = str(value).strip()
+        number = parse_value(text, _IS_FLOAT[column])
+        if number is None and text:
+            return False
+        # 0 与空一样是未知，和批量追加一样存为 NaN
+        self.columns[column][row] = float(number) if number else NAN
+        if self.solved[row] == column:
+            # 直接改了求出来的那一格，它变为已知值
+            self.solved[row] = -1
+        changed = self.solve_row(row)
+        changed.add(column)
+        for first, last in _runs(changed):
+            self.dataChanged.emit(self.index(row, first), self.index(row, last))
+        return True
+
+    def solve_row(self, row):
+        """重算一行，返回值发生变化的列号集合（含状态列）"""
+        before = [column[row] for column in self.columns]
+        derived = self.solved[row]
+        if derived >= 0:
+            self.columns[derived][row] = NAN
+        result = solve_pair(*self.row_values(row))
+        solved = -1
+        if result.status == STATUS_OK:
+            solved = FIELDS.index(result.solved)
+            self.columns[solved][row] = float(getattr(result, result.solved))
+        self.solved[row] = solved
+        changed = {i for i, column in enumerate(self.columns)
+                   if not _same(column[row], before[i])}
+        if derived != solved:
+            # 高亮的格子换了位置，两格都要重绘
+            changed.update(i for i in (derived, solved) if i >= 0)
+        if self.status[row] != result.status:
+            self.status[row] = result.status
+            changed.add(STATUS_COLUMN)
+        return changed
+
+    # ---- 批量 ----
+
+    def append_rows(self, prob1, people1, prob2, people2):
+        """追加多行并求解，四个参数为等长序列（None/NaN/0 为未知），一次 beginInsertRows"""
+        if len(prob1):
+            self.extend_solved(solve_columns(prob1, people1, prob2, people2))
+
+    def extend_solved(self, solved_columns):
+        """追加已求解好的一块（solve_columns 的返回值），只做数组拼接，可在界面线程里分块调用"""
+        columns, solved, status = solved_columns
+        count = len(status)
+        if count == 0:
+            return
+        first = len(self.status)
+        self.beginInsertRows(QModelIndex(), first, first + count - 1)
+        for column, values in zip(self.columns, columns):
+            column.extend(values)
+        self.solved.extend(solved)
+        self.status.extend(status)
+        self.endInsertRows()
+
+    def append_empty(self, count):
+        """追加空行"""
+        nan = [NAN] * count
+        self.beginInsertRows(QModelIndex(), len(self.status), len(self.status) + count - 1)
+        for column in self.columns:
+            column.extend(nan)
+        self.solved.extend([-1] * count)
+        self.status.extend([STATUS_NOT_ENOUGH] * count)
+        self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self.columns = [array('d') for _ in FIELDS]
+        self.solved = array('b')
+        self.status = array('b')
+        self.endResetModel()
+
+
+def solve_columns(prob1, people1, prob2, people2):
+    """
+    整块求解，返回 (四个 array('d') 列, solved array('b'), status array('b'))。
+    装了 numpy 时用 batch.solve_batch 向量化求解，否则逐行 solve_pair。
+    """
+    if np is not None:
+        result = solve_batch(prob1, people1, prob2, people2)
+        return ([array('d', column.tobytes()) for column in result.columns()],
+                array('b', result.solved.tobytes()), array('b', result.status.tobytes()))
+
+    columns = [array('d') for _ in FIELDS]
+    solved, status = array('b'), array('b')
+    for values in zip(prob1, people1, prob2, people2):
+        inputs = [None if v is None or v != v or v == 0 else (v if is_float else int(v))
+                  for v, is_float in zip(values, _IS_FLOAT)]
+        result = solve_pair(*inputs)
+        for column, field in zip(columns, FIELDS):
+            value = getattr(result, field)
+            column.append(NAN if value is None else float(value))
+        solved.append(FIELDS.index(result.solved) if result.solved else -1)
+        status.append(result.status)
+    return columns, solved, status
+
+
+def _same(a, b):
+    return a == b or (a != a and b != b)
+
+
+class WorksheetWindow(QWidget):
+    """工作表窗口：同时跟踪多组 A台/B台"""
+
+    def __init__(self, parent=None, model=None):
+        super().__init__(parent, Qt.Window)
+        self.setObjectName("worksheet")
+        self.setWindowTitle("多组对冲工作表")
+        self.resize(560, 520)
+        self.model = model if model is not None else WorksheetModel(self)
+        self.import_thread = None
+        self.import_worker = None
+        self.import_summary = ''
+        # 每插入一次视图就要重绘一次（约 5ms），收到的块先攒着，定时一起插入
+        self.pending_chunks = []
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setInterval(IMPORT_FLUSH_INTERVAL)
+        self.flush_timer.timeout.connect(self.flush_import)
+        # 单核上插入后的重绘要和工作线程抢 CPU 和 GIL，一帧会超过 16ms：插入时暂停读取，视图重绘完再继续
+        self.resume_timer = QTimer(self)
+        self.resume_timer.setSingleShot(True)
+        self.resume_timer.timeout.connect(self._resume_import)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(8, 8, 8, 8)
+        layout.setSpacing(6)
+
+        toolbar = QHBoxLayout()
+        add_button = QPushButton("添加 50 行")
+        add_button.clicked.connect(lambda: self.model.append_empty(50))
+        self.clear_button = QPushButton("清空")
+        self.clear_button.clicked.connect(self.model.clear)
+        self.import_button = QPushButton("导入…")
+        self.import_button.clicked.connect(self.choose_import)
+        self.count_label = QLabel()
+        toolbar.addWidget(add_button)
+        toolbar.addWidget(self.clear_button)
+        toolbar.addWidget(self.import_button)
+        toolbar.addStretch()
+        toolbar.addWidget(self.count_label)
+        layout.addLayout(toolbar)
+
+        # 导入进度，导入时才显示
+        self.import_bar = QWidget()
+        import_layout = QHBoxLayout(self.import_bar)
+        import_layout.setContentsMargins(0, 0, 0, 0)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.cancel_button = QPushButton("取消")
+        self.cancel_button.clicked.connect(self.cancel_import)
+        import_layout.addWidget(self.progress_bar)
+        import_layout.addWidget(self.cancel_button)
+        self.import_bar.hide()
+        layout.addWidget(self.import_bar)
+
+        self.view = QTableView()
+        self.view.setWordWrap(False)
+        # 固定行高，要在挂上模型之前设好，行数多时表头不必逐行调整
+        self.view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.view.verticalHeader().setDefaultSectionSize(24)
+        # 行号宽度预留到 7 位，导入中行数跨过 10 万时表头不会变宽，不必重新布局整个表格
+        header = self.view.verticalHeader()
+        header.setMinimumWidth(header.fontMetrics().horizontalAdvance('0000000') + 8)
+        self.view.setModel(self.model)
+        self.view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.view.viewport().installEventFilter(self)
+        layout.addWidget(self.view)
+
+        for signal in (self.model.rowsInserted, self.model.modelReset):
+            signal.connect(self.update_count)
+        self.update_count()
+        QApplication.instance().aboutToQuit.connect(self._abort_import)
+
+    def update_count(self, *args):
+        self.count_label.setText(f"{self.model.rowCount()} 组")
+
+    # ---- 导入 ----
+
+    def choose_import(self):
+        path, _ = QFileDialog.getOpenFileName(self, "导入表格", "", "表格 (*.csv *.xlsx);;所有文件 (*)")
+        if path:
+            self.start_import(path)
+
+    def start_import(self, path):
+        """在工作线程里读取并求解，结果分块追加到表格末尾"""
+        from importer import ImportWorker
+        if self.is_importing():
+            return
+        self.import_thread = QThread(self)
+        self.import_worker = ImportWorker(path)
+        self.import_worker.moveToThread(self.import_thread)
+        self.import_thread.started.connect(self.import_worker.run)
+        self.import_worker.chunk.connect(self.queue_chunk)
+        self.import_worker.progress.connect(self.progress_bar.setValue)
+        self.import_worker.finished.connect(self.import_finished)
+        self.import_worker.failed.connect(self.import_failed)
+        self.progress_bar.setValue(0)
+        self.import_bar.show()
+        self.import_button.setEnabled(False)
+        self.clear_button.setEnabled(False)
+        self.import_summary = ''
+        self.flush_timer.start(IMPORT_FLUSH_INTERVAL)
+        self.import_thread.start()
+
+    def is_importing(self):
+        """工作线程还在读，或者收到的块还没全部插入表格"""
+        return self.flush_timer.isActive()
+
+    def queue_chunk(self, solved_columns):
+        self.pending_chunks.append(solved_columns)
+
+    def flush_import(self):
+        """
+        把攒下的块合成一块插入，视图只重绘一次；一次最多 IMPORT_FLUSH_ROWS 行（至少一块），
+        其余留到下一次。工作线程结束且全部插入后，下一次再停下计时器、收起进度条（重新布局也要重绘整个表格）
+        """
+        if self.pending_chunks:
+            if self.import_worker is not None:
+                self.import_worker.pause()
+                self.resume_timer.start(IMPORT_PAUSE_MAX)
+            self._insert_pending()
+        elif self.import_thread is None:
+            self.flush_timer.stop()
+            self.import_bar.hide()
+            self.import_button.setEnabled(True)
+            self.clear_button.setEnabled(True)
+            self.count_label.setText(f"{self.model.rowCount()} 组{self.import_summary}")
+
+    def _insert_pending(self):
+        """从队首取不超过 IMPORT_FLUSH_ROWS 行的块，合成一块插入"""
+        count = rows = 0
+        for _, _, chunk_status in self.pending_chunks:
+            if count and rows + len(chunk_status) > IMPORT_FLUSH_ROWS:
+                break
+            rows += len(chunk_status)
+            count += 1
+        chunks, self.pending_chunks = self.pending_chunks[:count], self.pending_chunks[count:]
+        if len(chunks) == 1:
+            self.model.extend_solved(chunks[0])
+            return
+        columns = [array('d') for _ in FIELDS]
+        solved, status = array('b'), array('b')
+        for chunk_columns, chunk_solved, chunk_status in chunks:
+            for column, values in zip(columns, chunk_columns):
+                column.extend(values)
+            solved.extend(chunk_solved)
+            status.extend(chunk_status)
+        self.model.extend_solved((columns, solved, status))
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and self.resume_timer.isActive():
+            # 这次重绘处理完后再继续读取
+            self.resume_timer.start(0)
+        return False
+
+    def _resume_import(self):
+        if self.import_worker is not None:
+            self.import_worker.resume()
+
+    def cancel_import(self):
+        if self.import_worker is not None:
+            self.import_worker.cancel()
+
+    def _abort_import(self):
+        """程序退出时停下工作线程，避免 QThread 在运行中被销毁"""
+        if self.import_thread is not None:
+            self.import_worker.cancel()
+            self.import_thread.quit()
+            self.import_thread.wait()
+
+    def import_finished(self, imported, invalid):
+        self.import_summary = f"（导入 {imported}，跳过 {invalid}）"
+        self._stop_import()
+
+    def import_failed(self, message):
+        self.import_summary = f"（导入失败: {message}）"
+        self._stop_import()
+
+    def _stop_import(self):
+        """
+        工作线程结束；还没插入的块由 flush_timer 接着分批插入，插完后 flush_import 恢复界面。
+        不再有线程抢 CPU，改为每帧插入一批，尽快插完
+        """
+        self.import_thread.quit()
+        self.import_thread.wait()
+        self.import_worker.deleteLater()
+        self.import_thread.deleteLater()
+        self.import_thread = None
+        self.import_worker = None
+        self.flush_timer.setInterval(IMPORT_DRAIN_INTERVAL)